@@ -0,0 +1,82 @@
+''' Compares the old sequential csv search against the indexed Database lookups.
+
+Usage: python3 -m benchmarks.benchmark_database [rows ...]
+'''
+import csv
+import os
+import sys
+import tempfile
+import time
+from constants import constants
+from objects.circuit_simulation import CircuitSimulationBuilder
+from objects.database import Database
+
+
+def generate_csv(path, rows):
+    ''' Writes rows synthetic low power simulations to path '''
+    with open(path, 'w', newline='') as csvfile:
+        csv_writer = csv.writer(csvfile, delimiter=',')
+        for i in range(rows):
+            csv_writer.writerow([
+                constants.ADDER,
+                constants.LOW_POWER_ADDERS[i % len(constants.LOW_POWER_ADDERS)],
+                8 + (i // len(constants.LOW_POWER_ADDERS)) % 57,
+                (i // (len(constants.LOW_POWER_ADDERS) * 57)) % 64,
+                constants.SYNTHESIS,
+                1000000 + i // (len(constants.LOW_POWER_ADDERS) * 57 * 64),
+                1.0, 2.0, 3.0, 6.0, 4.0, 5.0
+            ])
+
+
+def sequential_load(simulation):
+    ''' Sequential search used by Database before the index was added '''
+    with open(constants.LOW_POWER_CSV, newline='') as csvfile:
+        for row in csv.reader(csvfile, delimiter=','):
+            if (simulation.circuit_operation     ==     row[0]  and
+                simulation.approximation_method  ==     row[1]  and
+                simulation.bitwidth              == int(row[2]) and
+                simulation.approximate_bits      == int(row[3]) and
+                simulation.simulation_type       ==     row[4]  and
+                simulation.number_of_validations == int(row[5])):
+                return True
+    return False
+
+
+def sweep(bitwidth):
+    ''' Design points of a 17 method sweep with bitwidth approximate bits, none stored '''
+    return [CircuitSimulationBuilder.create_circuit_simulation_low_power(
+                method, constants.SYNTHESIS, 1, constants.ADDER, bitwidth, approximate_bits)
+            for method in constants.LOW_POWER_ADDERS
+            for approximate_bits in range(bitwidth)]
+
+
+def run(rows):
+    simulations = sweep(32)
+    sequential_sample = simulations[:5]
+
+    start = time.perf_counter()
+    for simulation in sequential_sample:
+        sequential_load(simulation)
+    sequential_time = (time.perf_counter() - start) / len(sequential_sample) * len(simulations)
+
+    start = time.perf_counter()
+    database = Database()
+    for simulation in simulations:
+        database.load_simulation(simulation)
+    indexed_time = time.perf_counter() - start
+
+    print(f'{rows:>8} rows  sequential: {sequential_time:9.3f}s (extrapolated)  '
+          f'indexed: {indexed_time:7.3f}s  speedup: {sequential_time / indexed_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for rows in sizes:
+                generate_csv(constants.LOW_POWER_CSV, rows)
+                run(rows)
+        finally:
+            os.chdir(cwd)
@@ -0,0 +1,66 @@
+''' Compares the old os.walk search of the result files against the learned
+layout of Simulator._find_file.
+
+Usage: python3 -m benchmarks.benchmark_find_file [folders ...]
+'''
+import os
+import sys
+import tempfile
+import time
+from objects.simulator import Simulator
+
+EXTRA_FILES = 20 #netlists, logs and reports AUGER leaves next to the results
+
+
+def walk_find_file(rootdir, filename):
+    ''' Search used by Simulator before the layout was learned '''
+    for root, _, files in os.walk(rootdir):
+        if filename in files:
+            return os.path.join(root, filename)
+    return None
+
+
+def create_result_folders(path, size):
+    ''' Result folders with the reports under a nested folder, after some
+    other folders os.walk has to go through '''
+    folders = []
+    for index in range(size):
+        folder = os.path.join(path, 'LP', 'adder', 'LOA', f'8-{index}')
+        for subfolder in ['hdl', 'synthesis', 'results']:
+            os.makedirs(os.path.join(folder, subfolder))
+        for extra in range(EXTRA_FILES):
+            open(os.path.join(folder, 'hdl', f'file{extra}.v'), 'w').close()
+        for filename in ['RESUME.csv', 'METRICS.csv']:
+            open(os.path.join(folder, 'results', filename), 'w').close()
+        folders.append(folder)
+    return folders
+
+
+def run(size):
+    with tempfile.TemporaryDirectory() as path:
+        with open(os.path.join(path, 'config.cfg'), 'w') as config_file:
+            config_file.write(f'[AAUG setup]\nFilesPath = {path}\n')
+        working_directory = os.getcwd()
+        os.chdir(path)
+        try:
+            simulator = Simulator()
+        finally:
+            os.chdir(working_directory)
+        folders = create_result_folders(path, size)
+
+        start = time.perf_counter()
+        walked = [walk_find_file(folder, filename) for folder in folders for filename in ['RESUME.csv', 'METRICS.csv']]
+        walk_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = [simulator._find_file(folder, filename) for folder in folders for filename in ['RESUME.csv', 'METRICS.csv']]
+        layout_time = time.perf_counter() - start
+
+    assert found == walked
+    print(f'{size:>8} folders  os.walk: {walk_time:7.3f}s  learned layout: {layout_time:7.3f}s  speedup: {walk_time / layout_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    for size in sizes:
+        run(size)
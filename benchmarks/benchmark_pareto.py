@@ -0,0 +1,65 @@
+''' Compares the brute force Pareto front against the sort and sweep one,
+and times the incremental ParetoArchive on a front that keeps every point.
+
+Usage: python3 -m benchmarks.benchmark_pareto [points ...]
+'''
+import random
+import sys
+import time
+from types import SimpleNamespace
+from logic.pareto import pareto_front, brute_force_pareto_front, ParetoArchive
+
+BRUTE_FORCE_LIMIT = 10000 #bigger sizes take minutes with the brute force
+
+
+def generate_points(size, seed = 0):
+    ''' Synthetic simulations where approximating more bits lowers the area
+    and raises the error, with noise so the front is not trivial '''
+    generator = random.Random(seed)
+    points = []
+    for _ in range(size):
+        approximate_bits = generator.randint(0, 32)
+        points.append(SimpleNamespace(area = 1000.0 - 20 * approximate_bits + generator.uniform(0, 100),
+                                      wce = 2.0 ** approximate_bits * generator.uniform(0.5, 1.5)))
+    return points
+
+
+def run(size):
+    points = generate_points(size)
+
+    start = time.perf_counter()
+    front = pareto_front(points, 'area', 'wce')
+    sweep_time = time.perf_counter() - start
+
+    line = f'{size:>8} points  front: {len(front):5}  sort and sweep: {sweep_time:7.3f}s'
+    if size <= BRUTE_FORCE_LIMIT:
+        start = time.perf_counter()
+        assert brute_force_pareto_front(points, 'area', 'wce') == front
+        brute_force_time = time.perf_counter() - start
+        line += f'  brute force: {brute_force_time:8.3f}s  speedup: {brute_force_time / sweep_time:8.1f}x'
+    print(line)
+
+
+def run_archive(size, seed = 0):
+    ''' Adds size points of a front where the area trades for the error one
+    by one, in random order, so most insertions land inside the front '''
+    generator = random.Random(seed)
+    areas = list(range(size))
+    generator.shuffle(areas)
+    points = [SimpleNamespace(area = float(area), wce = float(size - area)) for area in areas]
+
+    archive = ParetoArchive('area', 'wce', size / 2)
+    start = time.perf_counter()
+    for point in points:
+        archive.add(point)
+    archive_time = time.perf_counter() - start
+    assert len(archive.front()) == size
+    print(f'{size:>8} points  front: {size:8}  archive: {archive_time:7.3f}s  per insertion: {archive_time / size * 1e6:6.2f}us')
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    for size in sizes:
+        run(size)
+    for size in sizes:
+        run_archive(size)
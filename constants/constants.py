@@ -1,5 +1,73 @@
 #database
 LOW_POWER_CSV = "lowpower.csv"
+LOW_POWER_DB  = "lowpower.db"
+LOW_POWER_FAILURES_CSV = "lowpower_failures.csv"
+HIGH_PERFORMANCE_CSV = "highperformance.csv"
+HIGH_PERFORMANCE_DB  = "highperformance.db"
+HIGH_PERFORMANCE_FAILURES_CSV = "highperformance_failures.csv"
+LOW_POWER_SYNTHESIS_CSV = "lowpower_synthesis.csv"
+LOW_POWER_ERRORS_CSV = "lowpower_errors.csv"
+HIGH_PERFORMANCE_SYNTHESIS_CSV = "highperformance_synthesis.csv"
+HIGH_PERFORMANCE_ERRORS_CSV = "highperformance_errors.csv"
+
+# exploration journals, one <run id>.jsonl file per exploration
+
+JOURNAL_PATH = "journal"
+
+# database engines
+
+CSV_ENGINE    = "csv"
+SQLITE_ENGINE = "sqlite"
+
+# worker pool
+
+DEFAULT_JOBS  = 4
+ADAPTIVE_JOBS = "auto"
+
+# execution engines
+
+THREADS_EXECUTION = "threads"
+ASYNCIO_EXECUTION = "asyncio"
+PIPELINE_EXECUTION = "pipeline"
+
+PIPELINE_QUEUE_SIZE = 64 #simulations waiting between two pipeline stages
+
+# exploration strategies
+
+BRUTE_FORCE_STRATEGY   = "brute-force"
+BINARY_SEARCH_STRATEGY = "binary-search"
+BRANCH_AND_BOUND_STRATEGY = "branch-and-bound"
+SURROGATE_STRATEGY = "surrogate"
+NSGA2_STRATEGY = "nsga2"
+MULTI_FIDELITY_STRATEGY = "multi-fidelity"
+
+# multi-fidelity exploration, design points are screened with few validations
+# and only the ones near the threshold or the Pareto front get full fidelity
+
+DEFAULT_SCREENING_VALIDATIONS = 1024
+DEFAULT_FIDELITY_MARGIN       = 0.25
+
+# sequential validation, random validations run in chunks until the threshold
+# decision on the error metric is settled
+
+DEFAULT_VALIDATION_CHUNK   = 50000
+WCE_EXCEEDANCE_TOLERANCE   = 1e-5 # rate of errors over a wce threshold that may go unseen
+EXHAUSTIVE_VALIDATION_BITS = 20   # below this bitwidth every input is validated
+
+# software error models of the low power adders, evaluated on every input pair
+# or analytically above MAX_MODEL_BITWIDTH
+
+MAX_MODEL_BITWIDTH      = 12       # 2 ** 24 input pairs
+MODEL_CHUNK_PAIRS       = 2 ** 22  # input pairs evaluated at once
+MODEL_CHECK_VALIDATIONS = 64       # AUGER validations checked against the model
+MODEL_CHECK_CONFIDENCE  = 0.9999   # confidence of the med check before blaming the model
+MAX_ANALYTICAL_APPROXIMATE_BITS = 20 # the exact PMF of wider adders has up to 2 ** 21 error distances
+
+# evolutionary exploration of the high performance design space
+
+DEFAULT_SEED            = 0
+DEFAULT_POPULATION_SIZE = 20
+DEFAULT_GENERATIONS     = 10
 
 
 #circuit type
@@ -24,6 +92,19 @@ PDP   = "pdp"
 # error metrics
 MED  = "med"
 WCE = "wce"
+NMED = "nmed"               # med over the largest exact result
+ERROR_RATE = "error_rate"   # probability of a nonzero error distance
+RMSE = "rmse"
+ED50 = "ed50"               # percentiles of the error distance
+ED90 = "ed90"
+ED99 = "ed99"
+
+# error metrics computed from the METRICS.csv PMF, in their storage order
+ERROR_METRICS = [WCE, MED, NMED, ERROR_RATE, RMSE, ED50, ED90, ED99]
+ERROR_PERCENTILES = {ED50: 50, ED90: 90, ED99: 99}
+
+# metrics that can be objectives of a multi-objective exploration
+OBJECTIVES = [AREA, DELAY, POWER, PDP] + ERROR_METRICS
 
 # simulation type
 
@@ -33,6 +114,46 @@ VALIDATION = "-val"
 SYNTHESIS = "-syn"
 POST_SYNTHESYS = "-psy"
 
+# resource pools, from the "Resource pools" section of config.cfg,
+# used by each simulation type
+
+RESOURCE_POOLS_SECTION = "Resource pools"
+SYNTHESIS_RESOURCE  = "synthesis"
+SIMULATION_RESOURCE = "simulation"
+
+SIMULATION_RESOURCES = {
+    GENERATION: [],
+    SIMULATION: [SIMULATION_RESOURCE],
+    VALIDATION: [SIMULATION_RESOURCE],
+    SYNTHESIS: [SYNTHESIS_RESOURCE],
+    POST_SYNTHESYS: [SYNTHESIS_RESOURCE, SIMULATION_RESOURCE],
+}
+
+# simulation failures
+
+TRANSIENT_FAILURE   = "transient"
+TOOL_ERROR_FAILURE  = "tool_error"
+PARSE_ERROR_FAILURE = "parse_error"
+
+# failures that happen again on every execution, skipped by later explorations
+DETERMINISTIC_FAILURES = [TOOL_ERROR_FAILURE, PARSE_ERROR_FAILURE]
+
+# AUGER standard error messages of failures that may not happen again
+TRANSIENT_ERROR_PATTERNS = [
+    r"licen[cs]e",
+    r"checkout",
+    r"FLEXlm",
+    r"lmgrd",
+    r"resource temporarily unavailable",
+    r"no space left on device",
+    r"connection (refused|reset|timed out)",
+]
+
+STDERR_TAIL     = 2000 # characters of AUGER standard error kept
+SYNTHESIS_STAGE_VALIDATIONS = 1 # validations of a run that only needs the characteristics
+DEFAULT_RETRIES = 2
+RETRY_BACKOFF   = 10.0 # seconds before the first retry, doubled on each attempt
+
 LOW_POWER_ADDERS = ["AFA1", "AMA1", "AMA2",
                     "AMA3", "AMA4", "AMA5",
                     "AXA1", "AXA2", "AXA3",
@@ -40,6 +161,11 @@ LOW_POWER_ADDERS = ["AFA1", "AMA1", "AMA2",
                     "TGA2", "InXA1", "InXA2",
                     "InXA3", "CFA"]
 
+# GeAr splits the adder in sub-adders of r resultant bits that predict their
+# carry from the p previous bits, ACA-I, ACA-II and ETA-II are particular
+# cases of it
+HIGH_PERFORMANCE_ADDERS = ["GeAr"]
+
 COMMANDS = {
     ADDER: "-a",
     MULTIPLIER: "-m",
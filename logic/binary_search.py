@@ -0,0 +1,76 @@
+def is_monotonic(simulations, design_space_params):
+    ''' Returns False if the successful simulations of a method, sorted by
+    approximate bits, show an error metric that decreases or a
+    charactheristic that increases with the approximate bits '''
+    for previous, simulation in zip(simulations, simulations[1:]):
+        if (getattr(simulation, design_space_params.error_metric) < getattr(previous, design_space_params.error_metric) or
+            getattr(simulation, design_space_params.charactheristic) > getattr(previous, design_space_params.charactheristic)):
+            return False
+    return True
+
+
+class BinarySearchStrategy:
+    """
+    Exploration strategy for approximation methods whose error metric grows
+    and whose charactheristic shrinks with approximate_bits. The optimum of
+    such a method is the largest approximate_bits with an error metric under
+    the threshold, so it is binary searched, simulating O(log bits) design
+    points per method instead of all of them. Every round simulates the next
+    design point of all the methods still searching in a single batch.
+
+    If the design points simulated for a method break the monotonicity, or
+    one of them fails, the rest of its approximate bits are simulated as the
+    brute force strategy would.
+
+    Attributes
+    ----------
+    logic : Logic
+        logic whose design space is explored
+    full_scan_methods : str[]
+        methods that fell back to simulating every approximate bit
+    """
+
+    def __init__(self, logic):
+        self.logic = logic
+        self.full_scan_methods = []
+        self.__simulated = {method: {} for method in logic.low_power_methods()}
+
+    def run(self):
+        params = self.logic.design_space_params
+        searches = {method: (params.min_approx_bits, params.max_approx_bits) for method in self.logic.low_power_methods()}
+
+        while searches:
+            batch = [self.logic.create_simulation(method, (low + high) // 2) for method, (low, high) in searches.items()]
+            results = self.logic.simulate(batch)
+
+            for simulation, is_simulation_successful in zip(batch, results):
+                method = simulation.approximation_method
+                low, high = searches.pop(method)
+                self.__simulated[method][simulation.approximate_bits] = simulation if is_simulation_successful else None
+
+                if not is_simulation_successful or not self.__is_monotonic(method):
+                    self.full_scan_methods.append(method)
+                    continue
+
+                if getattr(simulation, params.error_metric) <= params.threshold:
+                    low = simulation.approximate_bits + 1
+                else:
+                    high = simulation.approximate_bits - 1
+                if low <= high:
+                    searches[method] = (low, high)
+
+        self.logic.simulate([self.logic.create_simulation(method, approximate_bits)
+                             for method in self.full_scan_methods
+                             for approximate_bits in range(params.min_approx_bits, params.max_approx_bits + 1)
+                             if approximate_bits not in self.__simulated[method]])
+
+    def __is_monotonic(self, method):
+        simulations = [simulation for _, simulation in sorted(self.__simulated[method].items()) if simulation is not None]
+        return is_monotonic(simulations, self.logic.design_space_params)
+
+    def summary(self):
+        ''' Returns the lines describing how the strategy went '''
+        params = self.logic.design_space_params
+        brute_force_size = len(self.logic.low_power_methods()) * (params.max_approx_bits - params.min_approx_bits + 1)
+        return [f'Simulations saved: {brute_force_size - len(self.logic.total_simulations)} of {brute_force_size}',
+                f'Full scan fallbacks: {", ".join(self.full_scan_methods) or "none"}']
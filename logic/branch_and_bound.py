@@ -0,0 +1,153 @@
+import time
+from logic.binary_search import is_monotonic
+
+
+class BranchAndBoundStrategy:
+    """
+    Anytime exploration strategy that keeps the best solution found so far
+    and simulates first the design points most likely to beat it, until
+    every design point is simulated or pruned or the time budget runs out.
+
+    While the error metric of a method grows and its charactheristic shrinks
+    with approximate_bits, the simulated neighbours of a design point bound
+    it: a design point is pruned if a neighbour with less approximate bits is
+    over the threshold (it is over the threshold too), if a neighbour with
+    more approximate bits is under the threshold (it is at least as good) or
+    if the charactheristic of its closest neighbour with more approximate
+    bits, a lower bound of its own, is not smaller than the best solution.
+    Methods whose simulations break that monotonicity are not pruned.
+
+    The remaining design points are simulated in batches of as many design
+    points as workers, sorted by the charactheristic interpolated from their
+    neighbours. When the exploration stops the optimality gap is the
+    relative distance between the best solution and the smallest lower bound
+    of the design points left, 0 if none is left.
+
+    Attributes
+    ----------
+    logic : Logic
+        logic whose design space is explored
+    time_budget : float
+        seconds after which no more batches are started, None for no limit
+    number_of_pruned_simulations : int
+        design points not simulated because they could not improve the best solution
+    optimality_gap : float
+        None if no solution was found
+    is_out_of_time : bool
+        if set the time budget ran out before every design point was resolved
+    """
+
+    def __init__(self, logic):
+        self.logic = logic
+        self.time_budget = logic.design_space_params.options.time_budget
+        self.number_of_pruned_simulations = 0
+        self.optimality_gap = None
+        self.is_out_of_time = False
+        self.__simulated = {method: {} for method in logic.low_power_methods()}
+        self.__non_monotonic_methods = set()
+
+    def run(self):
+        params = self.logic.design_space_params
+        start = time.monotonic()
+        candidates = set((method, approximate_bits)
+                         for method in self.logic.low_power_methods()
+                         for approximate_bits in range(params.min_approx_bits, params.max_approx_bits + 1))
+
+        pruned = set()
+        while True:
+            #pruning a method is undone once its simulations break the monotonicity
+            restored = set(candidate for candidate in pruned if candidate[0] in self.__non_monotonic_methods)
+            pruned = (pruned - restored) | set(candidate for candidate in candidates if self.__is_pruned(*candidate))
+            candidates = (candidates | restored) - pruned
+            self.number_of_pruned_simulations = len(pruned)
+            if not candidates:
+                break
+            if self.time_budget is not None and time.monotonic() - start >= self.time_budget:
+                self.is_out_of_time = True
+                break
+
+            batch = sorted(candidates, key = lambda candidate: self.__priority(*candidate))[:self.logic.number_of_workers()]
+            simulations = [self.logic.create_simulation(method, approximate_bits) for method, approximate_bits in batch]
+            results = self.logic.simulate(simulations)
+            for simulation, is_simulation_successful in zip(simulations, results):
+                self.__record(simulation, is_simulation_successful)
+            candidates -= set(batch)
+
+        self.optimality_gap = self.__optimality_gap(candidates)
+
+    def __record(self, simulation, is_simulation_successful):
+        method = simulation.approximation_method
+        self.__simulated[method][simulation.approximate_bits] = simulation if is_simulation_successful else None
+        simulations = [simulation for _, simulation in sorted(self.__simulated[method].items()) if simulation is not None]
+        if not is_monotonic(simulations, self.logic.design_space_params):
+            self.__non_monotonic_methods.add(method)
+
+    def __neighbours(self, method, approximate_bits):
+        ''' Returns the closest successful simulations of method with less and
+        with more approximate bits, None if there is none '''
+        lower = None
+        upper = None
+        for bits, simulation in self.__simulated[method].items():
+            if simulation is None:
+                continue
+            if bits < approximate_bits and (lower is None or bits > lower.approximate_bits):
+                lower = simulation
+            elif bits > approximate_bits and (upper is None or bits < upper.approximate_bits):
+                upper = simulation
+        return lower, upper
+
+    def __lower_bound(self, method, approximate_bits):
+        ''' Returns a lower bound of the charactheristic of a design point '''
+        if method in self.__non_monotonic_methods:
+            return 0.0
+        _, upper = self.__neighbours(method, approximate_bits)
+        return 0.0 if upper is None else getattr(upper, self.logic.design_space_params.charactheristic)
+
+    def __is_pruned(self, method, approximate_bits):
+        if method in self.__non_monotonic_methods:
+            return False
+
+        params = self.logic.design_space_params
+        lower, upper = self.__neighbours(method, approximate_bits)
+        if lower is not None and getattr(lower, params.error_metric) > params.threshold:
+            return True
+        if upper is not None and getattr(upper, params.error_metric) <= params.threshold:
+            return True
+
+        best = self.logic.get_current_best()
+        return best is not None and self.__lower_bound(method, approximate_bits) >= getattr(best, params.charactheristic)
+
+    def __priority(self, method, approximate_bits):
+        ''' Sort key of a design point: methods without simulations first,
+        starting by their middle approximate bits, then by the charactheristic
+        interpolated from the neighbours '''
+        params = self.logic.design_space_params
+        lower, upper = self.__neighbours(method, approximate_bits)
+        middle = abs(approximate_bits - (params.min_approx_bits + params.max_approx_bits) / 2)
+        if lower is None and upper is None:
+            return (0, 0.0, middle)
+
+        if lower is None or upper is None:
+            estimate = getattr(lower or upper, params.charactheristic)
+        else:
+            position = (approximate_bits - lower.approximate_bits) / (upper.approximate_bits - lower.approximate_bits)
+            estimate = (getattr(lower, params.charactheristic) +
+                        position * (getattr(upper, params.charactheristic) - getattr(lower, params.charactheristic)))
+        return (1, estimate, middle)
+
+    def __optimality_gap(self, candidates):
+        best = self.logic.get_current_best()
+        if best is None:
+            return None
+        best_charactheristic = getattr(best, self.logic.design_space_params.charactheristic)
+        lower_bound = min([best_charactheristic] + [self.__lower_bound(*candidate) for candidate in candidates])
+        if best_charactheristic == 0:
+            return 0.0
+        return (best_charactheristic - lower_bound) / best_charactheristic
+
+    def summary(self):
+        ''' Returns the lines describing how the strategy went '''
+        gap = 'unknown, no solution found' if self.optimality_gap is None else f'{self.optimality_gap:.1%}'
+        return [f'Stopped by time budget: {self.is_out_of_time}',
+                f'Pruned simulations: {self.number_of_pruned_simulations}',
+                f'Optimality gap: {gap}']
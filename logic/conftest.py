@@ -0,0 +1,88 @@
+import pytest
+from constants import constants
+from objects.design_space_params import DesignSpaceParamsBuilder, ExplorationOptions
+from objects.circuit_simulation import CircuitSimulationBuilder
+from logic.logic import Logic
+
+
+class FakeSimulator:
+    ''' Simulator replacement, every approximate bit lowers the area and
+    doubles the error, fails the approximation methods in failing_methods.
+    High performance simulations approximate bitwidth - r - p bits and each
+    r and p adds to the area. adjust(simulation), if set, is called on every
+    successful simulation to change its results '''
+
+    def __init__(self, failing_methods = (), adjust = None):
+        self.failing_methods = failing_methods
+        self.adjust = adjust
+        self.simulated = []
+        self.recovered = []
+
+    def simulate(self, simulation):
+        self.simulated.append(simulation)
+        if simulation.approximation_method in self.failing_methods:
+            simulation.failure_class = constants.TOOL_ERROR_FAILURE
+            simulation.failure_reason = 'unable to find resume file'
+            return False
+        if simulation.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
+            approximate_bits = simulation.bitwidth - simulation.r - simulation.p
+            simulation.area = 90.0 + simulation.r + 2 * simulation.p
+        else:
+            approximate_bits = simulation.approximate_bits
+            simulation.area = 100.0 - approximate_bits
+        simulation.delay = 1.0
+        simulation.power = 2.0
+        simulation.pdp = 2.0
+        simulation.wce = float(2 ** approximate_bits)
+        simulation.med = simulation.wce / 2
+        if self.adjust is not None:
+            self.adjust(simulation)
+        return True
+
+    def recover_job(self, simulation, directory, output_path, isolated, pid):
+        self.recovered.append(simulation)
+        return self.simulate(simulation)
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'config.cfg').write_text('[AAUG setup]\nFilesPath = ' + str(tmp_path) + '\n')
+
+@pytest.fixture
+def fake_simulator():
+    ''' Returns a factory of FakeSimulator '''
+    return FakeSimulator
+
+@pytest.fixture
+def create_logic():
+    ''' Returns a factory of low power adder logics simulated by a
+    FakeSimulator, the keyword arguments are ExplorationOptions '''
+    def create(database = True, threaded = True, failing_methods = (), adjust = None, **kwargs):
+        logic = Logic()
+        logic.simulator = FakeSimulator(failing_methods, adjust)
+        logic.set_design_space_params(DesignSpaceParamsBuilder.create_low_power_space_design_params(
+            database, threaded, constants.ADDER, 8, constants.AREA, constants.WCE, 4, 0, 4, ExplorationOptions(**kwargs)))
+        return logic
+    return create
+
+@pytest.fixture
+def create_high_performance_logic():
+    ''' Returns a factory of high performance adder logics simulated by a
+    FakeSimulator, the keyword arguments are ExplorationOptions '''
+    def create(database = True, threaded = True, **kwargs):
+        logic = Logic()
+        logic.simulator = FakeSimulator()
+        logic.set_design_space_params(DesignSpaceParamsBuilder.create_high_performance_space_design_params(
+            database, threaded, constants.ADDER, 8, constants.AREA, constants.WCE, 4, 1, 6, 0, 5, ExplorationOptions(**kwargs)))
+        return logic
+    return create
+
+@pytest.fixture
+def create_simulations():
+    ''' Returns a factory of low power adder simulations '''
+    def create(methods = ('LOA', 'AMA1'), bits = range(5)):
+        return [CircuitSimulationBuilder.create_circuit_simulation_low_power(
+                    method, constants.SYNTHESIS, 256, constants.ADDER, 8, approximate_bits)
+                for method in methods for approximate_bits in bits]
+    return create
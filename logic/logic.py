@@ -1,21 +1,46 @@
-from concurrent.futures import ThreadPoolExecutor
+import os
 import matplotlib.pyplot as plt
 from constants import constants
 from objects.design_space_params import DesignSpaceParams
 from objects.design_space_stats import DesignSpaceStats
 from objects.circuit_simulation import CircuitSimulationBuilder
-from objects.simulator import Simulator
+from objects.simulator import Simulator, RetryBudget
+from objects.error_estimate import SequentialValidation
+from objects.adder_models import AdderErrorModel
+from objects.async_simulator import AsyncSimulator
+from objects.pipeline import SimulationPipeline
 from objects.database import Database
+from objects.worker_pool import WorkerPool
+from objects.journal import Journal
+from logic.pareto import pareto_front, non_dominated_sort, ParetoArchive
+from logic.binary_search import BinarySearchStrategy
+from logic.branch_and_bound import BranchAndBoundStrategy
+from logic.surrogate import SurrogateStrategy
+from logic.nsga2 import Nsga2Strategy
+from logic.multi_fidelity import MultiFidelityStrategy
+
+STRATEGIES = {
+    constants.BINARY_SEARCH_STRATEGY: BinarySearchStrategy,
+    constants.BRANCH_AND_BOUND_STRATEGY: BranchAndBoundStrategy,
+    constants.SURROGATE_STRATEGY: SurrogateStrategy,
+    constants.NSGA2_STRATEGY: Nsga2Strategy,
+    constants.MULTI_FIDELITY_STRATEGY: MultiFidelityStrategy
+}
 
 class Logic:
     def __init__(self):
         self.design_space_stats = DesignSpaceStats()
         self.simulator = Simulator()
         self.database = Database()
+        self.journal = None
+        self.pareto_archive = None
+        self.strategy = None
         self.total_simulations = []
         self.successful_simulations = []
         self.failed_simulations = []
+        self.screening_simulations = []
         self.pareto_front_simulations = []
+        self.objective_ranks = []
         self.solutions = []
 
     def set_ui(self,ui):
@@ -23,52 +48,264 @@ class Logic:
 
     def set_design_space_params(self, design_space_params):
         self.design_space_params = design_space_params
+        if self.database.engine != design_space_params.options.database_engine:
+            self.database.close()
+            self.database = Database(design_space_params.options.database_engine)
+        self.database.required_error_metrics = [design_space_params.error_metric] + [
+            objective for objective in design_space_params.options.objectives or [] if objective in constants.ERROR_METRICS]
+        self.simulator.timeout = design_space_params.options.timeout
+        self.simulator.retries = design_space_params.options.retries
+        self.simulator.retry_budget = RetryBudget(design_space_params.options.retry_budget)
+        self.simulator.sequential_validation = None
+        self.simulator.error_model = AdderErrorModel() if design_space_params.options.software_errors else None
+        #only med and wce have a confidence bound, the other error metrics run every validation
+        if (design_space_params.options.sequential_confidence is not None and
+                design_space_params.bitwidth >= constants.EXHAUSTIVE_VALIDATION_BITS and
+                design_space_params.error_metric in (constants.MED, constants.WCE)):
+            self.simulator.sequential_validation = SequentialValidation(design_space_params.error_metric,
+                                                                        design_space_params.threshold,
+                                                                        design_space_params.options.sequential_confidence,
+                                                                        design_space_params.options.validation_chunk)
+        self.database.sequential_validation = self.simulator.sequential_validation
+        self.pareto_archive = ParetoArchive(design_space_params.charactheristic,
+                                            design_space_params.error_metric,
+                                            design_space_params.threshold)
+
+    def set_journal(self, journal):
+        ''' Records the exploration on journal, if it belongs to an interrupted
+        exploration its completed simulations are reused and the executions
+        that were running are collected instead of simulated again '''
+        self.journal = journal
+        self.simulator.job_listener = journal.record_running
+
+    def get_current_best(self):
+        ''' Returns the simulation with the minimum charactheristic under the
+        error metric threshold among the ones finished so far, None if there
+        is none yet. Safe to call while the exploration runs '''
+        return self.pareto_archive.best
+
+    def get_current_pareto_front(self):
+        ''' Returns the Pareto front of the simulations finished so far '''
+        return self.pareto_archive.front()
+
+    def import_database(self, csv_path):
+        ''' Imports a low power csv file into the sqlite database, returns
+        the number of imported rows '''
+        database = Database(constants.SQLITE_ENGINE)
+        try:
+            return database.import_csv(csv_path)
+        finally:
+            database.close()
+
+    def __print_simulation(self, status, simulation):
+        print(f'{status:<7} -> {simulation.design_point} Validations: {simulation.number_of_validations}')
+
+    def __archive_simulation(self, simulation):
+        ''' Adds a successful simulation to the Pareto archive, printing it if
+        it is the new best solution, screening simulations are left out '''
+        if not simulation.is_screening and self.pareto_archive.add(simulation):
+            print(f'Best    -> {simulation.design_point} '
+                  f'{self.design_space_params.charactheristic}: {getattr(simulation, self.design_space_params.charactheristic)} '
+                  f'{self.design_space_params.error_metric}: {getattr(simulation, self.design_space_params.error_metric)}')
 
     def __simulate(self, simulation):
+        """ Simulates a design point that was not found on the database, saves it
+        if the database flag is set and returns True if successful """
 
-        if self.design_space_params.database:
-            if self.database.load_simulation(simulation):
-                self.successful_simulations.append(simulation)
-                self.design_space_stats.increment_number_of_loaded_simulations()
-                print(f'Loaded  -> {simulation.approximation_method} {simulation.approximate_bits}/{simulation.bitwidth} Validations: {simulation.number_of_validations}')
+        try:
+            is_simulation_successful = self.simulator.simulate(simulation)
+        except Exception as error:
+            print(f'Error simulating {simulation.design_point}: {error}')
+            is_simulation_successful = False
+
+        return self.__record_simulation(simulation, is_simulation_successful)
+
+    def __record_simulation(self, simulation, is_simulation_successful):
+        """ Saves and prints the result of a simulation, returns is_simulation_successful """
+
+        self.__persist_simulation(simulation, is_simulation_successful)
+        return self.__report_simulation(simulation, is_simulation_successful)
+
+    def __persist_simulation(self, simulation, is_simulation_successful):
+        """ Saves the result of a simulation on the database and the journal """
+
+        if is_simulation_successful:
+            if self.design_space_params.database:
+                self.database.save_simulation(simulation)
+            if self.journal is not None:
+                self.journal.record_completed(simulation)
+        else:
+            if self.design_space_params.database and simulation.failure_class is not None:
+                self.database.save_failure(simulation)
+            if self.journal is not None:
+                self.journal.record_failed(simulation)
+
+    def __report_simulation(self, simulation, is_simulation_successful):
+        """ Prints the result of a simulation and adds it to the Pareto
+        archive, returns is_simulation_successful """
+
+        if is_simulation_successful:
+            self.__print_simulation('Success', simulation)
+            self.__archive_simulation(simulation)
+            return True
+        else:
+            self.__print_simulation('Failed', simulation)
+            return False
+
+    def __resume_simulations(self, simulations):
+        """ Takes the results of the simulations completed by the journaled
+        exploration and collects the ones whose AUGER execution was running
+        when it stopped, returns the rest """
+
+        resumed = [simulation for simulation in simulations if self.journal.load_completed(simulation)]
+        for simulation in resumed:
+            self.__print_simulation('Resumed', simulation)
+            self.__archive_simulation(simulation)
+
+        resumed_ids = set(id(simulation) for simulation in resumed)
+        for simulation in simulations:
+            running = self.journal.running.get(Journal.key(simulation))
+            if id(simulation) in resumed_ids or running is None:
+                continue
+            try:
+                is_recovered = self.simulator.recover_job(simulation, *running)
+            except Exception as error:
+                print(f'Error recovering {simulation.design_point}: {error}')
+                is_recovered = False
+            if is_recovered:
+                self.__record_simulation(simulation, True)
+                resumed.append(simulation)
+                resumed_ids.add(id(simulation))
+
+        self.__add_successful_simulations(resumed)
+        self.design_space_stats.increment_number_of_resumed_simulations(len(resumed))
+        return [simulation for simulation in simulations if id(simulation) not in resumed_ids]
+
+    def __add_successful_simulations(self, simulations):
+        ''' Appends successful simulations to successful_simulations, or to
+        screening_simulations the screening ones '''
+        for simulation in simulations:
+            if simulation.is_screening:
+                self.screening_simulations.append(simulation)
             else:
-                if self.simulator.simulate(simulation):
-                    self.successful_simulations.append(simulation)
-                    self.database.save_simulation(simulation)
-                    self.design_space_stats.increment_number_of_successful_simulations()
-                    print(f'Success -> {simulation.approximation_method} {simulation.approximate_bits}/{simulation.bitwidth} Validations: {simulation.number_of_validations}')
-                else:
-                    self.failed_simulations.append(simulation)
-                    self.design_space_stats.increment_number_of_failed_simulations()
-                    print(f'Failed  -> {simulation.approximation_method} {simulation.approximate_bits}/{simulation.bitwidth} Validations: {simulation.number_of_validations}')
-        else: 
-            if self.simulator.simulate(simulation):
                 self.successful_simulations.append(simulation)
-                self.design_space_stats.increment_number_of_successful_simulations()
-                print(f'Success -> {simulation.approximation_method} {simulation.approximate_bits}/{simulation.bitwidth} Validations: {simulation.number_of_validations}')
-            else:
-                self.failed_simulations.append(simulation)
-                self.design_space_stats.increment_number_of_failed_simulations()
-                print(f'Failed  -> {simulation.approximation_method} {simulation.approximate_bits}/{simulation.bitwidth} Validations: {simulation.number_of_validations}')
-    
-    def simulate(self):
-        ''' Obtain the charactheristics of a simulation. 
-
-        If database flag is set it looks for the simulation on the database
-        if not found simulates it, then append the simulation to the corresponding
-        list and updates the stats.
+
+    def __load_simulations(self, simulations):
+        """ Resolves all the given simulations against the database in a single
+        batch, returns the ones that were not found """
+
+        loaded = self.database.load_simulations(simulations)
+        for simulation in loaded:
+            self.__print_simulation('Loaded', simulation)
+            self.__archive_simulation(simulation)
+        self.__add_successful_simulations(loaded)
+        self.design_space_stats.increment_number_of_loaded_simulations(len(loaded))
+
+        loaded_ids = set(id(simulation) for simulation in loaded)
+        pending = [simulation for simulation in simulations if id(simulation) not in loaded_ids]
+        for simulation in pending:
+            if simulation.is_synthesized or simulation.is_validated:
+                self.__print_simulation('Partial', simulation)
+        return pending
+
+    def __skip_known_failures(self, simulations):
+        """ Marks as failed, without simulating them, the simulations that failed
+        deterministically on a previous exploration, returns the rest """
+
+        skipped = [simulation for simulation in self.database.load_failures(simulations)
+                   if simulation.failure_class in constants.DETERMINISTIC_FAILURES]
+        for simulation in skipped:
+            self.__print_simulation('Skipped', simulation)
+        self.failed_simulations.extend(skipped)
+        self.design_space_stats.increment_number_of_failed_simulations(len(skipped))
+        self.design_space_stats.increment_number_of_skipped_simulations(len(skipped))
+
+        skipped_ids = set(id(simulation) for simulation in skipped)
+        return [simulation for simulation in simulations if id(simulation) not in skipped_ids]
+
+    def number_of_workers(self):
+        ''' Returns how many simulations run at the same time at most '''
+        if not self.design_space_params.threaded:
+            return 1
+        if self.design_space_params.options.jobs == constants.ADAPTIVE_JOBS:
+            return os.cpu_count() or 1
+        return self.design_space_params.options.jobs
+
+    def __number_of_parse_workers(self):
+        if self.design_space_params.options.parse_workers is None:
+            return os.cpu_count() or 1
+        return self.design_space_params.options.parse_workers
+
+    def __create_worker_pool(self):
+        if self.design_space_params.options.jobs == constants.ADAPTIVE_JOBS:
+            return WorkerPool.create_adaptive()
+        return WorkerPool(self.design_space_params.options.jobs)
+
+    def simulate(self, simulations = None):
+        ''' Obtain the charactheristics of a list of simulations, by default
+        total_simulations.
+
+        If a journal is set the simulations are recorded on it, the ones it
+        already completed are reused and the ones still running when the
+        journaled exploration stopped are collected.
+
+        If database flag is set all the simulations are then looked up on the
+        database in a single batch and only the ones not found are simulated,
+        skipping the ones known to fail deterministically unless retry_failed
+        is set, then each simulation is appended to the corresponding list and
+        the stats are updated.
+
+        Returns a list with True for each simulation that has results and
+        False for each one that failed, in the order of simulations.
         '''
 
-        if self.design_space_params.threaded:
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                for simulation in self.total_simulations:
-                    executor.submit(self.__simulate,simulation)
+        if simulations is None:
+            simulations = self.total_simulations
+
+        pending_simulations = simulations
+        if self.journal is not None:
+            self.journal.record_design_space(simulations)
+            pending_simulations = self.__resume_simulations(pending_simulations)
+        if self.design_space_params.database:
+            pending_simulations = self.__load_simulations(pending_simulations)
+        pending_ids = set(id(simulation) for simulation in pending_simulations)
+        reused_ids = set(id(simulation) for simulation in simulations if id(simulation) not in pending_ids)
+        if self.design_space_params.database:
+            if not self.design_space_params.options.retry_failed:
+                pending_simulations = self.__skip_known_failures(pending_simulations)
+
+        if self.design_space_params.options.execution_engine == constants.ASYNCIO_EXECUTION:
+            concurrency = 1
+            if self.design_space_params.threaded:
+                concurrency = self.__create_worker_pool().max_workers
+            results = AsyncSimulator(self.simulator).simulate_many(pending_simulations, concurrency, self.__record_simulation)
+        elif self.design_space_params.options.execution_engine == constants.PIPELINE_EXECUTION:
+            pipeline = SimulationPipeline(self.simulator, self.number_of_workers(), self.__number_of_parse_workers())
+            results = pipeline.run(pending_simulations, self.__persist_simulation, self.__report_simulation)
+            self.design_space_stats.add_worker_usage(pipeline.busy_time,
+                                                     pipeline.capacity_time,
+                                                     pipeline.peak_workers)
+        elif self.design_space_params.threaded:
+            worker_pool = self.__create_worker_pool()
+            results = worker_pool.map(self.__simulate, pending_simulations)
+            self.design_space_stats.add_worker_usage(worker_pool.busy_time,
+                                                     worker_pool.capacity_time,
+                                                     worker_pool.peak_workers)
+        else:
+            results = [self.__simulate(simulation) for simulation in pending_simulations]
+
+        successful = [simulation for simulation, result in zip(pending_simulations, results) if result]
+        failed = [simulation for simulation, result in zip(pending_simulations, results) if not result]
+        self.__add_successful_simulations(successful)
+        self.failed_simulations.extend(failed)
+        self.design_space_stats.increment_number_of_successful_simulations(len(successful))
+        self.design_space_stats.increment_number_of_failed_simulations(len(failed))
+        for simulation in failed:
+            self.design_space_stats.increment_number_of_failures(simulation.failure_class)
+        self.design_space_stats.number_of_retries = self.simulator.retry_budget.used
 
-        else: 
-            for simulation in self.total_simulations:
-                self.__simulate(simulation)
-            
-        
+        successful_ids = reused_ids | set(id(simulation) for simulation in successful)
+        return [id(simulation) in successful_ids for simulation in simulations]
 
     def init(self):
         '''
@@ -78,13 +315,26 @@ class Logic:
         '''
         self.design_space_stats.start()
 
-        self.design_space_stats.start_design_space_generation()
-        self.__generate_design_space_brute_force()
-        self.design_space_stats.finish_design_space_generation()
-
-        self.design_space_stats.start_design_space_exploration()
-        self.__explore_design_space_brute_force()
-        self.design_space_stats.finish_design_space_exploration()
+        if self.design_space_params.database:
+            self.database.start_writer()
+
+        try:
+            self.design_space_stats.start_design_space_generation()
+            self.__generate_design_space()
+            self.design_space_stats.finish_design_space_generation()
+
+            self.design_space_stats.start_design_space_exploration()
+            self.__explore_design_space_brute_force()
+            self.design_space_stats.finish_design_space_exploration()
+            if self.journal is not None:
+                self.journal.record_finished()
+        except KeyboardInterrupt:
+            print('\nExploration interrupted, saving finished simulations on the database')
+            if self.journal is not None:
+                print(f'Resume it with --resume {self.journal.run_id}')
+            raise
+        finally:
+            self.database.stop_writer()
 
         self.design_space_stats.finish()
 
@@ -93,13 +343,17 @@ class Logic:
         print('\n########## Design Space Exploration Finished ##########\n')
 
         print(f'Database: {self.design_space_params.database}')
+        print(f'Database engine: {self.design_space_params.options.database_engine}')
         print(f'Threads: {self.design_space_params.threaded}')
+        print(f'Jobs: {self.design_space_params.options.jobs}')
+        print(f'Execution engine: {self.design_space_params.options.execution_engine}')
+        print(f'Strategy: {self.design_space_params.options.strategy}')
         print('')
         print(f'Circuit Type: {self.design_space_params.circuit_type}')
         print(f'Aritmethic Circuit: {self.design_space_params.circuit_operation}')
         print(f'Bitwidth: {self.design_space_params.bitwidth}')
-        print(f'Minimun Approximation: {self.design_space_params.min_approx_bits}')
-        print(f'Maximum Approximation: {self.design_space_params.max_approx_bits}')
+        for line in self.__approximation_limits():
+            print(line)
         print(f'Minimized Charactheristic: {self.design_space_params.charactheristic}')
         print(f'Error Metric: {self.design_space_params.error_metric}')
         print('')
@@ -107,54 +361,89 @@ class Logic:
         print(f'Design Space Exploration finished on: {self.design_space_stats.finish_time}')
         print(f'Generation time: {self.design_space_stats.design_space_generation_time}')
         print(f'Exploration time: {self.design_space_stats.design_space_exploration_time}')
+        print(f'Peak workers: {self.design_space_stats.peak_workers}')
+        print(f'Worker utilization: {self.design_space_stats.worker_utilization:.1%}')
         print('')
         print(f'Desgin space size: {self.design_space_stats.number_of_total_simulations}')
         print(f'Loaded simulations: {self.design_space_stats.number_of_loaded_simulations}')
+        print(f'Resumed simulations: {self.design_space_stats.number_of_resumed_simulations}')
         print(f'Succesful simulations: {self.design_space_stats.number_of_successful_simulations}')
         print(f'Failed simulations: {self.design_space_stats.number_of_failed_simulations}')
+        print(f'Skipped known failures: {self.design_space_stats.number_of_skipped_simulations}')
+        for failure_class, number_of_failures in self.design_space_stats.number_of_failures.items():
+            print(f'  {failure_class}: {number_of_failures}')
+        print(f'Retries: {self.design_space_stats.number_of_retries}')
         print(f'Solutions found: {self.design_space_stats.number_of_solutions}')
         print('')
         for solution in self.solutions:
             print('')
-            print(f' {solution.approximation_method} {solution.bitwidth} {solution.approximate_bits}')
+            print(f' {solution.design_point}')
             print(f'  area: {solution.area}')
             print(f'  delay: {solution.delay}')
             print(f'  power: {solution.power}')
             print(f'  pdp: {solution.pdp}')
             print(f'  med: {solution.med}')
             print(f'  wce: {solution.wce}')
+            if self.design_space_params.error_metric not in (constants.MED, constants.WCE):
+                print(f'  {self.design_space_params.error_metric}: {getattr(solution, self.design_space_params.error_metric)}')
+            if solution.error_confidence is not None:
+                print(f'  error confidence: {solution.error_confidence:.1%} after {solution.error_samples} validations')
             print('')
+        for line in self.__objectives_summary():
+            print(line)
+        for line in self.__strategy_summary():
+            print(line)
 
         #Print on file
 
         f = open("log.txt", "a")
         f.write('\n########## Design Space Exploration Finished ##########\n')
         f.write(f'Database: {self.design_space_params.database}\n')
-        f.write(f'Threads: {self.design_space_params.threaded}\n\n')
+        f.write(f'Database engine: {self.design_space_params.options.database_engine}\n')
+        f.write(f'Threads: {self.design_space_params.threaded}\n')
+        f.write(f'Jobs: {self.design_space_params.options.jobs}\n')
+        f.write(f'Execution engine: {self.design_space_params.options.execution_engine}\n')
+        f.write(f'Strategy: {self.design_space_params.options.strategy}\n\n')
         f.write(f'Circuit Type: {self.design_space_params.circuit_type}\n')
         f.write(f'Aritmethic Circuit: {self.design_space_params.circuit_operation}\n')
         f.write(f'Bitwidth: {self.design_space_params.bitwidth}\n')
-        f.write(f'Minimun Approximation: {self.design_space_params.min_approx_bits}\n')
-        f.write(f'Maximum Approximation: {self.design_space_params.max_approx_bits}\n\n')
+        for line in self.__approximation_limits():
+            f.write(line + '\n')
+        f.write('\n')
         f.write(f'Minimized Charactheristic: {self.design_space_params.charactheristic}\n')
         f.write(f'Error Metric: {self.design_space_params.error_metric}\n\n')
         f.write(f'Design Space Exploration started on: {self.design_space_stats.start_time}\n')
         f.write(f'Design Space Exploration finished on: {self.design_space_stats.finish_time}\n')
         f.write(f'Generation time: {self.design_space_stats.design_space_generation_time}\n')
-        f.write(f'Exploration time: {self.design_space_stats.design_space_exploration_time}\n\n')
+        f.write(f'Exploration time: {self.design_space_stats.design_space_exploration_time}\n')
+        f.write(f'Peak workers: {self.design_space_stats.peak_workers}\n')
+        f.write(f'Worker utilization: {self.design_space_stats.worker_utilization:.1%}\n\n')
         f.write(f'Desgin space size: {self.design_space_stats.number_of_total_simulations}\n')
         f.write(f'Loaded simulations: {self.design_space_stats.number_of_loaded_simulations}\n')
+        f.write(f'Resumed simulations: {self.design_space_stats.number_of_resumed_simulations}\n')
         f.write(f'Succesful simulations: {self.design_space_stats.number_of_successful_simulations}\n')
         f.write(f'Failed simulations: {self.design_space_stats.number_of_failed_simulations}\n')
+        f.write(f'Skipped known failures: {self.design_space_stats.number_of_skipped_simulations}\n')
+        for failure_class, number_of_failures in self.design_space_stats.number_of_failures.items():
+            f.write(f'  {failure_class}: {number_of_failures}\n')
+        f.write(f'Retries: {self.design_space_stats.number_of_retries}\n')
         f.write(f'Solutions found: {self.design_space_stats.number_of_solutions}\n')
         for solution in self.solutions:
-            f.write(f'  {solution.approximation_method} {solution.bitwidth} {solution.approximate_bits}')
+            f.write(f'  {solution.design_point}')
             f.write(f' area: {solution.area}')
             f.write(f' delay: {solution.delay}')
             f.write(f' power: {solution.power}')
             f.write(f' pdp: {solution.pdp}')
             f.write(f' med: {solution.med}')
             f.write(f' wce: {solution.wce}')
+            if self.design_space_params.error_metric not in (constants.MED, constants.WCE):
+                f.write(f' {self.design_space_params.error_metric}: {getattr(solution, self.design_space_params.error_metric)}')
+            if solution.error_confidence is not None:
+                f.write(f' error confidence: {solution.error_confidence:.1%} after {solution.error_samples} validations')
+        for line in self.__objectives_summary():
+            f.write(line + '\n')
+        for line in self.__strategy_summary():
+            f.write(line + '\n')
         f.close()
 
         #Gerenate graphics
@@ -188,32 +477,164 @@ class Logic:
         plt.ylabel(self.design_space_params.charactheristic)
         plt.savefig('result.png')
 
+        if self.objective_ranks:
+            self.__plot_objectives()
+
+    def __approximation_limits(self):
+        ''' Returns the lines describing the approximation range of the design space '''
+        if self.design_space_params.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
+            return [f'Resultant Bits: {self.design_space_params.min_r} to {self.design_space_params.max_r}',
+                    f'Previous Bits: {self.design_space_params.min_p} to {self.design_space_params.max_p}']
+        return [f'Minimun Approximation: {self.design_space_params.min_approx_bits}',
+                f'Maximum Approximation: {self.design_space_params.max_approx_bits}']
+
+    def __strategy_summary(self):
+        ''' Returns the lines describing how the exploration strategy went '''
+        if self.strategy is None:
+            return []
+        return ['', f'Strategy {self.design_space_params.options.strategy}:'] + ['  ' + line for line in self.strategy.summary()]
+
+    def __objectives_summary(self):
+        ''' Returns the lines describing the multi-objective ranks '''
+        if not self.objective_ranks:
+            return []
+
+        objectives = self.design_space_params.options.objectives
+        lines = ['',
+                 f'Objectives: {", ".join(objectives)}',
+                 f'Non dominated ranks: {len(self.objective_ranks)}',
+                 f'Multi-objective front size: {len(self.objective_ranks[0])}']
+        for simulation in self.objective_ranks[0]:
+            values = ' '.join(f'{objective}: {getattr(simulation, objective)}' for objective in objectives)
+            lines.append(f'  {simulation.design_point} {values}')
+        return lines
+
+    def __plot_objectives(self):
+        ''' Plots every pair of objectives on objectives.png, the color of each
+        simulation is its rank and the multi-objective front is marked '''
+        objectives = self.design_space_params.options.objectives
+        pairs = [(x, y) for i, x in enumerate(objectives) for y in objectives[i + 1:]]
+        columns = min(3, len(pairs))
+        rows = (len(pairs) + columns - 1) // columns
+
+        figure, axes = plt.subplots(rows, columns, figsize = (5 * columns, 4 * rows), squeeze = False)
+        ranked = [(rank, simulation) for rank, simulations in enumerate(self.objective_ranks) for simulation in simulations]
+        for axis, (x, y) in zip(axes.flat, pairs):
+            points = axis.scatter([getattr(simulation, x) for _, simulation in ranked],
+                                  [getattr(simulation, y) for _, simulation in ranked],
+                                  c = [rank for rank, _ in ranked], cmap = 'viridis_r', s = 8)
+            axis.plot([getattr(simulation, x) for simulation in self.objective_ranks[0]],
+                      [getattr(simulation, y) for simulation in self.objective_ranks[0]], 'rx')
+            axis.set_xlabel(x)
+            axis.set_ylabel(y)
+            axis.grid(True)
+        for axis in list(axes.flat)[len(pairs):]:
+            axis.set_visible(False)
+        figure.colorbar(points, ax = axes, label = 'rank')
+        figure.savefig('objectives.png')
+        plt.close(figure)
+
+    def low_power_methods(self):
+        ''' Returns the low power approximation methods of the explored
+        operation, only adders have them '''
+        if self.design_space_params.circuit_operation == constants.ADDER:
+            return constants.LOW_POWER_ADDERS
+        return []
+
+    def number_of_validations(self):
+        ''' Returns the number of validations of each simulation, exhaustive
+        below 20 bits '''
+        if self.design_space_params.bitwidth < constants.EXHAUSTIVE_VALIDATION_BITS: #if 20 of grather num of validations becomes to big
+            return 2 ** self.design_space_params.bitwidth
+        else:
+            return 1000000
+
+    def create_simulation(self, approximation_method, approximate_bits, number_of_validations = None):
+        """ Creates a design point of the design space and appends it to
+        total_simulations, it is not simulated until passed to simulate
+
+        Parameters
+        ----------
+        approximation_method : str
+            one of constants.LOW_POWER_ADDERS
+        approximate_bits : int
+            number of approximate bits
+        number_of_validations : int
+            by default number_of_validations()
+        """
+        if number_of_validations is None:
+            number_of_validations = self.number_of_validations()
+
+        simulation = CircuitSimulationBuilder.create_circuit_simulation_low_power(
+            approximation_method,
+            constants.SYNTHESIS,
+            number_of_validations,
+            self.design_space_params.circuit_operation,
+            self.design_space_params.bitwidth,
+            approximate_bits
+        )
+        self.total_simulations.append(simulation)
+        self.design_space_stats.increment_number_of_total_simulations()
+        return simulation
+
+    def create_high_performance_simulation(self, approximation_method, r, p, number_of_validations = None):
+        """ Creates a design point of the high performance design space and
+        appends it to total_simulations, it is not simulated until passed to
+        simulate
+
+        Parameters
+        ----------
+        approximation_method : str
+            one of constants.HIGH_PERFORMANCE_ADDERS
+        r : int
+            resultant bits of each sub-adder
+        p : int
+            previous bits used to predict the carry of each sub-adder
+        number_of_validations : int
+            by default number_of_validations()
+        """
+        if number_of_validations is None:
+            number_of_validations = self.number_of_validations()
+
+        simulation = CircuitSimulationBuilder.create_circuit_simulation_high_performance(
+            approximation_method,
+            constants.SYNTHESIS,
+            number_of_validations,
+            self.design_space_params.circuit_operation,
+            self.design_space_params.bitwidth,
+            r,
+            p
+        )
+        self.total_simulations.append(simulation)
+        self.design_space_stats.increment_number_of_total_simulations()
+        return simulation
+
+    def __generate_design_space(self):
+        """ Generates and simulates the design space following the strategy of
+        the design_space_params """
+
+        if self.design_space_params.options.strategy == constants.BRUTE_FORCE_STRATEGY:
+            self.__generate_design_space_brute_force()
+        else:
+            self.strategy = STRATEGIES[self.design_space_params.options.strategy](self)
+            self.strategy.run()
+
     def __generate_design_space_brute_force(self):
         """ Given the design_space_params fills the simulations array with the 
         simulations to be done"""
 
-        number_of_validations = 0
-
-        if self.design_space_params.bitwidth < 20: #if 20 of grather num of validations becomes to big
-            number_of_validations = 2 ** self.design_space_params.bitwidth
-
-        else:
-            number_of_validations = 1000000 
-
         # generate circuits to be generated
         if self.design_space_params.circuit_type == constants.LOW_POWER_CIRCUIT:
+            for approximation_method in self.low_power_methods():
+                for approximate_bits in range(self.design_space_params.min_approx_bits, self.design_space_params.max_approx_bits + 1):
+                    self.create_simulation(approximation_method, approximate_bits)
+        elif self.design_space_params.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
             if self.design_space_params.circuit_operation == constants.ADDER:
-                for approximation_method in constants.LOW_POWER_ADDERS:
-                    for approximate_bits in range(self.design_space_params.min_approx_bits, self.design_space_params.max_approx_bits + 1):
-                        self.total_simulations.append(CircuitSimulationBuilder.create_circuit_simulation_low_power(
-                            approximation_method, 
-                            constants.SYNTHESIS, 
-                            number_of_validations, 
-                            self.design_space_params.circuit_operation, 
-                            self.design_space_params.bitwidth, 
-                            approximate_bits
-                        ))
-                        self.design_space_stats.increment_number_of_total_simulations()
+                for approximation_method in constants.HIGH_PERFORMANCE_ADDERS:
+                    for r in range(self.design_space_params.min_r, self.design_space_params.max_r + 1):
+                        for p in range(self.design_space_params.min_p, self.design_space_params.max_p + 1):
+                            if r + p <= self.design_space_params.bitwidth:
+                                self.create_high_performance_simulation(approximation_method, r, p)
 
         #simulate 
         self.simulate()
@@ -224,6 +645,8 @@ class Logic:
         """
 
         self.generate_pareto_front()
+        if self.design_space_params.options.objectives:
+            self.objective_ranks = non_dominated_sort(self.successful_simulations, self.design_space_params.options.objectives)
 
         for simulation in self.pareto_front_simulations:
             if(getattr(simulation, self.design_space_params.error_metric) <= self.design_space_params.threshold):
@@ -234,26 +657,9 @@ class Logic:
                     self.solutions[0] = simulation
 
     def generate_pareto_front(self):
+        """ Fills pareto_front_simulations with the successful simulations not
+        dominated on the minimized charactheristic and error metric """
 
-        dominated = False
-
-        for simulation1 in self.successful_simulations:
-            for simulation2 in self.successful_simulations:
-                if(
-                    (
-                        getattr(simulation2, self.design_space_params.charactheristic) <= getattr(simulation1, self.design_space_params.charactheristic) 
-                        and getattr(simulation2, self.design_space_params.error_metric) <= getattr(simulation1, self.design_space_params.error_metric)
-                    )
-                    and
-                    (    
-                        getattr(simulation2, self.design_space_params.charactheristic) < getattr(simulation1, self.design_space_params.charactheristic) 
-                        or getattr(simulation2, self.design_space_params.error_metric) < getattr(simulation1, self.design_space_params.error_metric)
-                    )   
-                ):
-                    dominated = True
-                    break
-
-            if not dominated:
-                self.pareto_front_simulations.append(simulation1)
-            else:
-                dominated = False
\ No newline at end of file
+        self.pareto_front_simulations = pareto_front(self.successful_simulations,
+                                                     self.design_space_params.charactheristic,
+                                                     self.design_space_params.error_metric)
@@ -0,0 +1,80 @@
+from logic.pareto import pareto_front
+
+
+class MultiFidelityStrategy:
+    """
+    Exploration strategy that screens every design point with
+    screening_validations validations, which are cheaper to simulate, and
+    simulates again with the full number of validations only the candidates:
+    the design points whose screened error metric is within fidelity_margin
+    of the threshold, where the sampling error could change the decision,
+    and the ones within fidelity_margin of the Pareto front of the screening,
+    which are the only ones that could become a solution or enter the front.
+
+    Screening simulations are kept on the screening_simulations of the logic,
+    apart from the candidate solutions, and are stored on the database under
+    their own number of validations, so both fidelities are cached. Design
+    points whose screening fails are not simulated again. If the screening
+    validations are not fewer than the full ones every design point is
+    simulated once at full fidelity.
+
+    Attributes
+    ----------
+    logic : Logic
+        logic whose design space is explored
+    screening_validations : int
+        validations of the screening simulations
+    candidates : tuple[]
+        (approximation method, approximate bits) simulated at full fidelity
+    """
+
+    def __init__(self, logic):
+        self.logic = logic
+        self.screening_validations = min(logic.design_space_params.options.screening_validations, logic.number_of_validations())
+        self.candidates = []
+
+    def __design_points(self):
+        params = self.logic.design_space_params
+        return [(method, approximate_bits)
+                for method in self.logic.low_power_methods()
+                for approximate_bits in range(params.min_approx_bits, params.max_approx_bits + 1)]
+
+    def run(self):
+        design_points = self.__design_points()
+        if self.screening_validations >= self.logic.number_of_validations():
+            self.candidates = design_points
+        else:
+            screening = [self.logic.create_simulation(method, approximate_bits, self.screening_validations)
+                         for method, approximate_bits in design_points]
+            for simulation in screening:
+                simulation.is_screening = True
+            results = self.logic.simulate(screening)
+            self.candidates = self.__candidates([simulation for simulation, is_simulation_successful in zip(screening, results)
+                                                 if is_simulation_successful])
+
+        self.logic.simulate([self.logic.create_simulation(method, approximate_bits) for method, approximate_bits in self.candidates])
+
+    def __candidates(self, screened):
+        ''' Returns the design points of the successful screening simulations
+        near the threshold or the Pareto front '''
+        params = self.logic.design_space_params
+        margin = params.options.fidelity_margin
+        front = [(getattr(simulation, params.charactheristic), getattr(simulation, params.error_metric))
+                 for simulation in pareto_front(screened, params.charactheristic, params.error_metric)]
+
+        candidates = []
+        for simulation in screened:
+            charactheristic = getattr(simulation, params.charactheristic)
+            error = getattr(simulation, params.error_metric)
+            near_threshold = abs(error - params.threshold) <= margin * params.threshold
+            #a point is near the front unless a front point still dominates it when worsened by the margin
+            near_front = not any(front_charactheristic * (1 + margin) <= charactheristic and front_error * (1 + margin) <= error
+                                 for front_charactheristic, front_error in front)
+            if near_threshold or near_front:
+                candidates.append((simulation.approximation_method, simulation.approximate_bits))
+        return candidates
+
+    def summary(self):
+        ''' Returns the lines describing how the strategy went '''
+        return [f'Screening validations: {self.screening_validations} of {self.logic.number_of_validations()}',
+                f'Full fidelity simulations: {len(self.candidates)} of {len(self.__design_points())}']
@@ -0,0 +1,159 @@
+import random
+from constants import constants
+from logic.pareto import non_dominated_sort
+
+
+def crowding_distance(simulations, objectives):
+    ''' Returns the crowding distance of each simulation of a rank, in their
+    order: the sum over the objectives of the normalized distance between its
+    two neighbours, infinite for the simulations at the ends of an objective '''
+    distances = [0.0] * len(simulations)
+    for objective in objectives:
+        values = [getattr(simulation, objective) for simulation in simulations]
+        order = sorted(range(len(simulations)), key = values.__getitem__)
+        span = values[order[-1]] - values[order[0]]
+        distances[order[0]] = distances[order[-1]] = float('inf')
+        if span == 0:
+            continue
+        for previous, index, following in zip(order, order[1:], order[2:]):
+            distances[index] += (values[following] - values[previous]) / span
+    return distances
+
+
+class Nsga2Strategy:
+    """
+    Evolutionary exploration strategy of the high performance design space,
+    whose design points are an approximation method and its (r, p) pair,
+    following NSGA-II. The population is ranked by non dominated sorting on
+    the objectives, the charactheristic and the error metric unless the
+    design space params set others, and by crowding distance within a rank.
+
+    Each generation breeds population_size children by binary tournament,
+    uniform crossover and mutation of one step on r and p, simulates all the
+    new ones in a single batch, so they run in parallel and the ones stored
+    on the database are loaded instead of simulated, and keeps the best
+    population_size design points among parents and children. Failed design
+    points are ranked after every successful one.
+
+    Every random choice comes from a random.Random seeded with the seed of
+    the design space params, so the same seed explores the same design
+    points.
+
+    Attributes
+    ----------
+    logic : Logic
+        logic whose design space is explored
+    seed : int
+        seed of the random numbers
+    objectives : str[]
+        minimized metrics
+    population : tuple[]
+        (approximation method, r, p) of the current population
+    number_of_generations : int
+        generations bred after the initial population
+    """
+
+    CROSSOVER_PROBABILITY = 0.9
+    MUTATION_PROBABILITY = 0.5
+
+    def __init__(self, logic):
+        params = logic.design_space_params
+        self.logic = logic
+        self.seed = params.options.seed
+        self.objectives = params.options.objectives or [params.charactheristic, params.error_metric]
+        self.population = []
+        self.number_of_generations = 0
+        self.__random = random.Random(params.options.seed)
+        self.__evaluated = {} #simulation of each design point, None if it failed
+
+    def __design_space(self):
+        params = self.logic.design_space_params
+        return [(method, r, p)
+                for method in constants.HIGH_PERFORMANCE_ADDERS
+                for r in range(params.min_r, params.max_r + 1)
+                for p in range(params.min_p, params.max_p + 1)
+                if r + p <= params.bitwidth]
+
+    def run(self):
+        params = self.logic.design_space_params
+        design_space = self.__design_space()
+
+        self.population = self.__random.sample(design_space, min(params.options.population_size, len(design_space)))
+        self.__evaluate(self.population)
+        self.population = self.__select(self.population)
+
+        while self.number_of_generations < params.options.generations and len(self.__evaluated) < len(design_space):
+            children = self.__breed()
+            self.__evaluate(children)
+            self.population = self.__select(self.population + [child for child in children if child not in self.population])
+            self.number_of_generations += 1
+
+    def __evaluate(self, design_points):
+        ''' Simulates in a single batch the design points not evaluated yet '''
+        pending = [design_point for design_point in dict.fromkeys(design_points) if design_point not in self.__evaluated]
+        simulations = [self.logic.create_high_performance_simulation(*design_point) for design_point in pending]
+        results = self.logic.simulate(simulations)
+        for design_point, simulation, is_simulation_successful in zip(pending, simulations, results):
+            self.__evaluated[design_point] = simulation if is_simulation_successful else None
+
+    def __fitness(self, design_points):
+        ''' Returns the (rank, -crowding distance) of each design point, smaller is better '''
+        simulations = [self.__evaluated[design_point] for design_point in design_points if self.__evaluated[design_point] is not None]
+        ranks = non_dominated_sort(simulations, self.objectives)
+
+        fitness = {}
+        for rank, front in enumerate(ranks):
+            for simulation, distance in zip(front, crowding_distance(front, self.objectives)):
+                fitness[id(simulation)] = (rank, -distance)
+        failed = (len(ranks), 0.0)
+        return {design_point: fitness[id(self.__evaluated[design_point])] if self.__evaluated[design_point] is not None else failed
+                for design_point in design_points}
+
+    def __select(self, design_points):
+        ''' Returns the population_size best design points '''
+        fitness = self.__fitness(design_points)
+        return sorted(design_points, key = lambda design_point: fitness[design_point])[:self.logic.design_space_params.options.population_size]
+
+    def __tournament(self, fitness):
+        first, second = self.__random.sample(self.population, 2) if len(self.population) > 1 else self.population * 2
+        return first if fitness[first] <= fitness[second] else second
+
+    def __breed(self):
+        ''' Returns population_size children, avoiding design points already evaluated when possible '''
+        fitness = self.__fitness(self.population)
+        children = []
+        for _ in range(self.logic.design_space_params.options.population_size):
+            for attempt in range(10):
+                child = self.__mutate(self.__crossover(self.__tournament(fitness), self.__tournament(fitness)))
+                if child not in self.__evaluated and child not in children:
+                    break
+            children.append(child)
+        return children
+
+    def __crossover(self, first, second):
+        if self.__random.random() >= self.CROSSOVER_PROBABILITY:
+            return first
+        return tuple(self.__random.choice(genes) for genes in zip(first, second))
+
+    def __mutate(self, design_point):
+        params = self.logic.design_space_params
+        method, r, p = design_point
+        if len(constants.HIGH_PERFORMANCE_ADDERS) > 1 and self.__random.random() < self.MUTATION_PROBABILITY / 2:
+            method = self.__random.choice(constants.HIGH_PERFORMANCE_ADDERS)
+        if self.__random.random() < self.MUTATION_PROBABILITY:
+            r = min(max(r + self.__random.choice((-1, 1)), params.min_r), params.max_r)
+        if self.__random.random() < self.MUTATION_PROBABILITY:
+            p = min(max(p + self.__random.choice((-1, 1)), params.min_p), params.max_p)
+        #keep r + p within the bitwidth
+        r = min(r, params.bitwidth - params.min_p)
+        p = min(p, params.bitwidth - r)
+        return (method, r, p)
+
+    def summary(self):
+        ''' Returns the lines describing how the strategy went '''
+        fitness = self.__fitness(self.population)
+        front = [design_point for design_point in self.population if fitness[design_point][0] == 0 and self.__evaluated[design_point] is not None]
+        return [f'Seed: {self.seed}',
+                f'Generations: {self.number_of_generations}',
+                f'Simulated design points: {len(self.__evaluated)} of {len(self.__design_space())}',
+                f'Final population front size: {len(front)}']
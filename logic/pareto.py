@@ -0,0 +1,281 @@
+''' Pareto front of the simulations of a design space '''
+import bisect
+import threading
+
+
+def pareto_front(simulations, charactheristic, error_metric):
+    """Returns the simulations not dominated by any other one, in their
+    original order. A simulation dominates another if neither its
+    charactheristic nor its error metric are bigger and at least one is
+    smaller, so duplicated points never dominate each other and are all
+    kept.
+
+    Sorts by (charactheristic, error metric) and sweeps the simulations
+    keeping the smallest error seen so far, O(n log n).
+
+    Parameters
+    ----------
+    simulations : CircuitSimulation[]
+        successful simulations
+    charactheristic : str
+        name of the minimized charactheristic, ex constants.AREA
+    error_metric : str
+        name of the minimized error metric, ex constants.WCE
+    """
+
+    points = [(getattr(simulation, charactheristic), getattr(simulation, error_metric)) for simulation in simulations]
+    order = sorted(range(len(points)), key = points.__getitem__)
+
+    on_front = [False] * len(points)
+    best_error = float('inf') #smallest error of the simulations with a smaller charactheristic
+    start = 0
+    while start < len(order):
+        #simulations sharing a charactheristic are sorted by error, only the
+        #ones with the group's smallest error can be on the front
+        charactheristic_value, group_error = points[order[start]]
+        end = start
+        while end < len(order) and points[order[end]] == (charactheristic_value, group_error):
+            end += 1
+        if group_error < best_error:
+            for index in order[start:end]:
+                on_front[index] = True
+            best_error = group_error
+        while end < len(order) and points[order[end]][0] == charactheristic_value:
+            end += 1
+        start = end
+
+    return [simulation for simulation, is_on_front in zip(simulations, on_front) if is_on_front]
+
+
+def brute_force_pareto_front(simulations, charactheristic, error_metric):
+    ''' Reference O(n^2) implementation of pareto_front, compares every
+    simulation against every other one '''
+
+    front = []
+    for simulation1 in simulations:
+        charactheristic1 = getattr(simulation1, charactheristic)
+        error1 = getattr(simulation1, error_metric)
+        dominated = False
+        for simulation2 in simulations:
+            charactheristic2 = getattr(simulation2, charactheristic)
+            error2 = getattr(simulation2, error_metric)
+            if (charactheristic2 <= charactheristic1 and error2 <= error1 and
+                (charactheristic2 < charactheristic1 or error2 < error1)):
+                dominated = True
+                break
+        if not dominated:
+            front.append(simulation1)
+    return front
+
+
+def _dominates(point1, point2):
+    ''' Returns True if point1 is not bigger than point2 on any objective and differs '''
+    return point1 != point2 and all(value1 <= value2 for value1, value2 in zip(point1, point2))
+
+
+def _kung(points, order):
+    ''' Kung's divide and conquer on the indexes in order, sorted
+    lexicographically, returns the indexes of the non dominated points.
+    A point can only be dominated by points sorted before it, so only the
+    bottom half has to be filtered against the front of the top half '''
+    if len(order) <= 1:
+        return order
+    middle = len(order) // 2
+    top = _kung(points, order[:middle])
+    bottom = _kung(points, order[middle:])
+    return top + [index for index in bottom
+                  if not any(_dominates(points[front_index], points[index]) for front_index in top)]
+
+
+def multi_objective_pareto_front(simulations, objectives):
+    """Returns the simulations not dominated by any other one on all the
+    objectives, in their original order. Duplicated points are all kept.
+
+    Uses the sort and sweep of pareto_front for two objectives and Kung's
+    divide and conquer, O(n log n + n f) with f the front size, for more.
+
+    Parameters
+    ----------
+    simulations : CircuitSimulation[]
+        successful simulations
+    objectives : str[]
+        names of the minimized metrics, ex [constants.AREA, constants.DELAY, constants.WCE]
+    """
+
+    if len(objectives) == 2:
+        return pareto_front(simulations, objectives[0], objectives[1])
+
+    points = [tuple(getattr(simulation, objective) for objective in objectives) for simulation in simulations]
+    order = sorted(range(len(points)), key = points.__getitem__)
+    on_front = set(_kung(points, order))
+    return [simulation for index, simulation in enumerate(simulations) if index in on_front]
+
+
+def non_dominated_sort(simulations, objectives):
+    """Splits the simulations into ranks: the first one is their Pareto front,
+    the second one the front of the rest and so on. Each rank keeps the
+    original order of the simulations.
+
+    Parameters
+    ----------
+    simulations : CircuitSimulation[]
+        successful simulations
+    objectives : str[]
+        names of the minimized metrics
+    """
+
+    ranks = []
+    remaining = list(simulations)
+    while remaining:
+        front = multi_objective_pareto_front(remaining, objectives)
+        ranks.append(front)
+        front_ids = set(id(simulation) for simulation in front)
+        remaining = [simulation for simulation in remaining if id(simulation) not in front_ids]
+    return ranks
+
+
+class ParetoArchive:
+    """
+    Two objective Pareto front updated one simulation at a time, so it can be
+    kept while the exploration runs. The front is stored sorted by
+    charactheristic, which makes the errors strictly decreasing, and each
+    entry keeps every simulation with exactly the same point.
+
+    As in sortedcontainers the entries are split in blocks of at most
+    2 * block_size, indexed by the biggest charactheristic of each one, so an
+    insertion bisects the block index and the block, O(log n) comparisons,
+    and only shifts the entries of one block instead of the whole front. The
+    entries the new point dominates are contiguous and each one is removed
+    once, whole blocks at a time, so removing them is amortized over the
+    insertions.
+
+    Attributes
+    ----------
+    charactheristic : str
+        name of the minimized charactheristic
+    error_metric : str
+        name of the minimized error metric
+    threshold : float
+        maximum error metric of a solution
+    block_size : int
+        entries of a block, blocks are split once they double it
+    best : CircuitSimulation
+        simulation with the smallest charactheristic among the ones with an
+        error metric not bigger than threshold, None if there is none yet
+    number_of_simulations : int
+        number of simulations added
+    settled_for : int
+        number of simulations added since best last changed
+    """
+
+    def __init__(self, charactheristic, error_metric, threshold, block_size = 256):
+        self.charactheristic = charactheristic
+        self.error_metric = error_metric
+        self.threshold = threshold
+        self.block_size = block_size
+        self.best = None
+        self.number_of_simulations = 0
+        self.settled_for = 0
+        #each block keeps parallel lists of its charactheristics, negative
+        #errors, increasing so they can be bisected, and simulations
+        self.__charactheristics = []
+        self.__negative_errors = []
+        self.__simulations = []
+        self.__maxes = [] #biggest charactheristic of each block
+        self.__lock = threading.Lock()
+
+    def __locate(self, charactheristic):
+        """ Returns the block and the position in it after every entry with a
+        charactheristic not bigger than charactheristic """
+        block = bisect.bisect_right(self.__maxes, charactheristic)
+        if block == len(self.__maxes):
+            block -= 1
+            return block, len(self.__charactheristics[block])
+        return block, bisect.bisect_right(self.__charactheristics[block], charactheristic)
+
+    def __insert(self, block, index, charactheristic, error, simulation):
+        self.__charactheristics[block].insert(index, charactheristic)
+        self.__negative_errors[block].insert(index, -error)
+        self.__simulations[block].insert(index, [simulation])
+        self.__maxes[block] = self.__charactheristics[block][-1]
+
+    def __remove_dominated(self, block, index, error):
+        """ Removes the entries after index of block with an error not smaller than error """
+        negative_errors = self.__negative_errors[block]
+        end = bisect.bisect_right(negative_errors, -error, index + 1)
+        is_block_end = end == len(negative_errors)
+        for values in (self.__charactheristics[block], negative_errors, self.__simulations[block]):
+            del values[index + 1:end]
+        self.__maxes[block] = self.__charactheristics[block][-1]
+        if not is_block_end:
+            return #an entry of the block is not dominated, neither are the following ones
+
+        following = block + 1
+        last = following
+        while last < len(self.__maxes) and self.__negative_errors[last][-1] <= -error:
+            last += 1
+        for blocks in (self.__charactheristics, self.__negative_errors, self.__simulations, self.__maxes):
+            del blocks[following:last]
+        if following < len(self.__maxes):
+            end = bisect.bisect_right(self.__negative_errors[following], -error)
+            for values in (self.__charactheristics[following], self.__negative_errors[following], self.__simulations[following]):
+                del values[:end]
+
+    def __split(self, block):
+        """ Splits block in two halves once it doubles block_size """
+        if len(self.__charactheristics[block]) <= 2 * self.block_size:
+            return
+        for blocks in (self.__charactheristics, self.__negative_errors, self.__simulations):
+            values = blocks[block]
+            blocks[block:block + 1] = [values[:self.block_size], values[self.block_size:]]
+        self.__maxes[block:block + 1] = [self.__charactheristics[block][-1], self.__charactheristics[block + 1][-1]]
+
+    def add(self, simulation):
+        """Adds a successful simulation to the archive, returns True if it
+        became the best solution under the threshold """
+
+        charactheristic = getattr(simulation, self.charactheristic)
+        error = getattr(simulation, self.error_metric)
+
+        with self.__lock:
+            self.number_of_simulations += 1
+            self.settled_for += 1
+
+            if not self.__maxes:
+                self.__charactheristics.append([charactheristic])
+                self.__negative_errors.append([-error])
+                self.__simulations.append([[simulation]])
+                self.__maxes.append(charactheristic)
+            else:
+                block, index = self.__locate(charactheristic)
+                previous_block, previous = (block, index - 1) if index > 0 else (block - 1, len(self.__charactheristics[block - 1]) - 1)
+                if previous_block >= 0:
+                    previous_charactheristic = self.__charactheristics[previous_block][previous]
+                    previous_error = -self.__negative_errors[previous_block][previous]
+                    if previous_error <= error:
+                        if (previous_charactheristic, previous_error) == (charactheristic, error):
+                            self.__simulations[previous_block][previous].append(simulation)
+                        return False #dominated, or a duplicate of a point that is already the best if it is under the threshold
+
+                if previous_block >= 0 and previous_charactheristic == charactheristic:
+                    #the new point dominates the entry with the same charactheristic
+                    block, index = previous_block, previous
+                    self.__negative_errors[block][index] = -error
+                    self.__simulations[block][index] = [simulation]
+                else:
+                    self.__insert(block, index, charactheristic, error, simulation)
+                #and the following ones with a bigger error
+                self.__remove_dominated(block, index, error)
+                self.__split(block)
+
+            if error <= self.threshold and (self.best is None or
+                                            (charactheristic, error) < (getattr(self.best, self.charactheristic), getattr(self.best, self.error_metric))):
+                self.best = simulation
+                self.settled_for = 0
+                return True
+            return False
+
+    def front(self):
+        """Returns the simulations on the front sorted by charactheristic"""
+        with self.__lock:
+            return [simulation for block in self.__simulations for simulations in block for simulation in simulations]
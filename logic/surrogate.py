@@ -0,0 +1,137 @@
+import numpy as np
+from constants import constants
+
+
+class SurrogateStrategy:
+    """
+    Exploration strategy that predicts most of the design space instead of
+    simulating it. For each approximation method it fits a polynomial of
+    approximate_bits, of degree up to DEGREE, to the charactheristic and to
+    log2(1 + error metric) of its successful simulations, error metrics tend
+    to grow exponentially with the approximate bits.
+
+    It starts simulating the first, middle and last approximate bits of each
+    method plus the ones already stored on the database, then repeatedly
+    predicts the design points not simulated yet and simulates the ones
+    predicted to be near the optimum: an error metric under the threshold
+    within TOLERANCE and a charactheristic over the best solution, simulated
+    or predicted, by less than TOLERANCE times the charactheristic range of
+    the design space. It stops when no design point is near the optimum any
+    more.
+
+    Attributes
+    ----------
+    logic : Logic
+        logic whose design space is explored
+    predictions : dict
+        (charactheristic, error metric) predicted for each (method, approximate bits)
+        the last time the models were fitted
+    prediction_errors : dict
+        relative errors of the predictions of the design points simulated
+        after being predicted, per metric
+    """
+
+    DEGREE = 2
+    TOLERANCE = 0.1
+
+    def __init__(self, logic):
+        self.logic = logic
+        self.predictions = {}
+        self.prediction_errors = {logic.design_space_params.charactheristic: [],
+                                  logic.design_space_params.error_metric: []}
+        self.__simulated = {method: {} for method in logic.low_power_methods()}
+
+    def run(self):
+        params = self.logic.design_space_params
+        approximate_bits = range(params.min_approx_bits, params.max_approx_bits + 1)
+        cached = self.__cached_design_points()
+        self.__simulate(sorted(set((method, bits) for method in self.logic.low_power_methods()
+                                   for bits in (approximate_bits[0], approximate_bits[len(approximate_bits) // 2], approximate_bits[-1])) |
+                               cached))
+
+        while True:
+            self.__predict()
+            candidates = self.__candidates()
+            if not candidates:
+                break
+            self.__simulate(candidates)
+
+    def __cached_design_points(self):
+        ''' Returns the (method, approximate bits) of the design space already stored on the database '''
+        params = self.logic.design_space_params
+        if not params.database:
+            return set()
+
+        number_of_validations = self.logic.number_of_validations()
+        return set((simulation.approximation_method, simulation.approximate_bits)
+                   for simulation in self.logic.database.query_low_power_simulations(params.circuit_operation, params.bitwidth, params.bitwidth)
+                   if simulation.approximation_method in self.__simulated and
+                   simulation.simulation_type == constants.SYNTHESIS and
+                   simulation.number_of_validations == number_of_validations and
+                   params.min_approx_bits <= simulation.approximate_bits <= params.max_approx_bits)
+
+    def __simulate(self, design_points):
+        simulations = [self.logic.create_simulation(method, bits) for method, bits in design_points]
+        results = self.logic.simulate(simulations)
+        for simulation, is_simulation_successful in zip(simulations, results):
+            key = (simulation.approximation_method, simulation.approximate_bits)
+            self.__simulated[key[0]][key[1]] = simulation if is_simulation_successful else None
+            if is_simulation_successful and key in self.predictions:
+                self.__record_prediction_error(simulation, self.predictions[key])
+
+    def __record_prediction_error(self, simulation, prediction):
+        for metric, predicted in zip(self.prediction_errors, prediction):
+            actual = getattr(simulation, metric)
+            self.prediction_errors[metric].append(abs(predicted - actual) / max(abs(actual), 1e-12))
+
+    def __predict(self):
+        ''' Fits the models of every method and predicts its design points not simulated yet '''
+        params = self.logic.design_space_params
+        self.predictions = {}
+        for method, simulated in self.__simulated.items():
+            simulations = [simulation for simulation in simulated.values() if simulation is not None]
+            if not simulations:
+                continue #nothing to fit, the method failed
+            bits = np.array([simulation.approximate_bits for simulation in simulations], dtype = float)
+            degree = min(self.DEGREE, len(simulations) - 1)
+            charactheristic_model = np.polyfit(bits, [getattr(simulation, params.charactheristic) for simulation in simulations], degree)
+            error_model = np.polyfit(bits, np.log2(1 + np.array([getattr(simulation, params.error_metric) for simulation in simulations], dtype = float)), degree)
+
+            remaining = np.array([approximate_bits for approximate_bits in range(params.min_approx_bits, params.max_approx_bits + 1)
+                                  if approximate_bits not in simulated], dtype = float)
+            if remaining.size == 0:
+                continue
+            charactheristics = np.polyval(charactheristic_model, remaining)
+            errors = np.exp2(np.polyval(error_model, remaining)) - 1
+            for approximate_bits, charactheristic, error in zip(remaining.astype(int), charactheristics, errors):
+                self.predictions[(method, int(approximate_bits))] = (float(charactheristic), float(max(error, 0.0)))
+
+    def __candidates(self):
+        ''' Returns the predicted design points near the optimum '''
+        params = self.logic.design_space_params
+        feasible = [prediction[0] for prediction in self.predictions.values() if prediction[1] <= params.threshold]
+        best = self.logic.get_current_best()
+        if best is not None:
+            feasible.append(getattr(best, params.charactheristic))
+        if not feasible:
+            #nothing is expected under the threshold, look at the design points closest to it
+            closest = min(prediction[1] for prediction in self.predictions.values()) if self.predictions else None
+            return sorted(key for key, prediction in self.predictions.items() if prediction[1] == closest)
+
+        charactheristics = ([prediction[0] for prediction in self.predictions.values()] +
+                            [getattr(simulation, params.charactheristic) for simulation in self.logic.successful_simulations])
+        margin = (max(charactheristics) - min(charactheristics)) * self.TOLERANCE
+        best_charactheristic = min(feasible)
+        return sorted(key for key, (charactheristic, error) in self.predictions.items()
+                      if error <= params.threshold * (1 + self.TOLERANCE) and
+                      charactheristic <= best_charactheristic + margin)
+
+    def summary(self):
+        ''' Returns the lines describing how the strategy went '''
+        params = self.logic.design_space_params
+        brute_force_size = len(self.logic.low_power_methods()) * (params.max_approx_bits - params.min_approx_bits + 1)
+        lines = [f'Simulations saved: {brute_force_size - len(self.logic.total_simulations)} of {brute_force_size}']
+        for metric, errors in self.prediction_errors.items():
+            accuracy = f'{np.mean(errors):.1%} mean, {np.max(errors):.1%} max relative error on {len(errors)} simulations' if errors else 'no predicted design point was simulated'
+            lines.append(f'{metric} predictions: {accuracy}')
+        return lines
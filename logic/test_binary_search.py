@@ -0,0 +1,36 @@
+from constants import constants
+
+
+def drop_loa_error(simulation):
+    ''' Makes the LOA error drop at 3 approximate bits '''
+    if simulation.approximation_method == 'LOA' and simulation.approximate_bits == 3:
+        simulation.wce = 1.0
+
+def simulated_bits(logic, method):
+    return sorted(simulation.approximate_bits for simulation in logic.simulator.simulated
+                  if simulation.approximation_method == method)
+
+def test_binary_search(create_logic):
+    logic = create_logic(database = False, strategy = constants.BINARY_SEARCH_STRATEGY)
+    logic.init()
+    #threshold 4 is reached at 2 bits: 2 is under it, 3 is over it
+    assert all(simulated_bits(logic, method) == [2, 3] for method in constants.LOW_POWER_ADDERS)
+    assert logic.strategy.full_scan_methods == []
+    assert [(solution.approximate_bits, solution.wce) for solution in logic.solutions] == [(2, 4.0)]
+
+def test_binary_search_falls_back_to_full_scan(create_logic):
+    logic = create_logic(database = False, failing_methods = ('AMA1',), adjust = drop_loa_error, strategy = constants.BINARY_SEARCH_STRATEGY)
+    logic.init()
+    assert sorted(logic.strategy.full_scan_methods) == ['AMA1', 'LOA']
+    assert simulated_bits(logic, 'LOA') == [0, 1, 2, 3, 4]
+    assert simulated_bits(logic, 'AMA1') == [0, 1, 2, 3, 4]
+    assert simulated_bits(logic, 'AMA2') == [2, 3]
+    assert [(solution.approximation_method, solution.approximate_bits) for solution in logic.solutions] == [('LOA', 3)]
+
+def test_binary_search_only_explores_adders(create_logic):
+    logic = create_logic(database = False, strategy = constants.BINARY_SEARCH_STRATEGY)
+    logic.design_space_params.circuit_operation = constants.MULTIPLIER
+    logic.init()
+    #there are no low power multipliers, as on the brute force exploration
+    assert logic.simulator.simulated == []
+    assert logic.solutions == []
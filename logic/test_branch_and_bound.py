@@ -0,0 +1,43 @@
+from constants import constants
+
+
+def test_branch_and_bound_finds_optimum(create_logic):
+    logic = create_logic(database = False, threaded = False, strategy = constants.BRANCH_AND_BOUND_STRATEGY)
+    logic.init()
+    assert [(solution.approximate_bits, solution.area) for solution in logic.solutions] == [(2, 98.0)]
+    assert logic.strategy.optimality_gap == 0.0
+    assert not logic.strategy.is_out_of_time
+    #once a method reaches the optimum every other design point is pruned
+    assert len(logic.simulator.simulated) < len(constants.LOW_POWER_ADDERS) * 5
+    assert logic.strategy.number_of_pruned_simulations + len(logic.simulator.simulated) == len(constants.LOW_POWER_ADDERS) * 5
+
+def test_branch_and_bound_time_budget(create_logic):
+    logic = create_logic(database = False, strategy = constants.BRANCH_AND_BOUND_STRATEGY, time_budget = 0)
+    logic.init()
+    assert logic.strategy.is_out_of_time
+    assert logic.simulator.simulated == []
+    assert logic.strategy.optimality_gap is None
+
+def test_branch_and_bound_does_not_prune_non_monotonic_methods(create_logic):
+    logic = create_logic(database = False, threaded = False, strategy = constants.BRANCH_AND_BOUND_STRATEGY)
+    simulate = logic.simulator.simulate
+
+    def non_monotonic_simulate(simulation):
+        result = simulate(simulation)
+        if simulation.approximation_method == 'LOA' and simulation.approximate_bits == 3:
+            simulation.wce = 1.0
+        return result
+
+    logic.simulator.simulate = non_monotonic_simulate
+    logic.init()
+    assert sorted(simulation.approximate_bits for simulation in logic.simulator.simulated
+                  if simulation.approximation_method == 'LOA') == [0, 1, 2, 3, 4]
+    assert [(solution.approximation_method, solution.approximate_bits) for solution in logic.solutions] == [('LOA', 3)]
+    assert logic.strategy.optimality_gap == 0.0
+
+def test_branch_and_bound_only_explores_adders(create_logic):
+    logic = create_logic(database = False, strategy = constants.BRANCH_AND_BOUND_STRATEGY)
+    logic.design_space_params.circuit_operation = constants.MULTIPLIER
+    logic.init()
+    assert logic.simulator.simulated == []
+    assert logic.solutions == []
@@ -0,0 +1,114 @@
+import pytest
+from constants import constants
+from objects.database import Database
+from objects.journal import Journal
+from objects.simulator import SimulationJob
+
+
+@pytest.mark.parametrize('threaded', [True, False])
+def test_simulate_without_database(threaded, create_logic, create_simulations):
+    logic = create_logic(database = False, threaded = threaded, failing_methods = ('AMA1',))
+    logic.simulate(create_simulations())
+    assert len(logic.successful_simulations) == 5
+    assert len(logic.failed_simulations) == 5
+    assert logic.design_space_stats.number_of_successful_simulations == 5
+    assert logic.design_space_stats.number_of_failed_simulations == 5
+    assert logic.design_space_stats.number_of_loaded_simulations == 0
+
+def test_simulate_prefetches_database(create_logic, create_simulations, fake_simulator):
+    simulations = create_simulations()
+    stored = simulations[:4]
+    for simulation in stored:
+        fake_simulator().simulate(simulation)
+    Database().save_simulations(stored)
+
+    logic = create_logic()
+    logic.simulate(create_simulations())
+    assert logic.design_space_stats.number_of_loaded_simulations == 4
+    assert logic.design_space_stats.number_of_successful_simulations == 6
+    assert len(logic.simulator.simulated) == 6
+    assert len(logic.successful_simulations) == 10
+
+    logic = create_logic()
+    logic.simulate(create_simulations())
+    assert logic.design_space_stats.number_of_loaded_simulations == 10
+    assert logic.simulator.simulated == []
+
+def test_simulate_reuses_synthesis(create_logic, create_simulations):
+    logic = create_logic()
+    logic.simulate(create_simulations())
+
+    logic = create_logic()
+    simulations = [logic.create_simulation('LOA', approximate_bits, 16) for approximate_bits in range(5)]
+    logic.simulate(simulations)
+    assert logic.simulator.simulated == simulations
+    assert all(simulation.is_synthesized for simulation in simulations)
+
+def test_init_raises_unsaved_simulations(monkeypatch, create_logic):
+    logic = create_logic(threaded = False)
+
+    def save_many(rows):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(logic.database.low_power_storage, 'save_many', save_many)
+    with pytest.raises(Exception, match = 'disk full'):
+        logic.init()
+    assert logic.database.writer is None
+
+@pytest.mark.parametrize('retry_failed', [False, True])
+def test_simulate_skips_known_failures(retry_failed, create_logic, create_simulations):
+    logic = create_logic(failing_methods = ('AMA1',))
+    logic.simulate(create_simulations())
+    logic.database.close()
+    assert logic.design_space_stats.number_of_failures == {constants.TOOL_ERROR_FAILURE: 5}
+
+    logic = create_logic(failing_methods = ('AMA1',), retry_failed = retry_failed)
+    logic.simulate(create_simulations())
+    assert logic.design_space_stats.number_of_failed_simulations == 5
+    if retry_failed:
+        assert logic.design_space_stats.number_of_skipped_simulations == 0
+        assert len(logic.simulator.simulated) == 5
+    else:
+        assert logic.design_space_stats.number_of_skipped_simulations == 5
+        assert logic.simulator.simulated == []
+
+def test_simulate_resumes_journal(create_logic, create_simulations):
+    journal = Journal.create(['lp'])
+    logic = create_logic(database = False)
+    logic.set_journal(journal)
+    logic.simulate(create_simulations()[:4])
+    simulations = create_simulations()
+    journal.record_running(simulations[4], SimulationJob('auger-LOA', 'auger-LOA/output', True), 1234)
+
+    logic = create_logic(database = False)
+    logic.set_journal(Journal.open(journal.run_id))
+    logic.simulate(create_simulations())
+    assert logic.design_space_stats.number_of_resumed_simulations == 5
+    assert [simulation.approximate_bits for simulation in logic.simulator.recovered] == [4]
+    assert len(logic.simulator.simulated) == 6
+    assert len(logic.successful_simulations) == 10
+    assert Journal.open(journal.run_id).pending == []
+
+def test_init_ranks_objectives(tmp_path, create_logic):
+    logic = create_logic(database = False, objectives = [constants.AREA, constants.DELAY, constants.POWER])
+    logic.init()
+    assert len(logic.objective_ranks) == 5
+    assert sum(len(rank) for rank in logic.objective_ranks) == len(logic.successful_simulations)
+    assert all(simulation.approximate_bits == 4 for simulation in logic.objective_ranks[0])
+    assert (tmp_path / 'objectives.png').exists()
+    assert 'Multi-objective front size: 17' in (tmp_path / 'log.txt').read_text()
+
+def test_get_current_best(create_logic, create_simulations):
+    logic = create_logic(database = False)
+    assert logic.get_current_best() is None
+    logic.simulate(create_simulations(methods = ('LOA',)))
+    best = logic.get_current_best()
+    assert (best.approximate_bits, best.area, best.wce) == (2, 98.0, 4.0)
+    assert len(logic.get_current_pareto_front()) == 5
+
+def test_init_high_performance_brute_force(tmp_path, create_high_performance_logic):
+    logic = create_high_performance_logic(database = False)
+    logic.init()
+    assert len(logic.successful_simulations) == 30
+    assert [(solution.r, solution.p) for solution in logic.solutions] == [(6, 0)]
+    assert 'Resultant Bits: 1 to 6' in (tmp_path / 'log.txt').read_text()
@@ -0,0 +1,50 @@
+import pytest
+from constants import constants
+
+
+def shift_area(simulation):
+    ''' Grows the area with the index of the approximation method in
+    LOW_POWER_ADDERS, so the first method is the Pareto front '''
+    simulation.area += constants.LOW_POWER_ADDERS.index(simulation.approximation_method)
+
+@pytest.fixture
+def create_multi_fidelity_logic(create_logic):
+    def create(**kwargs):
+        return create_logic(strategy = constants.MULTI_FIDELITY_STRATEGY, fidelity_margin = 0.005, adjust = shift_area, **kwargs)
+    return create
+
+def test_multi_fidelity_simulates_candidates(create_multi_fidelity_logic):
+    logic = create_multi_fidelity_logic(database = False, screening_validations = 16)
+    logic.init()
+    assert len(logic.screening_simulations) == len(constants.LOW_POWER_ADDERS) * 5
+    assert all(simulation.number_of_validations == 16 for simulation in logic.screening_simulations)
+    #the threshold is met exactly at 2 approximate bits, the front is the first
+    #method and nothing has less error than 0 approximate bits, only the
+    #first two methods are within the margin of the front for the rest
+    assert sorted(logic.strategy.candidates) == sorted((method, bits) for index, method in enumerate(constants.LOW_POWER_ADDERS)
+                                                       for bits in range(5) if bits in (0, 2) or index < 2)
+    assert all(simulation.number_of_validations == 256 for simulation in logic.successful_simulations)
+    assert [(solution.approximation_method, solution.approximate_bits) for solution in logic.solutions] == [(constants.LOW_POWER_ADDERS[0], 2)]
+
+def test_multi_fidelity_without_cheaper_screening(create_multi_fidelity_logic):
+    logic = create_multi_fidelity_logic(database = False, screening_validations = 256)
+    logic.init()
+    assert logic.screening_simulations == []
+    assert len(logic.successful_simulations) == len(constants.LOW_POWER_ADDERS) * 5
+
+def test_multi_fidelity_caches_both_fidelities(create_multi_fidelity_logic):
+    logic = create_multi_fidelity_logic(screening_validations = 16)
+    logic.init()
+    simulated = len(logic.simulator.simulated)
+
+    logic = create_multi_fidelity_logic(screening_validations = 16)
+    logic.init()
+    assert logic.simulator.simulated == []
+    assert logic.design_space_stats.number_of_loaded_simulations == simulated
+
+def test_multi_fidelity_only_explores_adders(create_logic):
+    logic = create_logic(database = False, strategy = constants.MULTI_FIDELITY_STRATEGY)
+    logic.design_space_params.circuit_operation = constants.MULTIPLIER
+    logic.init()
+    assert logic.simulator.simulated == []
+    assert logic.solutions == []
@@ -0,0 +1,45 @@
+from constants import constants
+from logic.nsga2 import crowding_distance
+
+
+def design_points(logic):
+    return [(simulation.r, simulation.p) for simulation in logic.total_simulations]
+
+def test_crowding_distance(create_simulations):
+    simulations = create_simulations(methods = ('LOA',), bits = range(4))
+    for bits, simulation in enumerate(simulations):
+        simulation.area = 10.0 - bits
+        simulation.wce = float(bits ** 2)
+    distances = crowding_distance(simulations, [constants.AREA, constants.WCE])
+    assert distances[0] == distances[3] == float('inf')
+    assert distances[1] == 2 / 3 + 4 / 9
+    assert distances[2] == 2 / 3 + 8 / 9
+
+def test_nsga2_finds_optimum(create_high_performance_logic):
+    logic = create_high_performance_logic(database = False, strategy = constants.NSGA2_STRATEGY,
+                                          population_size = 6, generations = 10)
+    logic.init()
+    assert [(solution.r, solution.p) for solution in logic.solutions] == [(6, 0)]
+    #every design point is simulated once at most
+    assert len(set(design_points(logic))) == len(design_points(logic))
+    assert logic.strategy.summary()[0] == 'Seed: 0'
+
+def test_nsga2_is_reproducible(create_high_performance_logic):
+    explored = []
+    for seed in (1, 1, 2):
+        logic = create_high_performance_logic(database = False, strategy = constants.NSGA2_STRATEGY,
+                                              population_size = 4, generations = 2, seed = seed)
+        logic.init()
+        explored.append(design_points(logic))
+    assert explored[0] == explored[1]
+    assert explored[0] != explored[2]
+
+def test_nsga2_reuses_database(create_high_performance_logic):
+    logic = create_high_performance_logic(strategy = constants.NSGA2_STRATEGY, population_size = 4, generations = 3)
+    logic.init()
+    simulated = len(logic.simulator.simulated)
+
+    logic = create_high_performance_logic(strategy = constants.NSGA2_STRATEGY, population_size = 4, generations = 3)
+    logic.init()
+    assert logic.simulator.simulated == []
+    assert logic.design_space_stats.number_of_loaded_simulations == simulated
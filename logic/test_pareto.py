@@ -0,0 +1,78 @@
+import random
+import pytest
+from types import SimpleNamespace
+from logic.pareto import pareto_front, brute_force_pareto_front, multi_objective_pareto_front, non_dominated_sort, ParetoArchive
+
+
+def create_points(values):
+    return [SimpleNamespace(area = area, wce = wce) for area, wce in values]
+
+def test_pareto_front():
+    points = create_points([(3, 1), (1, 3), (2, 2), (2, 3), (3, 3), (4, 0)])
+    assert pareto_front(points, 'area', 'wce') == [points[0], points[1], points[2], points[5]]
+
+def test_pareto_front_ties_and_duplicates():
+    points = create_points([(1, 2), (1, 2), (1, 3), (2, 2), (2, 1), (2, 1), (0, 5)])
+    assert pareto_front(points, 'area', 'wce') == [points[0], points[1], points[4], points[5], points[6]]
+
+def test_pareto_front_empty():
+    assert pareto_front([], 'area', 'wce') == []
+
+@pytest.mark.parametrize('seed', range(20))
+def test_pareto_front_matches_brute_force(seed):
+    generator = random.Random(seed)
+    points = create_points([(generator.randint(0, 15), generator.choice([generator.randint(0, 15), generator.random()]))
+                            for _ in range(generator.randint(1, 200))])
+    assert pareto_front(points, 'area', 'wce') == brute_force_pareto_front(points, 'area', 'wce')
+
+def brute_force_multi_objective_front(points, objectives):
+    values = [tuple(getattr(point, objective) for objective in objectives) for point in points]
+    return [point for point, value in zip(points, values)
+            if not any(other != value and all(a <= b for a, b in zip(other, value)) for other in values)]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_multi_objective_pareto_front_matches_brute_force(seed):
+    generator = random.Random(seed)
+    objectives = ['area', 'delay', 'power', 'wce'][:generator.randint(1, 4)]
+    points = [SimpleNamespace(**{objective: generator.randint(0, 6) for objective in objectives})
+              for _ in range(generator.randint(1, 200))]
+    assert multi_objective_pareto_front(points, objectives) == brute_force_multi_objective_front(points, objectives)
+
+def test_non_dominated_sort():
+    points = [SimpleNamespace(area = area, delay = delay, wce = wce)
+              for area, delay, wce in [(1, 1, 1), (2, 2, 2), (1, 1, 1), (3, 3, 3), (1, 3, 2), (2, 2, 3)]]
+    ranks = non_dominated_sort(points, ['area', 'delay', 'wce'])
+    assert ranks == [[points[0], points[2]], [points[1], points[4]], [points[5]], [points[3]]]
+
+@pytest.mark.parametrize('block_size', [1, 3, 256])
+@pytest.mark.parametrize('seed', range(20))
+def test_pareto_archive_matches_pareto_front(seed, block_size):
+    generator = random.Random(seed)
+    points = create_points([(generator.randint(0, 15), generator.randint(0, 15)) for _ in range(generator.randint(1, 200))])
+    archive = ParetoArchive('area', 'wce', 7, block_size)
+    for point in points:
+        archive.add(point)
+
+    front = pareto_front(points, 'area', 'wce')
+    assert sorted(map(id, archive.front())) == sorted(map(id, front))
+    under_threshold = [point for point in front if point.wce <= 7]
+    best = min(under_threshold, key = lambda point: point.area) if under_threshold else None
+    assert archive.best is best
+    assert archive.number_of_simulations == len(points)
+
+def test_pareto_archive_best():
+    archive = ParetoArchive('area', 'wce', 4)
+    points = create_points([(10, 8), (9, 4), (9, 2), (5, 9), (9, 2), (7, 4)])
+    assert [archive.add(point) for point in points] == [False, True, True, False, False, True]
+    assert archive.best is points[5]
+    assert archive.settled_for == 0
+    assert [(point.area, point.wce) for point in archive.front()] == [(5, 9), (7, 4), (9, 2), (9, 2)]
+
+def test_pareto_archive_large_front():
+    #every point is on the front until the last one dominates all but the first
+    points = create_points([(area, 1000 - area) for area in range(1000)] + [(1, 0)])
+    archive = ParetoArchive('area', 'wce', 500, block_size = 8)
+    for point in points:
+        archive.add(point)
+    assert [(point.area, point.wce) for point in archive.front()] == [(0, 1000), (1, 0)]
+    assert archive.best is points[-1]
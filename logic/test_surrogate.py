@@ -0,0 +1,41 @@
+from constants import constants
+from objects.database import Database
+
+
+def test_surrogate_finds_optimum(create_logic):
+    logic = create_logic(database = False, strategy = constants.SURROGATE_STRATEGY)
+    logic.init()
+    assert [(solution.approximate_bits, solution.area) for solution in logic.solutions] == [(2, 98.0)]
+    #the first, middle and last approximate bits fit the models exactly
+    assert len(logic.simulator.simulated) == len(constants.LOW_POWER_ADDERS) * 3
+    summary = logic.strategy.summary()
+    assert summary[0] == f'Simulations saved: {len(constants.LOW_POWER_ADDERS) * 2} of {len(constants.LOW_POWER_ADDERS) * 5}'
+
+def test_surrogate_simulates_predicted_candidates(create_logic):
+    logic = create_logic(database = False, strategy = constants.SURROGATE_STRATEGY)
+    logic.design_space_params.max_approx_bits = 8
+    logic.init()
+    simulated = sorted(simulation.approximate_bits for simulation in logic.simulator.simulated if simulation.approximation_method == 'LOA')
+    #0, 4 and 8 are the seeds, the rest are predicted to be near the optimum at 2
+    assert simulated[:3] == [0, 1, 2] and simulated[-2:] == [4, 8]
+    assert len(simulated) < 9
+    assert [solution.approximate_bits for solution in logic.solutions] == [2]
+    assert len(logic.strategy.prediction_errors[constants.AREA]) == len(logic.simulator.simulated) - len(constants.LOW_POWER_ADDERS) * 3
+
+def test_surrogate_uses_cached_simulations(create_logic, create_simulations, fake_simulator):
+    simulations = create_simulations(methods = ('LOA',), bits = [1])
+    simulations[0].number_of_validations = 256
+    fake_simulator().simulate(simulations[0])
+    Database().save_simulations(simulations)
+
+    logic = create_logic(strategy = constants.SURROGATE_STRATEGY)
+    logic.init()
+    assert logic.design_space_stats.number_of_loaded_simulations == 1
+    assert sorted(simulation.approximate_bits for simulation in logic.total_simulations if simulation.approximation_method == 'LOA') == [0, 1, 2, 4]
+
+def test_surrogate_only_explores_adders(create_logic):
+    logic = create_logic(database = False, strategy = constants.SURROGATE_STRATEGY)
+    logic.design_space_params.circuit_operation = constants.MULTIPLIER
+    logic.init()
+    assert logic.simulator.simulated == []
+    assert logic.solutions == []
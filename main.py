@@ -2,8 +2,9 @@ import sys
 from ui.ui import UI
 from logic.logic import Logic 
 
-ui = UI()
-logic = Logic()
-ui.set_logic(logic)
-logic.set_ui(ui)
-ui.start_exploration(sys.argv[1:])
\ No newline at end of file
+if __name__ == '__main__': #the parse processes import this module
+    ui = UI()
+    logic = Logic()
+    ui.set_logic(logic)
+    logic.set_ui(ui)
+    ui.start_exploration(sys.argv[1:])
@@ -0,0 +1,170 @@
+import threading
+import numpy as np
+from constants import constants
+from objects.error_estimate import ErrorEstimate
+
+
+# approximate full adder cells as (sum, carry) truth tables indexed by
+# a * 4 + b * 2 + carry in
+EXACT_CELL = ((0, 1, 1, 0, 1, 0, 0, 1), (0, 0, 0, 1, 0, 1, 1, 1))
+
+# approximate mirror adders of Gupta et al., their carry is either exact, the
+# one of AMA1 (b or a and carry in) or a
+AMA1_CARRY = (0, 0, 1, 1, 0, 1, 1, 1)
+
+FULL_ADDER_CELLS = {
+    "AMA1": ((0, 1, 0, 0, 0, 0, 0, 1), AMA1_CARRY),
+    "AMA2": ((1, 1, 1, 0, 1, 0, 0, 0), EXACT_CELL[1]), #sum is the inverted carry
+    "AMA3": ((1, 1, 0, 0, 1, 0, 0, 0), AMA1_CARRY), #sum is the inverted carry
+    "AMA4": ((0, 1, 0, 1, 0, 0, 0, 1), (0, 0, 0, 0, 1, 1, 1, 1)), #carry is a
+    "AMA5": ((0, 0, 1, 1, 0, 0, 1, 1), (0, 0, 0, 0, 1, 1, 1, 1)), #sum is b and carry is a
+}
+
+#LOA ors the operands, only its most significant approximate bit generates a carry
+LOA_CELL = ((0, 0, 1, 1, 1, 1, 1, 1), (0, 0, 0, 0, 0, 0, 0, 0))
+LOA_CARRY_CELL = (LOA_CELL[0], (0, 0, 0, 0, 0, 0, 1, 1))
+
+#low power adders with a software model, the cells of the rest are only
+#defined by the AUGER HDL, so they need AUGER for their errors
+MODELLED_ADDERS = ["LOA"] + list(FULL_ADDER_CELLS)
+
+
+def _cell(approximation_method, approximate_bits, bit):
+    if approximation_method == "LOA":
+        return LOA_CARRY_CELL if bit == approximate_bits - 1 else LOA_CELL
+    return FULL_ADDER_CELLS[approximation_method]
+
+def _merge(errors, probabilities):
+    errors, inverse = np.unique(errors, return_inverse = True)
+    return errors, np.bincount(inverse, weights = probabilities, minlength = len(errors))
+
+
+def approximate_sum(approximation_method, approximate_bits, a, b):
+    ''' Returns the results of the low power adder on the operand arrays a
+    and b. The approximate_bits least significant bits use the approximate
+    cells of approximation_method, or an OR gate per bit with the carry of
+    the AND of the most significant of them on LOA, and the rest of the bits
+    an exact adder that takes their carry. '''
+    if approximate_bits == 0:
+        return a + b
+
+    if approximation_method == "LOA":
+        lower = (a | b) & ((1 << approximate_bits) - 1)
+        carry = (a >> (approximate_bits - 1)) & (b >> (approximate_bits - 1)) & 1
+    else:
+        sum_table, carry_table = (np.array(table, dtype = a.dtype) for table in FULL_ADDER_CELLS[approximation_method])
+        lower = np.zeros_like(a)
+        carry = np.zeros_like(a)
+        for bit in range(approximate_bits):
+            index = (((a >> bit) & 1) << 2) | (((b >> bit) & 1) << 1) | carry
+            lower |= sum_table[index] << bit
+            carry = carry_table[index]
+
+    return (((a >> approximate_bits) + (b >> approximate_bits) + carry) << approximate_bits) | lower
+
+def exhaustive_error_estimate(approximation_method, bitwidth, approximate_bits, chunk_pairs = constants.MODEL_CHUNK_PAIRS):
+    ''' Returns the ErrorEstimate of the error distances of the low power
+    adder on every pair of bitwidth bits operands, evaluated on chunks of
+    about chunk_pairs pairs to bound the memory used '''
+    operands = np.arange(2 ** bitwidth, dtype = np.int64)
+    rows = max(1, chunk_pairs >> bitwidth)
+    estimate = ErrorEstimate()
+    for start in range(0, len(operands), rows):
+        a = np.repeat(operands[start:start + rows], len(operands))
+        b = np.tile(operands, len(a) // len(operands))
+        distances = np.abs(approximate_sum(approximation_method, approximate_bits, a, b) - (a + b))
+        errors, counts = np.unique(distances, return_counts = True)
+        estimate.add(errors.astype(float), counts / len(a), len(a))
+    return estimate
+
+def analytical_error_pmf(approximation_method, approximate_bits):
+    ''' Returns the exact error distance PMF of the low power adder on
+    uniformly distributed operands, as arrays of error distances and their
+    probabilities, whatever its bitwidth.
+
+    The exact part of the adder adds the same upper bits on both circuits,
+    so the error only depends on the approximate bits. They are walked from
+    the least significant one keeping, for each pair of approximate and
+    exact carries, the distribution of the signed error accumulated so far,
+    in O(approximate_bits x distinct errors) time. '''
+    #(approximate carry, exact carry) to (signed errors, probabilities)
+    states = {(0, 0): (np.zeros(1, dtype = np.int64), np.ones(1))}
+    for bit in range(approximate_bits):
+        sum_table, carry_table = _cell(approximation_method, approximate_bits, bit)
+        transitions = {}
+        for (approximate_carry, exact_carry), (errors, probabilities) in states.items():
+            for a in (0, 1):
+                for b in (0, 1):
+                    approximate_index = a * 4 + b * 2 + approximate_carry
+                    exact_index = a * 4 + b * 2 + exact_carry
+                    state = (carry_table[approximate_index], EXACT_CELL[1][exact_index])
+                    difference = (sum_table[approximate_index] - EXACT_CELL[0][exact_index]) << bit
+                    transitions.setdefault(state, []).append((errors + difference, probabilities / 4))
+        states = {state: _merge(np.concatenate([errors for errors, _ in parts]),
+                                np.concatenate([probabilities for _, probabilities in parts]))
+                  for state, parts in transitions.items()}
+
+    #the carry into the exact part weights 2 ** approximate_bits
+    errors = np.concatenate([errors + ((approximate_carry - exact_carry) << approximate_bits)
+                             for (approximate_carry, exact_carry), (errors, _) in states.items()])
+    probabilities = np.concatenate([probabilities for _, probabilities in states.values()])
+    errors, probabilities = _merge(np.abs(errors), probabilities)
+    return errors.astype(float), probabilities
+
+
+class AdderErrorModel():
+    '''
+    Software backend of the Simulator for the error metrics of the low power
+    adders in MODELLED_ADDERS, so AUGER is only needed for their area, delay
+    and power. Design points up to max_bitwidth bits are evaluated
+    exhaustively with bitwise NumPy operations, wider ones get their exact
+    error PMF analytically if they have at most max_analytical_bits
+    approximate bits.
+
+    Attributes
+    ----------
+    chunk_pairs : int
+        input pairs evaluated at once
+    max_bitwidth : int
+        largest bitwidth evaluated exhaustively
+    max_analytical_bits : int
+        most approximate bits of the wider bitwidths, the rest are validated by AUGER
+    pmfs : dict
+        (errors, probabilities, samples) of each design point evaluated
+    '''
+    def __init__(self, chunk_pairs = constants.MODEL_CHUNK_PAIRS, max_bitwidth = constants.MAX_MODEL_BITWIDTH,
+                 max_analytical_bits = constants.MAX_ANALYTICAL_APPROXIMATE_BITS):
+        self.chunk_pairs = chunk_pairs
+        self.max_bitwidth = max_bitwidth
+        self.max_analytical_bits = max_analytical_bits
+        self.pmfs = {}
+        self.lock = threading.Lock()
+
+    def is_exhaustive(self, simulation):
+        return simulation.bitwidth <= self.max_bitwidth
+
+    def has_model(self, simulation):
+        return (simulation.circuit_type == constants.LOW_POWER_CIRCUIT and
+                simulation.circuit_operation == constants.ADDER and
+                simulation.approximation_method in MODELLED_ADDERS and
+                (self.is_exhaustive(simulation) or simulation.approximate_bits <= self.max_analytical_bits))
+
+    def error_pmf(self, simulation):
+        ''' Returns the error distances of simulation, their probabilities
+        and the input pairs they were computed from, None if exact '''
+        if self.is_exhaustive(simulation):
+            key = (simulation.approximation_method, simulation.bitwidth, simulation.approximate_bits)
+        else:
+            #the analytical PMF does not depend on the bitwidth
+            key = (simulation.approximation_method, None, simulation.approximate_bits)
+        with self.lock:
+            pmf = self.pmfs.get(key)
+        if pmf is None:
+            if self.is_exhaustive(simulation):
+                estimate = exhaustive_error_estimate(*key, self.chunk_pairs)
+                pmf = estimate.errors, estimate.counts / estimate.samples, estimate.samples
+            else:
+                pmf = analytical_error_pmf(simulation.approximation_method, simulation.approximate_bits) + (None,)
+            with self.lock:
+                self.pmfs[key] = pmf
+        return pmf
@@ -0,0 +1,151 @@
+import asyncio
+import subprocess
+from constants import constants
+from objects.resource_pools import ResourcePools
+
+
+class AsyncSimulator():
+    ''' Runs the simulations of a Simulator from a single asyncio event loop.
+        AUGER executions are started with asyncio subprocesses, killed together
+        with their children if they take longer than the simulator timeout, and
+        the whole set of simulations is cancelled on Ctrl-C. Resource pools
+        are honored with one asyncio semaphore per pool and transient failures
+        are retried following the simulator retry settings.
+    '''
+    def __init__(self, simulator):
+        self.simulator = simulator
+
+    async def __acquire(self, semaphores, names):
+        acquired = []
+        try:
+            for name in sorted(set(names)):
+                if name in semaphores:
+                    await semaphores[name].acquire()
+                    acquired.append(semaphores[name])
+        except BaseException:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+        return acquired
+
+    async def _execute_simulation(self, simulation, job, semaphores):
+        '''
+            Executes simulation on AUGER inside the job directory, return false if failed.
+        '''
+        acquired = await self.__acquire(semaphores, self.simulator._simulation_resources(simulation))
+        try:
+            process = await asyncio.create_subprocess_exec(*self.simulator._build_command(simulation),
+                                                           cwd=job.directory,
+                                                           stdout=subprocess.DEVNULL,
+                                                           stderr=subprocess.PIPE,
+                                                           start_new_session=True)
+            if self.simulator.job_listener is not None:
+                self.simulator.job_listener(simulation, job, process.pid)
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), self.simulator.timeout)
+                job.stderr = self.simulator._stderr_tail(stderr)
+                job.returncode = process.returncode
+                return True
+            except asyncio.TimeoutError:
+                self.simulator._kill_process_group(process.pid)
+                await process.wait()
+                job.returncode = process.returncode
+                self.simulator._mark_failure(simulation, constants.TRANSIENT_FAILURE,
+                                             f"simulation timed out after {self.simulator.timeout} seconds")
+                return False
+            except BaseException:
+                self.simulator._kill_process_group(process.pid)
+                raise
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    async def simulate(self, simulation, semaphores = None):
+        """Simulates and asigns charactheristics to given simulation,
+        returns true if succesful otherwise returns false.
+
+        Parameters
+        ----------
+        simulation : Simulation
+            Simulation object that contains the parameteres to be simulated.
+        semaphores : dict
+            asyncio semaphore of each resource pool
+        """
+        if semaphores is None:
+            semaphores = self.create_semaphores()
+
+        attempt = 0
+        while True:
+            simulation.attempts = attempt + 1
+            is_simulation_successful = await self._simulate_once(simulation, semaphores)
+            delay = None if is_simulation_successful else self.simulator._should_retry(simulation, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        return is_simulation_successful
+
+    async def _simulate_once(self, simulation, semaphores):
+        loop = asyncio.get_running_loop()
+        if self.simulator._is_sequential(simulation):
+            #every chunk depends on the previous ones, run them on a thread that
+            #holds the asyncio semaphores instead of the simulator resource pools,
+            #so every job of the event loop is limited by the same tokens
+            acquired = await self.__acquire(semaphores, self.simulator._simulation_resources(simulation))
+            try:
+                return await loop.run_in_executor(None, self.simulator._simulate_once, simulation, ResourcePools())
+            finally:
+                for semaphore in reversed(acquired):
+                    semaphore.release()
+
+        is_simulation_successful = False
+
+        self.simulator._reset_failure(simulation)
+        job = await loop.run_in_executor(None, self.simulator._prepare_job, simulation)
+        try:
+            if await self._execute_simulation(simulation, job, semaphores):
+                is_simulation_successful = await loop.run_in_executor(None, self.simulator._collect_results, simulation, job)
+        finally:
+            await asyncio.shield(loop.run_in_executor(None, self.simulator._discard_job, job))
+
+        return is_simulation_successful
+
+    def create_semaphores(self):
+        return {name: asyncio.Semaphore(limit) for name, limit in self.simulator.resource_pools.limits.items()}
+
+    async def simulate_many_async(self, simulations, concurrency, on_result = None):
+        ''' Simulates all the given simulations, at most concurrency at the same
+        time, and returns their results in order. on_result(simulation, result)
+        is called as soon as each simulation finishes and its return value is
+        used as result. If any simulation raises the rest are cancelled. '''
+        semaphores = self.create_semaphores()
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(simulation):
+            async with slots:
+                try:
+                    result = await self.simulate(simulation, semaphores)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as error:
+                    print(f'Error simulating {simulation.design_point}: {error}')
+                    result = False
+            if on_result is not None:
+                #saving and journaling the result may block, keep them off the event loop
+                result = await asyncio.get_running_loop().run_in_executor(None, on_result, simulation, result)
+            return result
+
+        tasks = [asyncio.ensure_future(run(simulation)) for simulation in simulations]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def simulate_many(self, simulations, concurrency, on_result = None):
+        ''' Runs simulate_many_async on a new event loop, Ctrl-C cancels every
+        pending simulation and kills the running ones before propagating '''
+        return asyncio.run(self.simulate_many_async(simulations, concurrency, on_result))
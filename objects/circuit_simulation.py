@@ -31,6 +31,35 @@ class CircuitSimulation:
         error worst case escenario
     med: float
         error mean error distance
+    error_confidence: float
+        confidence of the threshold decision on the error metric when the
+        validations stopped early, None if all of them were run
+    error_samples: int
+        validations the error metrics were computed from, None if all of
+        number_of_validations or computed analytically
+    nmed: float
+        med normalized by the largest exact result
+    error_rate: float
+        probability of a nonzero error distance
+    rmse: float
+        root mean square error distance
+    ed50, ed90, ed99: float
+        percentiles of the error distance
+    failure_class: str
+        why the last simulation failed ( TRANSIENT_FAILURE, TOOL_ERROR_FAILURE, PARSE_ERROR_FAILURE )
+    failure_reason: str
+        description of the last failure
+    attempts: int
+        number of times the circuit was simulated
+    is_screening: bool
+        if set the simulation only screens the design point with few
+        validations and is not a candidate solution
+    is_synthesized: bool
+        if set the characteristics were cached and only the errors have to
+        be simulated
+    is_validated: bool
+        if set the error metrics were cached and only the characteristics
+        have to be simulated
     """
 
     def __init__(self, 
@@ -58,6 +87,20 @@ class CircuitSimulation:
         self.pdp = pdp
         self.wce = wce
         self.med = med
+        self.error_confidence = None
+        self.error_samples = None
+        self.nmed = None
+        self.error_rate = None
+        self.rmse = None
+        self.ed50 = None
+        self.ed90 = None
+        self.ed99 = None
+        self.failure_class = None
+        self.failure_reason = None
+        self.attempts = 0
+        self.is_screening = False
+        self.is_synthesized = False
+        self.is_validated = False
 
 class LowPowerCircuitSimulation(CircuitSimulation):
     """
@@ -85,6 +128,48 @@ class LowPowerCircuitSimulation(CircuitSimulation):
                                    bitwidth)
         self.approximate_bits = approximate_bits 
 
+    @property
+    def design_point(self):
+        ''' Short description of the simulated design point, used on the console '''
+        return f'{self.approximation_method} {self.approximate_bits}/{self.bitwidth}'
+
+class HighPerformanceCircuitSimulation(CircuitSimulation):
+    """
+    Extends CircuitSimulation. Represents a high performance circuit simulation,
+    the adder is split in sub-adders of r resultant bits whose carry is
+    predicted from the p previous bits.
+    
+
+    Attributes
+    ----------
+    r : int
+        Number of resultant bits of each sub-adder
+    p : int
+        Number of previous bits used to predict the carry of each sub-adder
+    """
+    def __init__(self, 
+                 approximation_method, 
+                 simulation_type,
+                 number_of_validations,
+                 circuit_operation,
+                 bitwidth,
+                 r,
+                 p):
+        CircuitSimulation.__init__(self,
+                                   approximation_method,
+                                   simulation_type,
+                                   number_of_validations,
+                                   constants.HIGH_PERFORMANCE_CIRCUIT,
+                                   circuit_operation, 
+                                   bitwidth)
+        self.r = r
+        self.p = p
+
+    @property
+    def design_point(self):
+        ''' Short description of the simulated design point, used on the console '''
+        return f'{self.approximation_method} r{self.r} p{self.p}/{self.bitwidth}'
+
 class CircuitSimulationBuilder():
     """
     Used to encapsulate the creation objects that extends CircuitSimulation
@@ -121,4 +206,41 @@ class CircuitSimulationBuilder():
                                number_of_validations, 
                                circuit_operation,
                                bitwidth,
-                               approximate_bits)  
\ No newline at end of file
+                               approximate_bits)
+
+    @staticmethod
+    def create_circuit_simulation_high_performance(approximation_method, 
+                                                   simulation_type,
+                                                   number_of_validations, 
+                                                   circuit_operation,
+                                                   bitwidth,
+                                                   r,
+                                                   p):
+
+        """
+        Static method used to create HighPerformanceCircuits
+
+        Parameters
+        ----------
+        approximation_method : str
+            the approximation methos used to approximate the circuit ex: GeAr
+        simulation_type : str
+            simulation used to characterize the circuit ex: syn, postsyn, ...
+        number_of_validations : int
+            number of results used to calculate the accuracy of the circuit.
+        circuit_operation : str
+            type of circuit arithmethic simulation to be simulated
+        bitwidth : int
+            bitwidth of the simulated circuits
+        r : int
+            Number of resultant bits of each sub-adder
+        p : int
+            Number of previous bits used to predict the carry of each sub-adder
+        """
+        return HighPerformanceCircuitSimulation(approximation_method,
+                               simulation_type,
+                               number_of_validations, 
+                               circuit_operation,
+                               bitwidth,
+                               r,
+                               p)
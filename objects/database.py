@@ -1,59 +1,329 @@
-import csv
 from constants import constants
-from objects.circuit_simulation import CircuitSimulation
+from objects.circuit_simulation import CircuitSimulationBuilder
+from objects.database_writer import DatabaseWriter
+from objects.storage import (LOW_POWER_TABLE, LOW_POWER_FAILURES_TABLE, LOW_POWER_SYNTHESIS_TABLE, LOW_POWER_ERRORS_TABLE,
+                             HIGH_PERFORMANCE_TABLE, HIGH_PERFORMANCE_FAILURES_TABLE, HIGH_PERFORMANCE_SYNTHESIS_TABLE,
+                             HIGH_PERFORMANCE_ERRORS_TABLE, SYNTHESIS_COLUMNS, RESULT_COLUMNS, ERROR_ESTIMATE_COLUMNS,
+                             EXTRA_ERROR_COLUMNS, CsvStorage, SqliteStorage)
+
+#names of the error values of a row, in order
+ERROR_VALUE_COLUMNS = [name for name, _ in RESULT_COLUMNS[len(SYNTHESIS_COLUMNS):] + ERROR_ESTIMATE_COLUMNS + EXTRA_ERROR_COLUMNS]
 
 
 class Database:
-    ''' Allows to save and load simulations in a csv file, each circuit type 
-    is stored in a diferent file to avoid conflict between data an to allow
-    future aditions of circtuit types.
+    ''' Allows to save and load simulations, each circuit type is stored in a
+    diferent table to avoid conflict between data an to allow future aditions
+    of circtuit types.
+
+    The storage engine is pluggable: the csv engine keeps the rows in
+    lowpower.csv and an in memory index keyed by the simulation parameters, so
+    each lookup is O(1); the sqlite engine keeps them in lowpower.db and is safe
+    to share between several concurrent executions.
+
+    The class and reason of failed simulations are stored apart, on
+    lowpower_failures.csv or the low_power_failures table, so later
+    explorations can skip design points that always fail.
+
+    High performance simulations follow the same layout on
+    highperformance.csv, highperformance_failures.csv or highperformance.db,
+    keyed by their r and p instead of the approximate bits.
+
+    The results of each simulation are also cached by stage: its
+    characteristics, which do not depend on the number of validations, on
+    lowpower_synthesis.csv or the low_power_synthesis table, and its error
+    metrics, which do not depend on the simulation type, on
+    lowpower_errors.csv or the low_power_errors table. A simulation whose
+    stages were both cached by different simulations is loaded, and one
+    with a single cached stage gets it set and is_synthesized or
+    is_validated marked, so only the other stage has to be simulated.
+
+    Once start_writer is called saved simulations are written behind, in
+    batches, by a DatabaseWriter until stop_writer or close are called.
+
+    Rows saved before an error metric in required_error_metrics was stored
+    have it empty, their errors are treated as not cached so they are
+    simulated again. So are the errors whose validations stopped early,
+    once the threshold decision was settled, unless sequential_validation
+    is set and settles the same decision with them.
     '''
 
-    def __save_low_power_circuit_simulation(self, simulation):
-        with open(constants.LOW_POWER_CSV, 'a', newline='') as csvfile:
-            csv_writer = csv.writer(csvfile, delimiter=',')
-            csv_writer.writerow([
-                simulation.circuit_operation,
+    def __init__(self, engine = constants.CSV_ENGINE):
+        self.engine = engine
+        self.writer = None
+        self.required_error_metrics = []
+        self.sequential_validation = None
+        if engine == constants.CSV_ENGINE:
+            self.low_power_storage = CsvStorage(LOW_POWER_TABLE, constants.LOW_POWER_CSV)
+            self.low_power_failures_storage = CsvStorage(LOW_POWER_FAILURES_TABLE, constants.LOW_POWER_FAILURES_CSV)
+            self.high_performance_storage = CsvStorage(HIGH_PERFORMANCE_TABLE, constants.HIGH_PERFORMANCE_CSV)
+            self.high_performance_failures_storage = CsvStorage(HIGH_PERFORMANCE_FAILURES_TABLE, constants.HIGH_PERFORMANCE_FAILURES_CSV)
+            self.low_power_synthesis_storage = CsvStorage(LOW_POWER_SYNTHESIS_TABLE, constants.LOW_POWER_SYNTHESIS_CSV)
+            self.low_power_errors_storage = CsvStorage(LOW_POWER_ERRORS_TABLE, constants.LOW_POWER_ERRORS_CSV)
+            self.high_performance_synthesis_storage = CsvStorage(HIGH_PERFORMANCE_SYNTHESIS_TABLE, constants.HIGH_PERFORMANCE_SYNTHESIS_CSV)
+            self.high_performance_errors_storage = CsvStorage(HIGH_PERFORMANCE_ERRORS_TABLE, constants.HIGH_PERFORMANCE_ERRORS_CSV)
+        elif engine == constants.SQLITE_ENGINE:
+            self.low_power_storage = SqliteStorage(LOW_POWER_TABLE, constants.LOW_POWER_DB)
+            self.low_power_failures_storage = SqliteStorage(LOW_POWER_FAILURES_TABLE, constants.LOW_POWER_DB)
+            self.high_performance_storage = SqliteStorage(HIGH_PERFORMANCE_TABLE, constants.HIGH_PERFORMANCE_DB)
+            self.high_performance_failures_storage = SqliteStorage(HIGH_PERFORMANCE_FAILURES_TABLE, constants.HIGH_PERFORMANCE_DB)
+            self.low_power_synthesis_storage = SqliteStorage(LOW_POWER_SYNTHESIS_TABLE, constants.LOW_POWER_DB)
+            self.low_power_errors_storage = SqliteStorage(LOW_POWER_ERRORS_TABLE, constants.LOW_POWER_DB)
+            self.high_performance_synthesis_storage = SqliteStorage(HIGH_PERFORMANCE_SYNTHESIS_TABLE, constants.HIGH_PERFORMANCE_DB)
+            self.high_performance_errors_storage = SqliteStorage(HIGH_PERFORMANCE_ERRORS_TABLE, constants.HIGH_PERFORMANCE_DB)
+        else:
+            raise Exception("Invalid database engine: " + str(engine))
+        self.storages = {
+            constants.LOW_POWER_CIRCUIT: (self.low_power_storage, self.low_power_failures_storage),
+            constants.HIGH_PERFORMANCE_CIRCUIT: (self.high_performance_storage, self.high_performance_failures_storage),
+        }
+        self.stage_storages = {
+            constants.LOW_POWER_CIRCUIT: (self.low_power_synthesis_storage, self.low_power_errors_storage),
+            constants.HIGH_PERFORMANCE_CIRCUIT: (self.high_performance_synthesis_storage, self.high_performance_errors_storage),
+        }
+
+    @staticmethod
+    def _low_power_key(simulation):
+        ''' Returns the tuple that identifies a low power simulation on the storage '''
+        return (simulation.circuit_operation,
                 simulation.approximation_method,
                 simulation.bitwidth,
                 simulation.approximate_bits,
                 simulation.simulation_type,
-                simulation.number_of_validations,
-                simulation.area,
+                simulation.number_of_validations)
+
+    @staticmethod
+    def _high_performance_key(simulation):
+        ''' Returns the tuple that identifies a high performance simulation on the storage '''
+        return (simulation.circuit_operation,
+                simulation.approximation_method,
+                simulation.bitwidth,
+                simulation.r,
+                simulation.p,
+                simulation.simulation_type,
+                simulation.number_of_validations)
+
+    @classmethod
+    def _key(cls, simulation):
+        if simulation.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
+            return cls._high_performance_key(simulation)
+        return cls._low_power_key(simulation)
+
+    @staticmethod
+    def _synthesis_key(key):
+        ''' Returns the key of the characteristics, without the number of validations '''
+        return key[:-1]
+
+    @staticmethod
+    def _errors_key(key):
+        ''' Returns the key of the error metrics, without the simulation type '''
+        return key[:-2] + key[-1:]
+
+    def __group(self, simulations):
+        ''' Splits simulations by circuit type, dropping the types without storage '''
+        groups = {}
+        for simulation in simulations:
+            if simulation.circuit_type in self.storages:
+                groups.setdefault(simulation.circuit_type, []).append(simulation)
+        return groups
+
+    @staticmethod
+    def _low_power_values(simulation):
+        return (simulation.area,
                 simulation.delay,
                 simulation.power,
                 simulation.pdp,
                 simulation.wce,
-                simulation.med
-            ])
-
-    def __load_low_power_circuit_simulation(self, simulation):
-        simulation_found = False
-        with open(constants.LOW_POWER_CSV, newline='') as csvfile:
-            csv_reader = csv.reader(csvfile, delimiter=',')
-            for row in csv_reader:
-                if (simulation.circuit_operation     ==     row[0]  and
-                    simulation.approximation_method  ==     row[1]  and
-                    simulation.bitwidth              == int(row[2]) and
-                    simulation.approximate_bits      == int(row[3]) and
-                    simulation.simulation_type       ==     row[4]  and
-                    simulation.number_of_validations == int(row[5])):
-                    simulation.area  = float(row[6])
-                    simulation.delay = float(row[7])
-                    simulation.power = float(row[8])
-                    simulation.pdp   = float(row[9])
-                    simulation.wce   = float(row[10])
-                    simulation.med   = float(row[11])
-                    simulation_found = True
-                    break
-        return simulation_found
+                simulation.med,
+                simulation.error_confidence,
+                simulation.error_samples,
+                simulation.nmed,
+                simulation.error_rate,
+                simulation.rmse,
+                simulation.ed50,
+                simulation.ed90,
+                simulation.ed99)
+
+    @classmethod
+    def _set_low_power_values(cls, simulation, values):
+        cls._set_synthesis_values(simulation, values[:len(SYNTHESIS_COLUMNS)])
+        cls._set_error_values(simulation, values[len(SYNTHESIS_COLUMNS):])
+
+    def _has_error_values(self, values, number_of_validations):
+        ''' Returns whether the error values of a row of number_of_validations
+        validations have every required error metric and, if they stopped
+        early, settle the decision of sequential_validation '''
+        stored = dict(zip(ERROR_VALUE_COLUMNS, values))
+        if any(stored[metric] is None for metric in self.required_error_metrics):
+            return False
+        samples = stored['error_samples']
+        if stored['error_confidence'] is None or samples is None or samples >= number_of_validations:
+            return True
+        return (self.sequential_validation is not None and
+                self.sequential_validation.stored_decision_confidence(stored['med'], stored['wce'], stored['rmse'], samples) >=
+                self.sequential_validation.confidence)
+
+    @staticmethod
+    def _set_synthesis_values(simulation, values):
+        (simulation.area,
+         simulation.delay,
+         simulation.power,
+         simulation.pdp) = values
+
+    @staticmethod
+    def _set_error_values(simulation, values):
+        (simulation.wce,
+         simulation.med,
+         simulation.error_confidence,
+         simulation.error_samples,
+         simulation.nmed,
+         simulation.error_rate,
+         simulation.rmse,
+         simulation.ed50,
+         simulation.ed90,
+         simulation.ed99) = values
+
+    def start_writer(self, batch_size = 64, flush_interval = 1.0):
+        ''' Starts writing saved simulations behind in batches '''
+        if self.writer is None:
+            self.writer = DatabaseWriter(batch_size, flush_interval)
+
+    def stop_writer(self):
+        ''' Flushes the simulations waiting to be written and stops the writer
+
+        Raises
+        ------
+        Exception
+            If some simulations could not be written
+        '''
+        if self.writer is not None:
+            writer, self.writer = self.writer, None
+            writer.close()
+
+    def __save(self, storage, rows):
+        if self.writer is not None:
+            self.writer.put(storage, rows)
+        else:
+            storage.save_many(rows)
+
+    def __load_many(self, storage, keys):
+        found = storage.load_many(keys)
+        if self.writer is not None:
+            for key in keys:
+                values = self.writer.get_pending(storage, key)
+                if values is not None:
+                    found.setdefault(key, values)
+        return found
 
     def save_simulation(self, simulation):
-        if simulation.circuit_type == constants.LOW_POWER_CIRCUIT:
-            self.__save_low_power_circuit_simulation(simulation)
+        self.save_simulations([simulation])
+
+    def save_simulations(self, simulations):
+        ''' Saves all the given simulations, and their stages, in a single
+        batch per circuit type '''
+        synthesis_size = len(SYNTHESIS_COLUMNS)
+        for circuit_type, group in self.__group(simulations).items():
+            storage, _ = self.storages[circuit_type]
+            synthesis_storage, errors_storage = self.stage_storages[circuit_type]
+            rows = [(self._key(simulation), self._low_power_values(simulation)) for simulation in group]
+            self.__save(storage, rows)
+            self.__save(synthesis_storage, [(self._synthesis_key(key), values[:synthesis_size]) for key, values in rows])
+            self.__save(errors_storage, [(self._errors_key(key), values[synthesis_size:]) for key, values in rows])
 
     def load_simulation(self, simulation):
-        if simulation.circuit_type == constants.LOW_POWER_CIRCUIT:
-            return self.__load_low_power_circuit_simulation(simulation)
-        else:
-            return False
\ No newline at end of file
+        return len(self.load_simulations([simulation])) == 1
+
+    def load_simulations(self, simulations):
+        ''' Looks up all the given simulations in a single batch per circuit
+        type, fills the ones found and returns them in the same order they
+        were given. The ones not found are looked up by stage, see Database '''
+        synthesis_size = len(SYNTHESIS_COLUMNS)
+        found = {}
+        for circuit_type, group in self.__group(simulations).items():
+            storage, _ = self.storages[circuit_type]
+            found.update(self.__load_many(storage, [self._key(simulation) for simulation in group]))
+        #rows without the required error metrics only keep their characteristics
+        stale_synthesis = {self._synthesis_key(key): values[:synthesis_size] for key, values in found.items()
+                           if not self._has_error_values(values[synthesis_size:], key[-1])}
+        found = {key: values for key, values in found.items() if self._has_error_values(values[synthesis_size:], key[-1])}
+
+        missing = [simulation for simulation in simulations
+                   if simulation.circuit_type in self.storages and self._key(simulation) not in found]
+        found_synthesis = {}
+        found_errors = {}
+        for circuit_type, group in self.__group(missing).items():
+            synthesis_storage, errors_storage = self.stage_storages[circuit_type]
+            keys = [self._key(simulation) for simulation in group]
+            found_synthesis.update(self.__load_many(synthesis_storage, [self._synthesis_key(key) for key in keys]))
+            found_errors.update(self.__load_many(errors_storage, [self._errors_key(key) for key in keys]))
+        for simulation in missing:
+            key = self._key(simulation)
+            synthesis_values = found_synthesis.get(self._synthesis_key(key), stale_synthesis.get(self._synthesis_key(key)))
+            error_values = found_errors.get(self._errors_key(key))
+            if error_values is not None and not self._has_error_values(error_values, key[-1]):
+                error_values = None
+            if synthesis_values is not None and error_values is not None:
+                found[key] = synthesis_values + error_values
+            elif synthesis_values is not None:
+                self._set_synthesis_values(simulation, synthesis_values)
+                simulation.is_synthesized = True
+            elif error_values is not None:
+                self._set_error_values(simulation, error_values)
+                simulation.is_validated = True
+
+        loaded = []
+        for simulation in simulations:
+            values = found.get(self._key(simulation)) if simulation.circuit_type in self.storages else None
+            if values is not None:
+                self._set_low_power_values(simulation, values)
+                loaded.append(simulation)
+        return loaded
+
+    def save_failure(self, simulation):
+        ''' Saves the failure class and reason of a failed simulation '''
+        if simulation.circuit_type in self.storages:
+            _, failures_storage = self.storages[simulation.circuit_type]
+            self.__save(failures_storage, [(self._key(simulation),
+                                            (simulation.failure_class, simulation.failure_reason))])
+
+    def load_failures(self, simulations):
+        ''' Looks up the saved failures of the given simulations in a single batch,
+        sets failure_class and failure_reason of the ones found and returns them '''
+        found = {}
+        for circuit_type, group in self.__group(simulations).items():
+            _, failures_storage = self.storages[circuit_type]
+            found.update(self.__load_many(failures_storage, [self._key(simulation) for simulation in group]))
+        failed = []
+        for simulation in simulations:
+            values = found.get(self._key(simulation)) if simulation.circuit_type in self.storages else None
+            if values is not None:
+                simulation.failure_class, simulation.failure_reason = values
+                failed.append(simulation)
+        return failed
+
+    def query_low_power_simulations(self, circuit_operation = None, min_bitwidth = None, max_bitwidth = None):
+        ''' Returns new LowPowerCircuitSimulation objects for the stored simulations
+        of the given operation whose bitwidth is between min_bitwidth and max_bitwidth '''
+        simulations = []
+        for key, values in self.low_power_storage.query(circuit_operation, min_bitwidth, max_bitwidth):
+            operation, method, bitwidth, approximate_bits, simulation_type, number_of_validations = key
+            simulation = CircuitSimulationBuilder.create_circuit_simulation_low_power(
+                method, simulation_type, number_of_validations, operation, bitwidth, approximate_bits)
+            self._set_low_power_values(simulation, values)
+            simulations.append(simulation)
+        return simulations
+
+    def import_csv(self, csv_path = constants.LOW_POWER_CSV):
+        ''' One shot import of a low power csv file into the sqlite engine,
+        returns the number of rows read '''
+        if self.engine != constants.SQLITE_ENGINE:
+            raise Exception("Error: csv files can only be imported into the sqlite database engine")
+        return self.low_power_storage.import_csv(csv_path)
+
+    def close(self):
+        self.stop_writer()
+        for storage, failures_storage in self.storages.values():
+            storage.close()
+            failures_storage.close()
+        for synthesis_storage, errors_storage in self.stage_storages.values():
+            synthesis_storage.close()
+            errors_storage.close()
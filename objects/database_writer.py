@@ -0,0 +1,141 @@
+import atexit
+import queue
+import threading
+import time
+
+
+class DatabaseWriter:
+    """
+    Write behind writer used by Database. Rows are put on a queue and written
+    by a dedicated thread, grouped in batches of up to batch_size rows or
+    whatever arrived in flush_interval seconds, so each batch costs a single
+    open, write and fsync of the storage.
+
+    Rows waiting on the queue can still be read with get_pending, so a saved
+    simulation is visible before it reaches the storage. Rows whose batch
+    failed stay pending and are written again with the next batch, or after
+    flush_interval if no row arrives, and close raises if they never succeed.
+
+    Attributes
+    ----------
+    batch_size : int
+        maximum number of rows written in a single batch
+    flush_interval : float
+        maximum seconds a row waits on the queue before being written
+    error : Exception
+        last error saving a batch, None if every batch was saved
+    """
+
+    __STOP = object()
+
+    def __init__(self, batch_size = 64, flush_interval = 1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.__queue = queue.Queue()
+        self.__pending = {}
+        self.__failed = []
+        self.error = None
+        self.__closed = False
+        self.__lock = threading.Lock()
+        self.__thread = threading.Thread(target = self.__run, name = 'DatabaseWriter', daemon = True)
+        self.__thread.start()
+        atexit.register(self.close)
+
+    def put(self, storage, rows):
+        ''' Queues the (key, values) pairs in rows to be saved on storage, once
+        the writer is closed they are saved right away '''
+        with self.__lock:
+            #queued under the lock, so close cannot stop the writer in between
+            if not self.__closed:
+                for key, values in rows:
+                    if storage.table.keep_last:
+                        self.__pending[(id(storage), key)] = values
+                    else:
+                        self.__pending.setdefault((id(storage), key), values)
+                for row in rows:
+                    self.__queue.put((storage, row))
+                return
+        storage.save_many(rows)
+
+    def get_pending(self, storage, key):
+        ''' Returns the values of a queued row of storage or None '''
+        with self.__lock:
+            return self.__pending.get((id(storage), key))
+
+    def __next_batch(self):
+        ''' Blocks until a row arrives, then collects rows until the batch is full
+        or flush_interval expires, returns the batch and if the writer must stop '''
+        batch = []
+        try:
+            #failed rows are retried after flush_interval even if nothing arrives
+            item = self.__queue.get(timeout = self.flush_interval if self.__failed else None)
+        except queue.Empty:
+            return batch, False
+        if item is self.__STOP:
+            return batch, True
+        batch.append(item)
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self.__queue.get(timeout = timeout)
+            except queue.Empty:
+                break
+            if item is self.__STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def __write(self, batch):
+        with self.__lock:
+            #failed rows go first, unless a newer row of their key replaced them
+            batch = [(storage, (key, values)) for storage, (key, values) in self.__failed
+                     if self.__pending.get((id(storage), key)) is values] + batch
+        storages = {}
+        for storage, row in batch:
+            storages.setdefault(id(storage), (storage, []))[1].append(row)
+
+        failed = []
+        for storage, rows in storages.values():
+            try:
+                storage.save_many(rows)
+            except Exception as error:
+                print(f'Error: unable to save {len(rows)} simulations on the database, they will be retried: {error}')
+                self.error = error
+                failed.extend((storage, row) for row in rows)
+
+        failed_rows = set(id(row) for _, row in failed)
+        with self.__lock:
+            self.__failed = failed
+            for storage, row in batch:
+                key, values = row
+                #a newer row of the key may still be queued
+                if id(row) not in failed_rows and self.__pending.get((id(storage), key)) is values:
+                    del self.__pending[(id(storage), key)]
+
+    def __run(self):
+        stop = False
+        while not stop:
+            batch, stop = self.__next_batch()
+            if batch or self.__failed:
+                self.__write(batch)
+
+    def close(self):
+        ''' Writes every queued row and stops the writer thread
+
+        Raises
+        ------
+        Exception
+            If some rows could not be saved, they are still pending
+        '''
+        with self.__lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__queue.put(self.__STOP)
+        self.__thread.join()
+        atexit.unregister(self.close)
+        if self.__failed:
+            raise Exception(f'Error: unable to save {len(self.__failed)} simulations on the database: {self.error}')
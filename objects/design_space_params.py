@@ -1,5 +1,129 @@
 from constants import constants
 
+class ExplorationOptions():
+    """
+    Class that groups the settings of the execution engine and the
+    exploration strategy shared by every DesignSpaceParams, validated when
+    created.
+
+    ...
+
+    Attributes
+    ----------
+    database_engine : str
+        Storage engine used by the database ( CSV_ENGINE, SQLITE_ENGINE )
+    jobs : int or str
+        Number of simulations executed at the same time or ADAPTIVE_JOBS
+    execution_engine : str
+        How simulations are executed ( THREADS_EXECUTION, ASYNCIO_EXECUTION, PIPELINE_EXECUTION )
+    timeout : float
+        Seconds after which a simulation is killed, None for no limit
+    retries : int
+        Times a simulation with a transient failure is retried
+    retry_budget : int
+        Maximum number of retries of the whole exploration, None for no limit
+    retry_failed : bool
+        If set simulations known to fail deterministically are simulated again
+    objectives : str[]
+        metrics of the multi-objective Pareto front and ranks, None to skip them
+    strategy : str
+        exploration strategy, one of the *_STRATEGY constants
+    time_budget : float
+        seconds after which the branch and bound strategy stops starting simulations, None for no limit
+    seed : int
+        seed of the random numbers of the nsga2 strategy, the same seed explores the same design points
+    population_size : int
+        design points of each generation of the nsga2 strategy
+    generations : int
+        generations simulated by the nsga2 strategy after the initial population
+    screening_validations : int
+        validations of the screening simulations of the multi-fidelity strategy
+    fidelity_margin : float
+        relative distance to the threshold or the Pareto front within which the multi-fidelity strategy simulates a screened design point at full fidelity
+    sequential_confidence : float
+        confidence at which random validations stop once the threshold decision is settled, None to always run all of them
+    validation_chunk : int
+        validations of each AUGER execution when they stop sequentially
+    software_errors : bool
+        if set the error metrics of the low power adders with a software model are computed on every input pair instead of by AUGER
+    parse_workers : int
+        Threads and processes parsing results on the pipeline execution engine, None for the cpu count
+    """
+    def __init__(
+        self,
+        database_engine = constants.CSV_ENGINE,
+        jobs = constants.DEFAULT_JOBS,
+        execution_engine = constants.THREADS_EXECUTION,
+        timeout = None,
+        retries = constants.DEFAULT_RETRIES,
+        retry_budget = None,
+        retry_failed = False,
+        objectives = None,
+        strategy = constants.BRUTE_FORCE_STRATEGY,
+        time_budget = None,
+        seed = constants.DEFAULT_SEED,
+        population_size = constants.DEFAULT_POPULATION_SIZE,
+        generations = constants.DEFAULT_GENERATIONS,
+        screening_validations = constants.DEFAULT_SCREENING_VALIDATIONS,
+        fidelity_margin = constants.DEFAULT_FIDELITY_MARGIN,
+        sequential_confidence = None,
+        validation_chunk = constants.DEFAULT_VALIDATION_CHUNK,
+        software_errors = False,
+        parse_workers = None
+    ):
+        self.database_engine = database_engine
+        self.jobs = jobs
+        self.execution_engine = execution_engine
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_budget = retry_budget
+        self.retry_failed = retry_failed
+        self.objectives = objectives
+        self.strategy = strategy
+        self.time_budget = time_budget
+        self.seed = seed
+        self.population_size = population_size
+        self.generations = generations
+        self.screening_validations = screening_validations
+        self.fidelity_margin = fidelity_margin
+        self.sequential_confidence = sequential_confidence
+        self.validation_chunk = validation_chunk
+        self.software_errors = software_errors
+        self.parse_workers = parse_workers
+        self.__validate()
+
+    def __validate(self):
+        if self.database_engine not in (constants.CSV_ENGINE, constants.SQLITE_ENGINE):
+            raise Exception("Invalid database engine: " + str(self.database_engine))
+        if self.execution_engine not in (constants.THREADS_EXECUTION, constants.ASYNCIO_EXECUTION, constants.PIPELINE_EXECUTION):
+            raise Exception("Invalid execution engine: " + str(self.execution_engine))
+        if self.strategy not in (constants.BRUTE_FORCE_STRATEGY, constants.BINARY_SEARCH_STRATEGY, constants.BRANCH_AND_BOUND_STRATEGY,
+                                 constants.SURROGATE_STRATEGY, constants.NSGA2_STRATEGY, constants.MULTI_FIDELITY_STRATEGY):
+            raise Exception("Invalid strategy: " + str(self.strategy))
+        if self.jobs != constants.ADAPTIVE_JOBS and self.jobs < 1:
+            raise Exception(f'jobs must be a positive number or "{constants.ADAPTIVE_JOBS}"')
+        if self.timeout is not None and not self.timeout > 0:
+            raise Exception("timeout must be greater than 0")
+        if self.retries < 0:
+            raise Exception("retries cannot be negative")
+        if self.retry_budget is not None and self.retry_budget < 0:
+            raise Exception("retry budget cannot be negative")
+        if self.parse_workers is not None and self.parse_workers < 1:
+            raise Exception("parse workers must be at least 1")
+        if self.population_size < 1:
+            raise Exception("population size must be at least 1")
+        if self.generations < 0:
+            raise Exception("generations cannot be negative")
+        if self.screening_validations < 1:
+            raise Exception("screening validations must be at least 1")
+        if not self.fidelity_margin >= 0:
+            raise Exception("fidelity margin cannot be negative")
+        if self.sequential_confidence is not None and not 0 < self.sequential_confidence < 1:
+            raise Exception("sequential confidence must be greater than 0 and smaller than 1")
+        if self.validation_chunk < 1:
+            raise Exception("validation chunk must be at least 1")
+
+
 class DesignSpaceParams():
     """
     Parent class that describes a common DesginSpaceParams.
@@ -20,9 +144,12 @@ class DesignSpaceParams():
         Error metric used to select the circuits ( MED, WCE )
     threshold : float
         Maximun value aceptable for the given error metric
+    options : ExplorationOptions
+        Settings of the execution engine and the exploration strategy
     """
-    def __init__(self, database, threaded, circuit_type, circuit_operation, bitwidth, charactheristic, error_metric, threshold):
+    def __init__(self, database, threaded, circuit_type, circuit_operation, bitwidth, charactheristic, error_metric, threshold, options = None):
         self.database = database
+        self.options = options if options is not None else ExplorationOptions()
         self.threaded = threaded
         self.circuit_type = circuit_type
         self.circuit_operation = circuit_operation
@@ -67,6 +194,8 @@ class  LowPowerDesignSpaceParams(DesignSpaceParams):
         Minimum  approximation bits to be simulated
     max_approx_bits: int
         Maximum  approximation bits to be simulated    
+    options : ExplorationOptions
+        Settings of the execution engine and the exploration strategy
     """
     def __init__(
         self, 
@@ -78,7 +207,8 @@ class  LowPowerDesignSpaceParams(DesignSpaceParams):
         error_metric, 
         threshold, 
         min_approx_bits, 
-        max_approx_bits
+        max_approx_bits,
+        options = None
     ):
         DesignSpaceParams.__init__(
             self,
@@ -89,7 +219,8 @@ class  LowPowerDesignSpaceParams(DesignSpaceParams):
             bitwidth,
             charactheristic,
             error_metric,
-            threshold
+            threshold,
+            options
         )
         self.__set_approx_bits(min_approx_bits, max_approx_bits)
 
@@ -110,8 +241,53 @@ class  LowPowerDesignSpaceParams(DesignSpaceParams):
 
 
 class  HighPerformanceDesignSpaceParams(DesignSpaceParams):
+    """
+    Class used to describe a HighPerformanceDesignSpaceParams, extends DesignSpaceParams and 
+    adds the ranges of r, the resultant bits of each sub-adder, and p, the previous bits
+    used to predict its carry.
+
+    ...
 
-    def __init__(self, circuit_operation, bitwidth, charactheristic, error_metric, threshold, min_r, max_r, min_p, max_p):
+    Attributes
+    ----------
+    circuit_type : str
+        Circuit type constant. ex (LOW_POWER, HIGH_PERFORMANCE)
+    operation : str
+        Circuit arithmetic operation ex (ADDER, SUBSTRACTOR, MULTIPLER, DIVIDER)
+    bitwidth : int
+        Bitwidth of the circuit to be generated
+    characteristic : str
+        Charactheristic of the circuit to be minimized ex ( AREA, POWER, DELAY )
+    error_metric : str
+        Error metric used to select the circuits ( MED, WCE )
+    threshold : float
+        Maximun value aceptable for the given error metric
+    min_r: int
+        Minimum resultant bits to be simulated
+    max_r: int
+        Maximum resultant bits to be simulated
+    min_p: int
+        Minimum previous bits to be simulated
+    max_p: int
+        Maximum previous bits to be simulated
+    options : ExplorationOptions
+        Settings of the execution engine and the exploration strategy
+    """
+    def __init__(
+        self, 
+        database,
+        threaded,
+        circuit_operation, 
+        bitwidth, 
+        charactheristic,
+        error_metric, 
+        threshold, 
+        min_r,
+        max_r,
+        min_p,
+        max_p,
+        options = None
+    ):
         DesignSpaceParams.__init__(
             self,
             database,
@@ -121,13 +297,28 @@ class  HighPerformanceDesignSpaceParams(DesignSpaceParams):
             bitwidth,
             charactheristic,
             error_metric,
-            threshold
+            threshold,
+            options
         )
-        self.min_r = min_r
-        self.max_r = max_r
-        self.min_p = min_p
-        self.max_p = max_p
-        
+        self.__set_r_and_p(min_r, max_r, min_p, max_p)
+
+    def __set_r_and_p(self, min_r, max_r, min_p, max_p):
+        if min_r < 1:
+            raise Exception("min r must be at least 1")
+        if min_p < 0:
+            raise Exception("min p cannot be negative")
+        if min_r > max_r:
+            raise Exception("max r cannot be smaller than min r")
+        if min_p > max_p:
+            raise Exception("max p cannot be smaller than min p")
+        if min_r + min_p > self.bitwidth:
+            raise Exception("min r plus min p cannot be greater than the bitwidth")
+        else:
+            self.min_r = min_r
+            self.max_r = max_r
+            self.min_p = min_p
+            self.max_p = max_p
+
 
 class DesignSpaceParamsBuilder():
     """
@@ -144,7 +335,8 @@ class DesignSpaceParamsBuilder():
         error_metric,
         threshold,
         min_approx_bits,
-        max_approx_bits
+        max_approx_bits,
+        options = None
     ):
         """Static method create LowPowerDesignSpaceParams object
 
@@ -165,6 +357,8 @@ class DesignSpaceParamsBuilder():
             Minimum  approximation bits to be simulated
         max_approx_bits: int
             Maximum  approximation bits to be simulated  
+        options : ExplorationOptions
+            Settings of the execution engine and the exploration strategy
         """
     
         return LowPowerDesignSpaceParams(
@@ -176,7 +370,8 @@ class DesignSpaceParamsBuilder():
             error_metric,
             threshold,
             min_approx_bits,
-            max_approx_bits
+            max_approx_bits,
+            options
         )
 
 
@@ -192,9 +387,37 @@ class DesignSpaceParamsBuilder():
         min_r,
         max_r,
         min_p,
-        max_p
+        max_p,
+        options = None
     ):
-        return LowPowerDesignSpaceParams(
+        """Static method create HighPerformanceDesignSpaceParams object
+
+        
+        Parameters
+        ----------
+        circuit_operation : str
+            Circuit arithmetic operation ex (ADDER, SUBSTRACTOR, MULTIPLER, DIVIDER)
+        bitwidth : int
+            Bitwidth of the circuit to be generated
+        characteristic : str
+            Charactheristic of the circuit to be minimized ex ( AREA, POWER, DELAY )
+        error_metric : str
+            Error metric used to select the circuits ( MED, WCE )
+        threshold : float
+            Maximun value aceptable for the given error metric
+        min_r: int
+            Minimum resultant bits to be simulated
+        max_r: int
+            Maximum resultant bits to be simulated
+        min_p: int
+            Minimum previous bits to be simulated
+        max_p: int
+            Maximum previous bits to be simulated
+        options : ExplorationOptions
+            Settings of the execution engine and the exploration strategy
+        """
+
+        return HighPerformanceDesignSpaceParams(
             database,
             threaded,
             circuit_operation,
@@ -202,6 +425,9 @@ class DesignSpaceParamsBuilder():
             charactheristic,
             error_metric,
             threshold,
-            min_approx_bits,
-            max_approx_bits
-        )
\ No newline at end of file
+            min_r,
+            max_r,
+            min_p,
+            max_p,
+            options
+        )
@@ -28,6 +28,20 @@ class DesignSpaceStats:
         number of failed simulations
     solutions : int
         number of solutions found
+    number_of_resumed_simulations : int
+        number of simulations taken from the journal of a resumed exploration
+    number_of_skipped_simulations : int
+        number of simulations not executed because they failed deterministically before
+    number_of_failures : dict
+        number of failed simulations of each failure class
+    number_of_retries : int
+        number of times a simulation was retried
+    worker_busy_time : float
+        seconds the workers spent running simulations
+    worker_capacity_time : float
+        seconds of worker time available while simulating
+    peak_workers : int
+        maximum number of workers used at the same time
 
     """
 
@@ -42,6 +56,13 @@ class DesignSpaceStats:
         self.number_of_successful_simulations = 0
         self.number_of_failed_simulations = 0
         self.number_of_solutions = 0
+        self.number_of_resumed_simulations = 0
+        self.number_of_skipped_simulations = 0
+        self.number_of_failures = {}
+        self.number_of_retries = 0
+        self.worker_busy_time = 0.0
+        self.worker_capacity_time = 0.0
+        self.peak_workers = 0
 
     def start(self):
         self.start_time = datetime.now()
@@ -61,17 +82,38 @@ class DesignSpaceStats:
     def finish_design_space_exploration(self):
         self.design_space_exploration_time = time.perf_counter() - self.design_space_exploration_time
 
-    def increment_number_of_total_simulations(self):
-        self.number_of_total_simulations += 1
+    def increment_number_of_total_simulations(self, amount = 1):
+        self.number_of_total_simulations += amount
 
-    def increment_number_of_loaded_simulations(self):
-        self.number_of_loaded_simulations += 1
+    def increment_number_of_loaded_simulations(self, amount = 1):
+        self.number_of_loaded_simulations += amount
 
-    def increment_number_of_successful_simulations(self):
-        self.number_of_successful_simulations += 1
+    def increment_number_of_successful_simulations(self, amount = 1):
+        self.number_of_successful_simulations += amount
 
-    def increment_number_of_failed_simulations(self):
-        self.number_of_failed_simulations += 1 
+    def increment_number_of_failed_simulations(self, amount = 1):
+        self.number_of_failed_simulations += amount 
         
+    def increment_number_of_resumed_simulations(self, amount = 1):
+        self.number_of_resumed_simulations += amount
+
+    def increment_number_of_skipped_simulations(self, amount = 1):
+        self.number_of_skipped_simulations += amount
+
+    def increment_number_of_failures(self, failure_class):
+        failure_class = failure_class or 'unknown'
+        self.number_of_failures[failure_class] = self.number_of_failures.get(failure_class, 0) + 1
+
     def increment_number_of_solutions(self):
-        self.number_of_solutions += 1
\ No newline at end of file
+        self.number_of_solutions += 1
+
+    def add_worker_usage(self, busy_time, capacity_time, peak_workers):
+        self.worker_busy_time += busy_time
+        self.worker_capacity_time += capacity_time
+        self.peak_workers = max(self.peak_workers, peak_workers)
+
+    @property
+    def worker_utilization(self):
+        if self.worker_capacity_time == 0:
+            return 0.0
+        return self.worker_busy_time / self.worker_capacity_time
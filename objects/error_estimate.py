@@ -0,0 +1,167 @@
+import math
+from statistics import NormalDist
+import numpy as np
+from constants import constants
+
+
+def maximum_output(circuit_operation, bitwidth):
+    ''' Returns the largest exact result of the circuit operation on two
+    bitwidth bits operands, used to normalize med '''
+    largest_operand = 2 ** bitwidth - 1
+    if circuit_operation == constants.ADDER:
+        return 2 * largest_operand
+    elif circuit_operation == constants.MULTIPLIER:
+        return largest_operand ** 2
+    else:
+        return largest_operand
+
+def error_metrics(errors, probabilities, largest_output):
+    ''' Returns every error metric in ERROR_METRICS of the error distance
+    PMF given as two arrays, computed with vectorized NumPy operations.
+
+    Parameters
+    ----------
+    errors : numpy.ndarray
+        error distances of the PMF, signed or not, the metrics use their absolute value
+    probabilities : numpy.ndarray
+        probability of each error distance
+    largest_output : int
+        largest exact result, see maximum_output
+    '''
+    distances = np.abs(errors)
+    med = float(np.dot(distances, probabilities))
+    metrics = {
+        constants.WCE: float(np.max(distances, initial = 0.0)),
+        constants.MED: med,
+        constants.NMED: med / largest_output,
+        constants.ERROR_RATE: float(probabilities[errors != 0].sum()),
+        constants.RMSE: math.sqrt(float(np.dot(distances * distances, probabilities))),
+    }
+    order = np.argsort(distances, kind = 'stable')
+    cumulative = np.cumsum(probabilities[order])
+    for metric, percentile in constants.ERROR_PERCENTILES.items():
+        if len(order) == 0:
+            metrics[metric] = 0.0
+        else:
+            index = min(np.searchsorted(cumulative, percentile / 100 * cumulative[-1]), len(order) - 1)
+            metrics[metric] = float(distances[order[index]])
+    return metrics
+
+def sampled_med_agrees(errors, probabilities, sampled_med, samples, confidence = constants.MODEL_CHECK_CONFIDENCE):
+    ''' Returns whether sampled_med, the mean of samples error distances
+    drawn at random, is within the normal confidence interval of the med of
+    the error distance PMF given as two arrays '''
+    distances = np.abs(errors)
+    med = float(np.dot(distances, probabilities))
+    deviation = math.sqrt(max(float(np.dot(distances * distances, probabilities)) - med ** 2, 0.0))
+    half_width = NormalDist().inv_cdf((1 + confidence) / 2) * deviation / math.sqrt(samples)
+    return abs(sampled_med - med) <= half_width + 1e-9 * max(1.0, med)
+
+
+class ErrorEstimate():
+    '''
+    Error distance PMF merged from the METRICS files of several validation
+    chunks, each weighted by its number of validations.
+
+    Attributes
+    ----------
+    samples : int
+        validations merged so far
+    errors : numpy.ndarray
+        distinct error distances seen
+    counts : numpy.ndarray
+        expected number of validations of each error distance
+    '''
+    def __init__(self):
+        self.samples = 0
+        self.errors = np.empty(0)
+        self.counts = np.empty(0)
+
+    def add(self, errors, probabilities, samples):
+        ''' Merges the PMF, arrays of error distances and their probabilities,
+        of samples validations '''
+        self.errors, inverse = np.unique(np.concatenate((self.errors, errors)), return_inverse = True)
+        self.counts = np.bincount(inverse, weights = np.concatenate((self.counts, probabilities * samples)),
+                                  minlength = len(self.errors))
+        self.samples += samples
+
+    def metrics(self, largest_output):
+        ''' Returns the error metrics of the merged PMF, see error_metrics '''
+        return error_metrics(self.errors, self.counts / self.samples, largest_output)
+
+    @property
+    def med(self):
+        return float(np.dot(np.abs(self.errors), self.counts)) / self.samples
+
+    @property
+    def wce(self):
+        ''' Largest error distance seen, a lower bound of the real one '''
+        return float(np.max(np.abs(self.errors), initial = 0.0))
+
+    def med_standard_error(self):
+        ''' Standard error of med as the mean of samples error distances '''
+        second_moment = float(np.dot(self.errors * self.errors, self.counts)) / self.samples
+        return math.sqrt(max(second_moment - self.med ** 2, 0.0) / self.samples)
+
+    def med_interval(self, confidence):
+        ''' Returns the (low, high) normal confidence interval of med '''
+        half_width = NormalDist().inv_cdf((1 + confidence) / 2) * self.med_standard_error()
+        return self.med - half_width, self.med + half_width
+
+
+class SequentialValidation():
+    '''
+    Stops the validations of a simulation, run in chunks of chunk_size,
+    as soon as the threshold decision on the error metric is settled with
+    the given confidence.
+
+    For med the decision is settled when its normal confidence interval is
+    entirely under or over the threshold. A wce over the threshold is
+    settled by the first error distance seen over it, while under the
+    threshold it is settled, by the rule of three, once enough validations
+    ran to have seen an error over the threshold with the given confidence
+    if one in every WCE_EXCEEDANCE_TOLERANCE validations had it.
+
+    Attributes
+    ----------
+    error_metric : str
+        error metric compared with the threshold ( MED, WCE )
+    threshold : float
+        maximum value accepted for the error metric
+    confidence : float
+        confidence required to stop, ex 0.95
+    chunk_size : int
+        validations of each AUGER execution
+    '''
+    def __init__(self, error_metric, threshold, confidence, chunk_size = constants.DEFAULT_VALIDATION_CHUNK):
+        self.error_metric = error_metric
+        self.threshold = threshold
+        self.confidence = confidence
+        self.chunk_size = chunk_size
+
+    def decision_confidence(self, estimate):
+        ''' Returns the confidence that the error metric of estimate is on the
+        side of the threshold it looks to be '''
+        return self.__confidence(estimate.med, estimate.wce, estimate.med_standard_error(), estimate.samples)
+
+    def stored_decision_confidence(self, med, wce, rmse, samples):
+        ''' Returns decision_confidence of an estimate stored as its med, wce
+        and rmse after samples validations, 0 if rmse was not stored '''
+        if self.error_metric == constants.WCE:
+            return self.__confidence(med, wce, None, samples)
+        if rmse is None:
+            return 0.0
+        return self.__confidence(med, wce, math.sqrt(max(rmse ** 2 - med ** 2, 0.0) / samples), samples)
+
+    def __confidence(self, med, wce, standard_error, samples):
+        if self.error_metric == constants.WCE:
+            if wce > self.threshold:
+                return 1.0
+            return 1 - (1 - constants.WCE_EXCEEDANCE_TOLERANCE) ** samples
+        if standard_error == 0:
+            return 1.0
+        #widest confidence interval of med that leaves the threshold out
+        return 2 * NormalDist().cdf(abs(med - self.threshold) / standard_error) - 1
+
+    def is_settled(self, estimate):
+        return self.decision_confidence(estimate) >= self.confidence
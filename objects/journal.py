@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from constants import constants
+
+
+class Journal:
+    """
+    Append only record of an exploration, stored as one json event per line
+    on JOURNAL_PATH/<run_id>.jsonl. It keeps the command line arguments, the
+    design points of every simulated batch and the state of each design
+    point: running (with the directory and pid of its AUGER execution),
+    completed (with its results) or failed, so an interrupted exploration can
+    be resumed where it stopped.
+
+    Attributes
+    ----------
+    run_id : str
+        identifier of the exploration
+    arguments : str[]
+        command line arguments of the exploration
+    design_space : tuple[]
+        keys of every design point recorded
+    running : dict
+        (directory, output_path, isolated, pid) of the design points whose
+        execution started but did not finish
+    completed : dict
+        results of the completed design points
+    failed : dict
+        (failure_class, failure_reason) of the failed design points
+    finished : bool
+        if set the exploration finished
+    """
+
+    RESULT_ATTRIBUTES = ['area', 'delay', 'power', 'pdp', 'wce', 'med', 'error_confidence', 'error_samples',
+                         'nmed', 'error_rate', 'rmse', 'ed50', 'ed90', 'ed99']
+
+    def __init__(self, run_id, arguments = None, path = constants.JOURNAL_PATH):
+        self.run_id = run_id
+        self.path = path
+        self.filename = os.path.join(path, run_id + '.jsonl')
+        self.arguments = arguments
+        self.design_space = []
+        self.__design_space_keys = set()
+        self.running = {}
+        self.completed = {}
+        self.failed = {}
+        self.finished = False
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def key(simulation):
+        ''' Returns the tuple that identifies a simulation on the journal, high
+        performance simulations append their r and p '''
+        key = (simulation.circuit_type,
+               simulation.circuit_operation,
+               simulation.approximation_method,
+               simulation.bitwidth,
+               getattr(simulation, 'approximate_bits', None),
+               simulation.simulation_type,
+               simulation.number_of_validations)
+        if simulation.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
+            key += (simulation.r, simulation.p)
+        return key
+
+    @staticmethod
+    def create(arguments, path = constants.JOURNAL_PATH):
+        ''' Starts the journal of a new exploration '''
+        run_id = datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        os.makedirs(path, exist_ok = True)
+        journal = Journal(run_id, list(arguments), path)
+        journal.__write([{'event': 'start', 'arguments': journal.arguments}])
+        return journal
+
+    @staticmethod
+    def open(run_id, path = constants.JOURNAL_PATH):
+        ''' Reads the journal of a previous exploration to resume it
+
+        Raises
+        ------
+        Exception
+            If the journal does not exist
+        '''
+        journal = Journal(run_id, None, path)
+        if not os.path.isfile(journal.filename):
+            raise Exception(f'Error: Unable to find the journal of run {run_id} in {path}.')
+
+        with open(journal.filename) as journal_file:
+            for line in journal_file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue #last line may be torn if the process died while writing it
+                journal.__apply(event)
+        return journal
+
+    def __apply(self, event):
+        kind = event['event']
+        if kind == 'start':
+            self.arguments = event['arguments']
+        elif kind == 'design_space':
+            for key in event['keys']:
+                key = tuple(key)
+                if key not in self.__design_space_keys:
+                    self.__design_space_keys.add(key)
+                    self.design_space.append(key)
+        elif kind == 'running':
+            self.running[tuple(event['key'])] = (event['directory'], event['output_path'], event['isolated'], event['pid'])
+        elif kind == 'completed':
+            key = tuple(event['key'])
+            self.running.pop(key, None)
+            self.failed.pop(key, None)
+            self.completed[key] = event['results']
+        elif kind == 'failed':
+            key = tuple(event['key'])
+            self.running.pop(key, None)
+            self.failed[key] = (event['failure_class'], event['failure_reason'])
+        elif kind == 'finished':
+            self.finished = True
+
+    def __write(self, events):
+        with self.__lock:
+            with open(self.filename, 'a') as journal_file:
+                for event in events:
+                    journal_file.write(json.dumps(event) + '\n')
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            for event in events:
+                if event['event'] != 'start':
+                    self.__apply(event)
+
+    @property
+    def pending(self):
+        ''' Keys of the design points that were never started '''
+        return [key for key in self.design_space
+                if key not in self.running and key not in self.completed and key not in self.failed]
+
+    def record_design_space(self, simulations):
+        keys = [self.key(simulation) for simulation in simulations]
+        keys = [key for key in keys if key not in self.__design_space_keys]
+        if keys:
+            self.__write([{'event': 'design_space', 'keys': keys}])
+
+    def record_running(self, simulation, job, pid):
+        self.__write([{'event': 'running',
+                       'key': self.key(simulation),
+                       'directory': job.directory,
+                       'output_path': job.output_path,
+                       'isolated': job.isolated,
+                       'pid': pid}])
+
+    def record_completed(self, simulation):
+        self.__write([{'event': 'completed',
+                       'key': self.key(simulation),
+                       'results': {name: getattr(simulation, name, None) for name in self.RESULT_ATTRIBUTES}}])
+
+    def record_failed(self, simulation):
+        self.__write([{'event': 'failed',
+                       'key': self.key(simulation),
+                       'failure_class': simulation.failure_class,
+                       'failure_reason': simulation.failure_reason}])
+
+    def record_finished(self):
+        self.__write([{'event': 'finished'}])
+
+    def load_completed(self, simulation):
+        ''' Sets the results of simulation if it was completed, returns True if found '''
+        results = self.completed.get(self.key(simulation))
+        if results is None:
+            return False
+        for name, value in results.items():
+            setattr(simulation, name, value)
+        return True
@@ -0,0 +1,219 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from constants import constants
+
+
+class SimulationPipeline():
+    '''
+    Runs the simulations of a Simulator through four stages connected by
+    bounded queues, each one with its own workers, so reading and parsing the
+    results never keeps an AUGER execution from starting:
+
+    * launch: launch_workers threads prepare the jobs and execute AUGER
+    * parse: parse_workers threads read the results of the executed jobs,
+      parsing the resume and metrics files on a pool of parse_workers
+      processes, and remove the jobs. Transient failures go back to the
+      launch stage after the retry backoff
+    * persist: a single thread calls persist(simulation, result), to save
+      the results on the database and the journal
+    * aggregate: a single thread calls on_result(simulation, result), whose
+      return value is used as result
+
+    Sequentially validated simulations need the errors of each chunk before
+    launching the next one, so they run whole on the launch stage.
+
+    Attributes
+    ----------
+    simulator : Simulator
+        simulator whose jobs are executed
+    launch_workers : int
+        AUGER executions running at the same time at most
+    parse_workers : int
+        threads and processes of the parse stage
+    queue_size : int
+        simulations waiting between two stages at most
+    busy_time : float
+        seconds spent by the launch workers executing AUGER
+    capacity_time : float
+        seconds of available launch worker time
+    peak_workers : int
+        number of launch workers
+    '''
+    def __init__(self, simulator, launch_workers, parse_workers, queue_size = constants.PIPELINE_QUEUE_SIZE):
+        self.simulator = simulator
+        self.launch_workers = max(1, launch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = queue_size
+        self.busy_time = 0.0
+        self.capacity_time = 0.0
+        self.peak_workers = self.launch_workers
+        self.__lock = threading.Lock()
+        self.__running_pids = {}
+        self.__cancelled = threading.Event()
+
+    def __add_busy_time(self, seconds):
+        with self.__lock:
+            self.busy_time += seconds
+
+    def __listen(self, listener):
+        ''' Returns a job listener that tracks the running executions, so they
+        can be killed on Ctrl-C, before calling listener '''
+        def job_listener(simulation, job, pid):
+            with self.__lock:
+                self.__running_pids[id(job)] = pid
+            if listener is not None:
+                listener(simulation, job, pid)
+        return job_listener
+
+    def __finish_job(self, job):
+        with self.__lock:
+            self.__running_pids.pop(id(job), None)
+
+    def __launch(self, simulations, launch_queue, parse_queue):
+        while True:
+            index = launch_queue.get()
+            if index is None or self.__cancelled.is_set():
+                return
+            simulation = simulations[index]
+            start = time.perf_counter()
+            simulation.attempts += 1
+            try:
+                if self.simulator._is_sequential(simulation):
+                    parse_queue.put((index, None, self.simulator._simulate_once(simulation)))
+                    continue
+                self.simulator._reset_failure(simulation)
+                job = self.simulator._prepare_job(simulation)
+                try:
+                    is_execution_successful = self.simulator._execute_simulation(simulation, job)
+                except Exception:
+                    self.simulator._discard_job(job)
+                    raise
+                finally:
+                    self.__finish_job(job)
+                parse_queue.put((index, job, is_execution_successful))
+            except Exception as error:
+                print(f'Error simulating {simulation.design_point}: {error}')
+                parse_queue.put((index, None, False))
+            finally:
+                self.__add_busy_time(time.perf_counter() - start)
+
+    def __parse(self, simulations, parse_queue, launch_queue, persist_queue):
+        while True:
+            item = parse_queue.get()
+            if item is None or self.__cancelled.is_set():
+                return
+            index, job, is_simulation_successful = item
+            simulation = simulations[index]
+            if job is not None:
+                try:
+                    is_simulation_successful = is_simulation_successful and self.simulator._collect_results(simulation, job)
+                except Exception as error:
+                    print(f'Error simulating {simulation.design_point}: {error}')
+                    is_simulation_successful = False
+                finally:
+                    self.simulator._discard_job(job)
+
+            if not is_simulation_successful:
+                delay = self.simulator._should_retry(simulation, simulation.attempts - 1)
+                if delay is not None:
+                    timer = threading.Timer(delay, launch_queue.put, (index,))
+                    timer.daemon = True
+                    timer.start()
+                    continue
+            persist_queue.put((index, is_simulation_successful))
+
+    def __persist(self, simulations, persist_queue, aggregate_queue, persist):
+        while True:
+            item = persist_queue.get()
+            if item is None or self.__cancelled.is_set():
+                return
+            index, result = item
+            if persist is not None:
+                try:
+                    persist(simulations[index], result)
+                except Exception as error:
+                    print(f'Error saving {simulations[index].design_point}: {error}')
+            aggregate_queue.put(item)
+
+    def __aggregate(self, simulations, aggregate_queue, results, finished, on_result):
+        remaining = len(simulations)
+        while remaining > 0:
+            item = aggregate_queue.get()
+            if item is None or self.__cancelled.is_set():
+                return
+            index, result = item
+            if on_result is not None:
+                try:
+                    result = on_result(simulations[index], result)
+                except Exception as error:
+                    print(f'Error simulating {simulations[index].design_point}: {error}')
+                    result = False
+            results[index] = result
+            remaining -= 1
+        finished.set()
+
+    def __feed(self, simulations, launch_queue):
+        for index in range(len(simulations)):
+            if self.__cancelled.is_set():
+                return
+            launch_queue.put(index)
+
+    def __kill_running(self):
+        with self.__lock:
+            pids = list(self.__running_pids.values())
+        for pid in pids:
+            self.simulator._kill_process_group(pid)
+
+    def __start(self, target, args, workers = 1):
+        threads = [threading.Thread(target = target, args = args, daemon = True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def run(self, simulations, persist = None, on_result = None):
+        ''' Simulates all the given simulations and returns their results in
+        order. Ctrl-C kills the running executions and drops the rest. '''
+        results = [False] * len(simulations)
+        if not simulations:
+            return results
+
+        for simulation in simulations:
+            simulation.attempts = 0
+        launch_queue = queue.Queue(maxsize = self.queue_size)
+        parse_queue = queue.Queue(maxsize = self.queue_size)
+        persist_queue = queue.Queue(maxsize = self.queue_size)
+        aggregate_queue = queue.Queue(maxsize = self.queue_size)
+        finished = threading.Event()
+
+        listener = self.simulator.job_listener
+        self.simulator.job_listener = self.__listen(listener)
+        #the parse processes are spawned, as forking a process with running threads is unsafe
+        self.simulator.parse_executor = ProcessPoolExecutor(self.parse_workers, mp_context = multiprocessing.get_context('spawn'))
+        start = time.perf_counter()
+        try:
+            self.__start(self.__feed, (simulations, launch_queue))
+            launchers = self.__start(self.__launch, (simulations, launch_queue, parse_queue), self.launch_workers)
+            parsers = self.__start(self.__parse, (simulations, parse_queue, launch_queue, persist_queue), self.parse_workers)
+            persisters = self.__start(self.__persist, (simulations, persist_queue, aggregate_queue, persist))
+            self.__start(self.__aggregate, (simulations, aggregate_queue, results, finished, on_result))
+            while not finished.wait(0.5): #wakes up so Ctrl-C is not delayed
+                pass
+
+            #every simulation went through all the stages, stop the workers
+            for stage_queue, workers in [(launch_queue, launchers), (parse_queue, parsers), (persist_queue, persisters)]:
+                for _ in workers:
+                    stage_queue.put(None)
+        except BaseException:
+            self.__cancelled.set()
+            self.__kill_running()
+            raise
+        finally:
+            self.capacity_time += (time.perf_counter() - start) * self.launch_workers
+            self.simulator.job_listener = listener
+            self.simulator.parse_executor.shutdown(wait = not self.__cancelled.is_set())
+            self.simulator.parse_executor = None
+
+        return results
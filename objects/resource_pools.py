@@ -0,0 +1,61 @@
+import threading
+from contextlib import contextmanager
+
+
+class ResourcePools:
+    """
+    Named pools of tokens that limit how many simulations use a resource at
+    the same time, ex the license seats of the synthesis or simulation tools.
+    Resources without a pool are unlimited.
+
+    Attributes
+    ----------
+    limits : dict
+        number of tokens of each named pool
+    """
+
+    def __init__(self, limits = None):
+        self.limits = dict(limits or {})
+        self.__semaphores = {name: threading.BoundedSemaphore(limit) for name, limit in self.limits.items()}
+
+    @staticmethod
+    def parse(text):
+        ''' Creates the pools from a "name=tokens, name=tokens" string
+
+        Raises
+        ------
+        Exception
+            If a pool is malformed or has less than one token
+        '''
+        limits = {}
+        for item in text.split(','):
+            if not item.strip():
+                continue
+            name, separator, value = item.partition('=')
+            if not separator or not value.strip().isdigit() or int(value) < 1:
+                raise Exception(f'Error: invalid resource pool "{item.strip()}", expected name=tokens')
+            limits[name.strip()] = int(value)
+        return ResourcePools(limits)
+
+    @staticmethod
+    def from_config(config_parser, section):
+        ''' Creates the pools from the options of a config file section,
+        without the section every resource is unlimited '''
+        if not config_parser.has_section(section):
+            return ResourcePools()
+        return ResourcePools.parse(','.join(f'{name}={value}' for name, value in config_parser.items(section)))
+
+    @contextmanager
+    def acquire(self, names):
+        ''' Holds a token of each of the named pools while the block runs. Tokens
+        are always taken in the same order so concurrent callers never deadlock '''
+        semaphores = [self.__semaphores[name] for name in sorted(set(names)) if name in self.__semaphores]
+        acquired = []
+        try:
+            for semaphore in semaphores:
+                semaphore.acquire()
+                acquired.append(semaphore)
+            yield
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
@@ -4,14 +4,186 @@ import csv #csv manipulation
 import os# checking if file exists
 import shutil #delete output
 import re #managing regex
+import signal #killing timed out executions
+import threading #retry budget shared by every execution
+import time #backoff between retries
+import random #backoff jitter
+import tempfile #per job scratch directories
+import uuid #unique names when publishing results
+import copy #per chunk copies of sequentially validated simulations
+import collections #breadth first listing of result folders
+import warnings #silence empty PMF warnings
+import numpy as np #vectorized metrics parsing
 from constants import constants
+from objects.resource_pools import ResourcePools
+from objects.error_estimate import ErrorEstimate, error_metrics, maximum_output, sampled_med_agrees
+
+def parse_resume(resume_path):
+    '''
+        Returns the (area, delay, power, pdp) of an AUGER resume file and
+        None, or None and the reason it could not be parsed.
+    '''
+    lineCount = 0
+    dynamic_power = 0
+    static_power = 0
+    delay = 0
+    area = 0
+
+    try:
+        with open(resume_path, newline='') as csvfile:
+            resume = csv.reader(csvfile, delimiter=',')
+            for row in resume:
+                if lineCount == 2:
+                    dynamic_power = float(re.findall(r'\d+\.\d+', row[0])[0])  #get dynamic power
+                elif lineCount == 4:
+                    static_power = float(re.findall(r'\d+\.\d+', row[0])[0])  #get cell leakage power
+                elif lineCount == 8:
+                    delay = float(re.findall(r'\d+\.\d+', row[0])[0]) # get delay results
+                elif lineCount == 12:
+                    area = float(re.findall(r'\d+\.\d+', row[0])[0]) # get area
+                elif lineCount >=  13:
+                    break
+                lineCount += 1
+    except (IndexError, ValueError):
+        return None, f"unable to parse line {lineCount + 1} of resume file"
+
+    #if line_count is smaller than 13 then the file was empty
+    if lineCount < 13:
+        return None, "resume file empty"
+
+    power = dynamic_power + (static_power * 10**-3) #multiply static power by 10^-3 to convert nW to uW
+    return (area, delay, power, power * delay), None
+
+def parse_metrics(metrics_path):
+    '''
+        Returns the error distance PMF of an AUGER metrics file, as two
+        arrays of error distances and their probabilities, and None, or
+        None and the reason it could not be parsed.
+    '''
+    #if the size is cero then the file was empty
+    if os.path.getsize(metrics_path) == 0:
+        return None, "metrics file empty"
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore') #a PMF without rows warns about it
+            pmf = np.loadtxt(metrics_path, delimiter = ',', skiprows = 2, usecols = (0, 1), ndmin = 2) #on third line data starts
+    except ValueError as error:
+        return None, f"unable to parse metrics file: {error}"
+
+    return (pmf[:, 0], pmf[:, 1]), None
+
+class RetryBudget():
+    '''
+    Number of retries shared by all the simulations of an exploration.
+
+    Attributes
+    ----------
+    limit : int
+        maximum number of retries, None for no limit
+    used : int
+        number of retries taken so far
+    '''
+    def __init__(self, limit = None):
+        self.limit = limit
+        self.used = 0
+        self.__lock = threading.Lock()
+
+    def take(self):
+        ''' Takes a retry from the budget, returns False if exhausted '''
+        with self.__lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+class SimulationJob():
+    '''
+    Working directory of a single AUGER execution.
+
+    Attributes
+    ----------
+    directory : str
+        directory AUGER is executed in
+    output_path : str
+        FilesPath used by this execution, where its results are written
+    isolated : bool
+        if set directory is a private scratch directory that is removed
+        once the results are collected
+    returncode : int
+        exit status of AUGER
+    stderr : str
+        last lines written by AUGER to its standard error
+    '''
+    def __init__(self, directory, output_path, isolated):
+        self.directory = directory
+        self.output_path = output_path
+        self.isolated = isolated
+        self.returncode = None
+        self.stderr = ''
 
 class Simulator():
     ''' On initialization gets output path, if unable to find it
-        raises error
+        raises error, and the resource pools that limit how many AUGER
+        executions of each simulation type run at the same time.
+
+        Unless IsolateJobs = no is set on the AAUG setup section of
+        config.cfg each execution runs in its own scratch directory, under
+        ScratchPath or the system temporary directory, with a copy of
+        config.cfg whose FilesPath points inside it, so concurrent executions
+        never share output files. The results are collected from there and
+        then published on FilesPath.
+
+        Executions taking longer than timeout seconds are killed together
+        with every process they started and marked as failed.
+
+        Failures are classified as transient (timeouts, license checkout
+        errors), tool errors (AUGER did not produce results) or parse errors
+        (results could not be read). Transient failures are retried up to
+        retries times, waiting retry_backoff * 2 ** attempt seconds between
+        attempts, while the shared retry_budget allows it.
+
+        Simulations marked is_synthesized only run the error stage, as a
+        validation (-val), and the ones marked is_validated only the
+        synthesis stage, with SYNTHESIS_STAGE_VALIDATIONS validations whose
+        errors are discarded.
+
+        If job_listener is set it is called as job_listener(simulation, job,
+        pid) every time an AUGER execution starts, so the execution can be
+        recovered with recover_job if the exploration is interrupted.
+
+        If sequential_validation is set, simulations with more validations
+        than its chunk size run them in chunks: the first chunk is a full
+        execution and the next ones only validate (-val). Their error PMFs
+        are merged and the validations stop once the threshold decision is
+        settled, recording its confidence and the validations used.
+
+        If error_model is set, the error metrics of the design points it
+        models are computed in software, on every input pair or analytically.
+        AUGER only runs MODEL_CHECK_VALIDATIONS validations of them, and a
+        simulation fails if any of their error distances is impossible on the
+        model, or transiently if their med is too far from the one of the model.
+
+        If parse_executor is set, a concurrent.futures executor, the resume
+        and metrics files are parsed on it with parse_resume and
+        parse_metrics, usually a process pool so the parsing does not hold
+        the interpreter lock while other threads launch executions.
     '''
-    def __init__(self):
+    def __init__(self, timeout = None, retries = constants.DEFAULT_RETRIES, retry_budget = None, retry_backoff = constants.RETRY_BACKOFF):
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_budget = RetryBudget(retry_budget)
+        self.retry_backoff = retry_backoff
         self.simulator_output_path = self._get_simulator_output_path()
+        self.resource_pools = self._get_resource_pools()
+        self.isolate_jobs, self.scratch_path = self._get_isolation_settings()
+        self.working_directory = os.getcwd()
+        self.job_listener = None
+        self.sequential_validation = None
+        self.error_model = None
+        self.parse_executor = None
+        self.result_layout = {}
+        self.__listing = threading.local()
 
 
     def _get_simulator_output_path(self):
@@ -39,147 +211,520 @@ class Simulator():
         else:
             return outputPath
 
-    def _find_file(self, rootdir, filename):
+    def _get_resource_pools(self):
+        """Gets the resource pools defined in the Resource pools section of the
+        config.cfg file, ex synthesis = 3 and simulation = 8 to match the
+        available license seats. Without the section resources are unlimited.
+
+        Raises
+        ------
+        Error
+            If a pool is not a positive number of tokens.
+        """
+
+        configParser = configparser.RawConfigParser()
+        configParser.read('./config.cfg')
+        return ResourcePools.from_config(configParser, constants.RESOURCE_POOLS_SECTION)
+
+    def _get_isolation_settings(self):
+        """Gets IsolateJobs, default yes, and ScratchPath, default the system
+        temporary directory, from the AAUG setup section of config.cfg.
+        """
+
+        configParser = configparser.RawConfigParser()
+        configParser.read('./config.cfg')
+        isolate_jobs = configParser.getboolean('AAUG setup', 'IsolateJobs', fallback = True)
+        scratch_path = configParser.get('AAUG setup', 'ScratchPath', fallback = None)
+        return isolate_jobs, scratch_path
+
+    def _result_directory(self, simulation, output_path = None):
         '''
-            Returns search for filename in rootdir, return path of file
-            if not found returns None
+            Returns the directory AUGER writes the results of simulation to
         '''
-        filepath = None
-        for root, dir, files in os.walk(rootdir):
-            if filename in files:
-                filepath = os.path.join(root, filename)
-                break
-        return filepath
-
-    def _execute_simulation(self, simulation):
+        if output_path is None:
+            output_path = self.simulator_output_path
+        if simulation.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
+            return (output_path + "/HP/" +
+                    simulation.circuit_operation + "/" +
+                    simulation.approximation_method + "/" +
+                    str(simulation.bitwidth) + "-" +
+                    str(simulation.r) + "-" +
+                    str(simulation.p))
+        return (output_path + "/LP/" +
+                simulation.circuit_operation + "/" +
+                simulation.approximation_method + "/" +
+                str(simulation.bitwidth) + "-" +
+                str(simulation.approximate_bits))
+
+    def _prepare_job(self, simulation):
         '''
-            Executes simulation on AUGER, return false if failed.
+            Creates the scratch directory of a simulation. It contains a copy of
+            config.cfg with FilesPath pointing to its output folder and links to
+            the rest of the files of the working directory, so AUGER finds
+            everything it needs as if it was executed from there.
         '''
+        if not self.isolate_jobs:
+            return SimulationJob(self.working_directory, self.simulator_output_path, False)
 
-        is_execution_successful = False
+        directory = tempfile.mkdtemp(prefix = f'auger-{simulation.approximation_method}-', dir = self.scratch_path)
+        output_path = os.path.join(directory, 'output')
+        os.mkdir(output_path)
+
+        for entry in os.listdir(self.working_directory):
+            if entry != 'config.cfg':
+                os.symlink(os.path.join(self.working_directory, entry), os.path.join(directory, entry))
 
-        command = [
-            './AUGER',
+        configParser = configparser.RawConfigParser()
+        configParser.optionxform = str #keep the case of the options
+        configParser.read(os.path.join(self.working_directory, 'config.cfg'))
+        configParser.set('AAUG setup', 'FilesPath', output_path)
+        with open(os.path.join(directory, 'config.cfg'), 'w') as config_file:
+            configParser.write(config_file)
+
+        return SimulationJob(directory, output_path, True)
+
+    def _publish_job(self, simulation, job):
+        '''
+            Moves the results of an isolated job to FilesPath. The results are
+            first copied next to their final location and then renamed into
+            place, so readers never see a partially written result folder.
+        '''
+        if not job.isolated:
+            return
+
+        source = self._result_directory(simulation, job.output_path)
+        target = self._result_directory(simulation)
+        if not os.path.isdir(source):
+            return
+
+        os.makedirs(os.path.dirname(target), exist_ok = True)
+        suffix = uuid.uuid4().hex
+        staged = f'{target}.tmp-{suffix}'
+        replaced = f'{target}.old-{suffix}'
+        shutil.copytree(source, staged, symlinks = True)
+        try:
+            os.rename(target, replaced)
+        except FileNotFoundError:
+            replaced = None
+        os.rename(staged, target)
+        if replaced is not None:
+            shutil.rmtree(replaced, ignore_errors = True)
+
+    def _discard_job(self, job):
+        '''Removes the scratch directory of an isolated job'''
+        if job.isolated:
+            shutil.rmtree(job.directory, ignore_errors = True)
+
+    def _find_file(self, rootdir, filename):
+        '''
+            Returns the path of filename in the result folder rootdir, None if
+            not found. AUGER writes every result folder with the same layout,
+            so the path of filename relative to it is learned the first time
+            it is found and later lookups only check it is there. Otherwise
+            the folder is listed, and the listing kept for the next file of
+            the same folder.
+        '''
+        relative_path = self.result_layout.get(filename)
+        if relative_path is not None and os.path.isfile(os.path.join(rootdir, relative_path)):
+            return os.path.join(rootdir, relative_path)
+
+        #(folder, listing) of the last folder listed by this thread
+        listed = getattr(self.__listing, 'value', None)
+        if (listed is None or listed[0] != rootdir or filename not in listed[1] or
+                not os.path.isfile(os.path.join(rootdir, listed[1][filename]))):
+            listed = (rootdir, self._list_result_folder(rootdir))
+            self.__listing.value = listed
+
+        relative_path = listed[1].get(filename)
+        if relative_path is None:
+            return None
+        self.result_layout[filename] = relative_path
+        return os.path.join(rootdir, relative_path)
+
+    @staticmethod
+    def _list_result_folder(rootdir):
+        '''
+            Returns the path relative to rootdir of every file under it,
+            listing each folder with a single scandir, shallower files first
+        '''
+        listing = {}
+        folders = collections.deque([''])
+        while folders:
+            folder = folders.popleft()
+            try:
+                with os.scandir(os.path.join(rootdir, folder)) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks = False):
+                            folders.append(os.path.join(folder, entry.name))
+                        else:
+                            listing.setdefault(entry.name, os.path.join(folder, entry.name))
+            except OSError:
+                continue
+        return listing
+
+    def _build_command(self, simulation):
+        '''
+            Returns the AUGER command line of simulation
+        '''
+        if simulation.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT:
+            approximation = ['-r', str(simulation.r), '-p', str(simulation.p)]
+        else:
+            approximation = ['-l', str(simulation.approximate_bits)]
+        return [
+            os.path.join(self.working_directory, 'AUGER'),
             constants.COMMANDS[simulation.circuit_operation],
             simulation.approximation_method,
             '-bw',
             str(simulation.bitwidth),
-            '-l',
-            str(simulation.approximate_bits),
-            simulation.simulation_type,
+            *approximation,
+            self._auger_simulation_type(simulation),
             '-rand',
             '-c',
-            str(simulation.number_of_validations),
+            str(self._auger_validations(simulation)),
             '-PMF'
         ]
 
-        #print(command)
-        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    def _is_modelled(self, simulation):
+        return self.error_model is not None and self.error_model.has_model(simulation)
 
-        return True
+    def _auger_simulation_type(self, simulation):
+        ''' Only validates the simulations whose characteristics are known '''
+        if simulation.is_synthesized:
+            return constants.VALIDATION
+        return simulation.simulation_type
+
+    def _auger_validations(self, simulation):
+        if simulation.is_validated:
+            return constants.SYNTHESIS_STAGE_VALIDATIONS
+        if self._is_modelled(simulation):
+            return min(constants.MODEL_CHECK_VALIDATIONS, simulation.number_of_validations)
+        return simulation.number_of_validations
+
+    def _simulation_resources(self, simulation):
+        return constants.SIMULATION_RESOURCES.get(self._auger_simulation_type(simulation), [])
+
+    @staticmethod
+    def _kill_process_group(pid):
+        '''
+            Kills an execution started on its own session and all its children
+        '''
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @staticmethod
+    def _mark_failure(simulation, failure_class, failure_reason):
+        '''
+            Records why simulation failed
+        '''
+        simulation.failure_class = failure_class
+        simulation.failure_reason = failure_reason
+        print(f"Error {failure_reason}")
+
+    @staticmethod
+    def _is_transient_error(stderr):
+        '''
+            Returns True if stderr shows a failure that may not happen again,
+            ex a license checkout error
+        '''
+        return any(re.search(pattern, stderr, re.IGNORECASE) for pattern in constants.TRANSIENT_ERROR_PATTERNS)
+
+    @staticmethod
+    def _stderr_tail(stderr):
+        return stderr.decode(errors='replace')[-constants.STDERR_TAIL:] if stderr else ''
 
-    def _retrieve_simulation_characteristics(self, simulation):
+    def _execute_simulation(self, simulation, job, resource_pools = None):
+        '''
+            Executes simulation on AUGER inside the job directory, holding the
+            tokens of resource_pools, the simulator ones by default, return false if failed.
+        '''
+
+        is_execution_successful = False
+
+        #print(command)
+        if resource_pools is None:
+            resource_pools = self.resource_pools
+        with resource_pools.acquire(self._simulation_resources(simulation)):
+            process = subprocess.Popen(self._build_command(simulation), cwd=job.directory,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                       start_new_session=True)
+            if self.job_listener is not None:
+                self.job_listener(simulation, job, process.pid)
+            try:
+                _, stderr = process.communicate(timeout=self.timeout)
+                job.stderr = self._stderr_tail(stderr)
+                is_execution_successful = True
+            except subprocess.TimeoutExpired:
+                self._kill_process_group(process.pid)
+                process.communicate()
+                self._mark_failure(simulation, constants.TRANSIENT_FAILURE, f"simulation timed out after {self.timeout} seconds")
+            except BaseException:
+                self._kill_process_group(process.pid)
+                process.communicate()
+                raise
+            job.returncode = process.returncode
+
+        return is_execution_successful
+
+    def _parse(self, parse_function, path):
+        if self.parse_executor is None:
+            return parse_function(path)
+        return self.parse_executor.submit(parse_function, path).result()
+
+    def _retrieve_simulation_characteristics(self, simulation, output_path = None):
         '''
             retrieves area, delay, power and pdp from simulation resume file, returns False if failed.
         '''
 
-        resume_path = self._find_file(self.simulator_output_path + "/LP/" + 
-                                      simulation.circuit_operation + "/" +
-                                      simulation.approximation_method + "/" +
-                                      str(simulation.bitwidth) + "-" +
-                                      str(simulation.approximate_bits),'RESUME.csv')
+        resume_path = self._find_file(self._result_directory(simulation, output_path),'RESUME.csv')
 
         #if unable to find it mark simulation as failed
         if resume_path is None:
-            print("Error unable to find resume file")
+            self._mark_failure(simulation, constants.TOOL_ERROR_FAILURE, "unable to find resume file")
             return False
 
-        lineCount = 0
-        dynamic_power = 0
-        static_power = 0
-        delay = 0
-        area = 0
-
-        with open(resume_path, newline='') as csvfile:
-            resume = csv.reader(csvfile, delimiter=',')
-            for row in resume:
-                if lineCount == 2:
-                    dynamic_power = float(re.findall('\d+\.\d+', row[0])[0])  #get dynamic power
-                elif lineCount == 4:
-                    static_power = float(re.findall('\d+\.\d+', row[0])[0])  #get cell leakage power
-                elif lineCount == 8:
-                    delay = float(re.findall('\d+\.\d+', row[0])[0]) # get delay results
-                elif lineCount == 12:
-                    area = float(re.findall('\d+\.\d+', row[0])[0]) # get area
-                elif lineCount >=  13:
-                    break    
-                lineCount += 1
-
-        #if line_count is smaller than 13 then the file was empty
-        if lineCount >= 13:
-            power = dynamic_power + (static_power * 10**-3) #multiply static power by 10^-3 to convert nW to uW
-            simulation.power = power
-            simulation.delay = delay
-            simulation.area = area
-            simulation.pdp = power * delay
-            return True
-
-        else:
-            print("Error resume file empty")
+        characteristics, failure_reason = self._parse(parse_resume, resume_path)
+        if characteristics is None:
+            self._mark_failure(simulation, constants.PARSE_ERROR_FAILURE, failure_reason)
             return False
 
-    def _retrieve_simulation_errors(self, simulation):
+        simulation.area, simulation.delay, simulation.power, simulation.pdp = characteristics
+        return True
 
-        metrics_path = self._find_file(self.simulator_output_path + "/LP/" + 
-                                      simulation.circuit_operation + "/" +
-                                      simulation.approximation_method + "/" +
-                                      str(simulation.bitwidth) + "-" +
-                                      str(simulation.approximate_bits),'METRICS.csv')
+    def _read_error_pmf(self, simulation, output_path = None):
+        '''
+            Returns the error distance PMF of the simulation metrics file as
+            two arrays, error distances and their probabilities, None if failed.
+        '''
+
+        metrics_path = self._find_file(self._result_directory(simulation, output_path),'METRICS.csv')
 
         #if unable to find it mark simulation as failed
         if metrics_path is None:
-            print("Error unable to find metrics file")
+            self._mark_failure(simulation, constants.TOOL_ERROR_FAILURE, "unable to find metrics file")
+            return None
+
+        pmf, failure_reason = self._parse(parse_metrics, metrics_path)
+        if pmf is None:
+            self._mark_failure(simulation, constants.PARSE_ERROR_FAILURE, failure_reason)
+        return pmf
+
+    def _set_error_metrics(self, simulation, metrics):
+        for metric, value in metrics.items():
+            setattr(simulation, metric, value)
+
+    def _retrieve_simulation_errors(self, simulation, output_path = None):
+
+        pmf = self._read_error_pmf(simulation, output_path)
+        if pmf is None:
             return False
 
-        lineCount = 0
-        errors = {}
+        errors, probabilities = pmf
+        if self._is_modelled(simulation):
+            return self._model_simulation_errors(simulation, errors, probabilities)
+        self._set_error_metrics(simulation, error_metrics(errors, probabilities,
+                                                          maximum_output(simulation.circuit_operation, simulation.bitwidth)))
 
-        with open(metrics_path, newline='') as csvfile:
-            metrics = csv.reader(csvfile, delimiter=',')
-            for row in metrics:
-                if lineCount >= 2: #on third line data starts 
-                    errors[float(row[0])] = float(row[1])
-                lineCount += 1
+        return True
+
+    def _model_simulation_errors(self, simulation, checked_errors, checked_probabilities):
+        '''
+            Sets the error metrics of the error model on simulation, return
+            false if the PMF validated by AUGER does not match the model.
+        '''
+        errors, probabilities, samples = self.error_model.error_pmf(simulation)
 
-        #if line_count is cero then the file was empty
-        if lineCount > 0:
-            med = 0
-            wce_value = 0
-            for value in errors:                  #iterate over errors dictionary
-                med += abs(value * errors[value]) #calculate med 
-                if value > wce_value:             #check for wce
-                    wce_value = value
+        unexpected = np.setdiff1d(np.abs(checked_errors[checked_probabilities > 0]), errors)
+        if len(unexpected) > 0:
+            self._mark_failure(simulation, constants.TOOL_ERROR_FAILURE,
+                               f"error model of {simulation.approximation_method} disagrees with AUGER on error distance {unexpected[0]:g}")
+            return False
+        checked_med = float(np.dot(np.abs(checked_errors), checked_probabilities))
+        if not sampled_med_agrees(errors, probabilities, checked_med, self._auger_validations(simulation)):
+            #a few random validations can miss the interval by chance, other inputs may agree
+            self._mark_failure(simulation, constants.TRANSIENT_FAILURE,
+                               f"error model of {simulation.approximation_method} disagrees with AUGER on med {checked_med:g}")
+            return False
 
-            #print(errors)
-            #print(med)
-            #print(wce_value)
+        self._set_error_metrics(simulation, error_metrics(errors, probabilities,
+                                                          maximum_output(simulation.circuit_operation, simulation.bitwidth)))
+        simulation.error_samples = samples
+        return True
 
-            simulation.med = med
-            simulation.wce = wce_value
+    def _cleanup(self, simulation):
+        '''Removes generated simulation files '''
+        shutil.rmtree(self._result_directory(simulation), ignore_errors = True)
 
+    def _collect_results(self, simulation, job):
+        '''
+            Reads the results of an executed job into simulation and publishes
+            them, returns False if they could not be read
+        '''
+        is_collection_successful = ((simulation.is_synthesized or self._retrieve_simulation_characteristics(simulation, job.output_path)) and
+                                    (simulation.is_validated or self._retrieve_simulation_errors(simulation, job.output_path)))
+        if is_collection_successful:
+            self._publish_job(simulation, job)
+        else:
+            self._classify_failure(simulation, job)
+        return is_collection_successful
+
+    def _classify_failure(self, simulation, job):
+        '''
+            Adds the exit status and error of AUGER to a tool error, which
+            becomes transient if the error may not happen again
+        '''
+        if simulation.failure_class == constants.TOOL_ERROR_FAILURE:
+            if self._is_transient_error(job.stderr):
+                simulation.failure_class = constants.TRANSIENT_FAILURE
+            simulation.failure_reason += f" (AUGER exit status {job.returncode})"
+            if job.stderr:
+                simulation.failure_reason += ": " + job.stderr.strip().splitlines()[-1]
+
+    @staticmethod
+    def _is_process_running(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        try:
+            with open(f'/proc/{pid}/stat') as stat_file:
+                return stat_file.read().rsplit(')', 1)[1].split()[0] != 'Z' #zombies already finished
+        except (OSError, IndexError):
             return True
 
-        else:
-            print("Error metrics file empty")
+    @staticmethod
+    def _is_auger_process(pid, directory):
+        '''
+            Returns whether pid is still an AUGER execution running on
+            directory, after a reboot the pid may belong to another process
+        '''
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as cmdline_file:
+                arguments = cmdline_file.read().split(b'\0')
+            cwd = os.readlink(f'/proc/{pid}/cwd')
+        except OSError:
             return False
+        return (any(os.path.basename(argument) == b'AUGER' for argument in arguments) and
+                os.path.realpath(cwd) == os.path.realpath(directory))
 
-    def _cleanup(self):
-        '''Removes generated simulation files '''
-        shutil.rmtree(self.simulator_output_path + "/LP/" + 
-                                      simulation.circuit_operation + "/" +
-                                      simulation.approximation_method + "/" +
-                                      str(simulation.bitwidth) + "-" +
-                                      str(simulation.approximate_bits), ignore_errors = True)
+    def recover_job(self, simulation, directory, output_path, isolated, pid, poll_interval = 1.0):
+        '''
+            Collects the results of an execution started by an interrupted
+            exploration. AUGER runs on its own session so it survives the
+            exploration, if it is still running waits for it to finish. A pid
+            that is no longer AUGER on directory is taken as finished, it is
+            never waited for nor killed. Returns False if its results could
+            not be read, the job directory is removed either way.
+        '''
+        self._reset_failure(simulation)
+        job = SimulationJob(directory, output_path, isolated)
+        if self._is_sequential(simulation):
+            #a single chunk cannot be resumed, the validations start again
+            self._discard_job(job)
+            self._mark_failure(simulation, constants.TRANSIENT_FAILURE, "sequential validations cannot be recovered")
+            return False
+        if isolated and not os.path.isdir(directory):
+            self._mark_failure(simulation, constants.TOOL_ERROR_FAILURE, "job directory no longer exists")
+            return False
+
+        if pid is not None and not self._is_auger_process(pid, directory):
+            pid = None
+        try:
+            start = time.monotonic()
+            while pid is not None and self._is_process_running(pid):
+                if self.timeout is not None and time.monotonic() - start > self.timeout:
+                    self._kill_process_group(pid)
+                    self._mark_failure(simulation, constants.TRANSIENT_FAILURE, f"simulation timed out after {self.timeout} seconds")
+                    return False
+                time.sleep(poll_interval)
+            return self._collect_results(simulation, job)
+        finally:
+            self._discard_job(job)
+
+    def _reset_failure(self, simulation):
+        simulation.failure_class = None
+        simulation.failure_reason = None
+
+    def _should_retry(self, simulation, attempt):
+        '''
+            Returns the seconds to wait before retrying a failed simulation or
+            None if it must not be retried
+        '''
+        if simulation.failure_class != constants.TRANSIENT_FAILURE or attempt >= self.retries:
+            return None
+        if not self.retry_budget.take():
+            print("Retry budget exhausted")
+            return None
+        delay = self.retry_backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+        print(f"Retrying {simulation.design_point} in {delay:.1f} seconds")
+        return delay
+
+    def _is_sequential(self, simulation):
+        return (self.sequential_validation is not None and not self._is_modelled(simulation) and not simulation.is_validated and
+                simulation.number_of_validations > self.sequential_validation.chunk_size)
+
+    def _simulate_sequentially(self, simulation, resource_pools = None):
+        '''
+            Runs the validations of simulation in chunks until the threshold
+            decision is settled or all of them ran, return false if failed.
+        '''
+        self._reset_failure(simulation)
+        estimate = ErrorEstimate()
+        while estimate.samples < simulation.number_of_validations:
+            chunk = copy.copy(simulation)
+            chunk.number_of_validations = min(self.sequential_validation.chunk_size,
+                                              simulation.number_of_validations - estimate.samples)
+            is_first_chunk = estimate.samples == 0
+            if not is_first_chunk:
+                chunk.is_synthesized = True #only validates
+
+            job = self._prepare_job(chunk)
+            try:
+                pmf = None
+                if self._execute_simulation(chunk, job, resource_pools):
+                    if chunk.is_synthesized or self._retrieve_simulation_characteristics(chunk, job.output_path):
+                        pmf = self._read_error_pmf(chunk, job.output_path)
+                if pmf is None:
+                    self._classify_failure(chunk, job)
+                    simulation.failure_class = chunk.failure_class
+                    simulation.failure_reason = chunk.failure_reason
+                    return False
+                if is_first_chunk:
+                    self._publish_job(chunk, job)
+                    simulation.area, simulation.delay, simulation.power, simulation.pdp = chunk.area, chunk.delay, chunk.power, chunk.pdp
+            finally:
+                self._discard_job(job)
+
+            errors, probabilities = pmf
+            estimate.add(errors, probabilities, chunk.number_of_validations)
+            if self.sequential_validation.is_settled(estimate):
+                break
+
+        self._set_error_metrics(simulation, estimate.metrics(maximum_output(simulation.circuit_operation, simulation.bitwidth)))
+        simulation.error_confidence = self.sequential_validation.decision_confidence(estimate)
+        simulation.error_samples = estimate.samples
+        if estimate.samples < simulation.number_of_validations:
+            print(f"Settled {simulation.design_point} after {estimate.samples} validations with {simulation.error_confidence:.1%} confidence")
+        return True
+
+    def _simulate_once(self, simulation, resource_pools = None):
+        if self._is_sequential(simulation):
+            return self._simulate_sequentially(simulation, resource_pools)
+
+        is_simulation_successful = False
+
+        self._reset_failure(simulation)
+        job = self._prepare_job(simulation)
+        try:
+            if self._execute_simulation(simulation, job, resource_pools):
+                is_simulation_successful = self._collect_results(simulation, job)
+        finally:
+            self._discard_job(job)
+
+        return is_simulation_successful
 
     def simulate(self, simulation):
         """Simulates and asigns charactheristics to given simulation, 
@@ -191,10 +736,15 @@ class Simulator():
             Simulation object that contains the parameteres to be simulated.
         """
 
-        is_simulation_successful = False
-
-        if self._execute_simulation(simulation):
-            is_simulation_successful = self._retrieve_simulation_characteristics(simulation) and self._retrieve_simulation_errors(simulation)
-        #self._cleanup()
+        attempt = 0
+        while True:
+            simulation.attempts = attempt + 1
+            is_simulation_successful = self._simulate_once(simulation)
+            delay = None if is_simulation_successful else self._should_retry(simulation, attempt)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        #self._cleanup(simulation)
 
         return is_simulation_successful
\ No newline at end of file
@@ -0,0 +1,356 @@
+import csv
+import os
+import sqlite3
+import threading
+
+try:
+    import fcntl #file locking between processes, not available on windows
+except ImportError:
+    fcntl = None
+
+
+class Table:
+    """
+    Describes the rows stored by a storage engine. The first key_size columns
+    identify a row, the remaining ones are its values.
+
+    Attributes
+    ----------
+    name : str
+        name of the table
+    columns : (str, type)[]
+        name and python type (str, int or float) of each column
+    key_size : int
+        number of leading columns that form the key
+    keep_last : bool
+        if set saving an existing key replaces its values, otherwise the
+        first values saved are kept
+    required_size : int
+        number of leading columns every row has, the rest were added later
+        and are None on the rows saved before, by default all of them
+    """
+
+    def __init__(self, name, columns, key_size, keep_last = False, required_size = None):
+        self.name = name
+        self.columns = columns
+        self.key_size = key_size
+        self.keep_last = keep_last
+        self.required_size = len(columns) if required_size is None else required_size
+
+    @property
+    def key_columns(self):
+        return [name for name, _ in self.columns[:self.key_size]]
+
+    @property
+    def value_columns(self):
+        return [name for name, _ in self.columns[self.key_size:]]
+
+    def parse_row(self, row):
+        ''' Converts a row of strings into a (key, values) pair of typed tuples,
+        empty fields are converted to None '''
+        typed = tuple(None if field == '' else column_type(field)
+                      for (_, column_type), field in zip(self.columns, row))
+        typed += (None,) * (len(self.columns) - len(typed))
+        return typed[:self.key_size], typed[self.key_size:]
+
+
+LOW_POWER_KEY_COLUMNS = [
+    ('circuit_operation', str),
+    ('approximation_method', str),
+    ('bitwidth', int),
+    ('approximate_bits', int),
+    ('simulation_type', str),
+    ('number_of_validations', int),
+]
+
+SYNTHESIS_COLUMNS = [
+    ('area', float),
+    ('delay', float),
+    ('power', float),
+    ('pdp', float),
+]
+
+#columns added after the first release of a table go after RESULT_COLUMNS
+RESULT_COLUMNS = SYNTHESIS_COLUMNS + [
+    ('wce', float),
+    ('med', float),
+]
+
+ERROR_ESTIMATE_COLUMNS = [
+    ('error_confidence', float),
+    ('error_samples', int),
+]
+
+EXTRA_ERROR_COLUMNS = [
+    ('nmed', float),
+    ('error_rate', float),
+    ('rmse', float),
+    ('ed50', float),
+    ('ed90', float),
+    ('ed99', float),
+]
+
+#results are keep_last, a row saved before some error metric existed is
+#simulated again and replaced
+LOW_POWER_TABLE = Table('low_power', LOW_POWER_KEY_COLUMNS + RESULT_COLUMNS + ERROR_ESTIMATE_COLUMNS + EXTRA_ERROR_COLUMNS, 6,
+                        keep_last = True, required_size = len(LOW_POWER_KEY_COLUMNS + RESULT_COLUMNS))
+
+LOW_POWER_FAILURES_TABLE = Table('low_power_failures', LOW_POWER_KEY_COLUMNS + [
+    ('failure_class', str),
+    ('failure_reason', str),
+], 6, keep_last = True)
+
+
+#the characteristics only depend on the design point and the simulation type,
+#and the errors on the design point and the number of validations
+LOW_POWER_SYNTHESIS_TABLE = Table('low_power_synthesis', LOW_POWER_KEY_COLUMNS[:5] + SYNTHESIS_COLUMNS, 5)
+
+LOW_POWER_ERRORS_TABLE = Table('low_power_errors', LOW_POWER_KEY_COLUMNS[:4] + LOW_POWER_KEY_COLUMNS[5:] + RESULT_COLUMNS[4:] +
+                               ERROR_ESTIMATE_COLUMNS + EXTRA_ERROR_COLUMNS, 5, keep_last = True)
+
+
+HIGH_PERFORMANCE_KEY_COLUMNS = [
+    ('circuit_operation', str),
+    ('approximation_method', str),
+    ('bitwidth', int),
+    ('r', int),
+    ('p', int),
+    ('simulation_type', str),
+    ('number_of_validations', int),
+]
+
+HIGH_PERFORMANCE_TABLE = Table('high_performance', HIGH_PERFORMANCE_KEY_COLUMNS + RESULT_COLUMNS + ERROR_ESTIMATE_COLUMNS + EXTRA_ERROR_COLUMNS, 7,
+                               keep_last = True, required_size = len(HIGH_PERFORMANCE_KEY_COLUMNS + RESULT_COLUMNS))
+
+HIGH_PERFORMANCE_FAILURES_TABLE = Table('high_performance_failures', HIGH_PERFORMANCE_KEY_COLUMNS + [
+    ('failure_class', str),
+    ('failure_reason', str),
+], 7, keep_last = True)
+
+HIGH_PERFORMANCE_SYNTHESIS_TABLE = Table('high_performance_synthesis', HIGH_PERFORMANCE_KEY_COLUMNS[:6] + SYNTHESIS_COLUMNS, 6)
+
+HIGH_PERFORMANCE_ERRORS_TABLE = Table('high_performance_errors', HIGH_PERFORMANCE_KEY_COLUMNS[:5] + HIGH_PERFORMANCE_KEY_COLUMNS[6:] +
+                                      RESULT_COLUMNS[4:] + ERROR_ESTIMATE_COLUMNS + EXTRA_ERROR_COLUMNS, 6, keep_last = True)
+
+
+class Storage:
+    """
+    Interface implemented by the storage engines used by Database. Rows are
+    handled as (key, values) pairs of tuples following the table columns.
+    When a key is saved more than once the first values are kept, unless the
+    table is keep_last.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def load(self, key):
+        ''' Returns the values stored for key or None if not found '''
+        raise NotImplementedError
+
+    def load_many(self, keys):
+        ''' Returns a dict with the values of the given keys that were found '''
+        found = {}
+        for key in keys:
+            values = self.load(key)
+            if values is not None:
+                found[key] = values
+        return found
+
+    def save_many(self, rows):
+        ''' Stores the (key, values) pairs in rows as a single batch '''
+        raise NotImplementedError
+
+    def query(self, circuit_operation = None, min_bitwidth = None, max_bitwidth = None):
+        ''' Returns the (key, values) pairs of the given operation whose bitwidth is
+        between min_bitwidth and max_bitwidth, unset filters match everything '''
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvStorage(Storage):
+    ''' Stores rows in a csv file. The file is read once into an in memory index
+    and new rows are appended under an exclusive file lock, so rows written by
+    several threads or processes never get interleaved.
+    '''
+
+    def __init__(self, table, path):
+        Storage.__init__(self, table)
+        self.path = path
+        self.__index = None
+        self.__lock = threading.Lock()
+
+    def __build_index(self):
+        ''' Reads the whole csv file into the index, when a key is
+        repeated the first row is kept, as the old sequential search did,
+        or the last one if the table is keep_last '''
+        index = {}
+        if os.path.isfile(self.path):
+            with open(self.path, newline='') as csvfile:
+                csv_reader = csv.reader(csvfile, delimiter=',')
+                for row in csv_reader:
+                    if len(row) < self.table.required_size:
+                        continue
+                    key, values = self.table.parse_row(row)
+                    if self.table.keep_last or key not in index:
+                        index[key] = values
+        return index
+
+    def __get_index(self):
+        if self.__index is None:
+            with self.__lock:
+                if self.__index is None:
+                    self.__index = self.__build_index()
+        return self.__index
+
+    def load(self, key):
+        return self.__get_index().get(key)
+
+    def save_many(self, rows):
+        if not rows:
+            return
+        with self.__lock:
+            with open(self.path, 'a', newline='') as csvfile:
+                if fcntl is not None:
+                    fcntl.flock(csvfile, fcntl.LOCK_EX)
+                try:
+                    csv_writer = csv.writer(csvfile, delimiter=',')
+                    csv_writer.writerows([list(key) + list(values) for key, values in rows])
+                    csvfile.flush()
+                    os.fsync(csvfile.fileno())
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(csvfile, fcntl.LOCK_UN)
+            if self.__index is not None:
+                for key, values in rows:
+                    if self.table.keep_last:
+                        self.__index[key] = values
+                    else:
+                        self.__index.setdefault(key, values)
+
+    def query(self, circuit_operation = None, min_bitwidth = None, max_bitwidth = None):
+        return [(key, values) for key, values in self.__get_index().items()
+                if (circuit_operation is None or key[0] == circuit_operation)
+                and (min_bitwidth is None or key[2] >= min_bitwidth)
+                and (max_bitwidth is None or key[2] <= max_bitwidth)]
+
+
+class SqliteStorage(Storage):
+    ''' Stores rows in an SQLite database in WAL mode, so several readers and
+    writers, either threads or processes, can share the same file. Each thread
+    uses its own connection. The key columns are the primary key of the table
+    and (circuit_operation, bitwidth) is indexed for range queries. Columns
+    added to the table after the database file was created are added to it
+    when opened.
+    '''
+
+    SQLITE_TYPES = {str: 'TEXT', int: 'INTEGER', float: 'REAL'}
+
+    def __init__(self, table, path, timeout = 60):
+        Storage.__init__(self, table)
+        self.path = path
+        self.timeout = timeout
+        self.__local = threading.local()
+        self.__connections = []
+        self.__lock = threading.Lock()
+        self.__create_table()
+
+    def __connection(self):
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout = self.timeout, check_same_thread = False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
+
+    def __create_table(self):
+        columns = ', '.join(f'{name} {self.SQLITE_TYPES[column_type]}' for name, column_type in self.table.columns)
+        key = ', '.join(self.table.key_columns)
+        with self.__connection() as connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS {self.table.name} ({columns}, PRIMARY KEY ({key}))')
+            existing = set(row[1] for row in connection.execute(f'PRAGMA table_info({self.table.name})'))
+            for name, column_type in self.table.columns:
+                if name not in existing:
+                    connection.execute(f'ALTER TABLE {self.table.name} ADD COLUMN {name} {self.SQLITE_TYPES[column_type]}')
+            connection.execute(f'CREATE INDEX IF NOT EXISTS {self.table.name}_operation_bitwidth '
+                               f'ON {self.table.name} (circuit_operation, bitwidth)')
+
+    def __key_condition(self):
+        return ' AND '.join(f'{name} = ?' for name in self.table.key_columns)
+
+    def load(self, key):
+        values = ', '.join(self.table.value_columns)
+        row = self.__connection().execute(
+            f'SELECT {values} FROM {self.table.name} WHERE {self.__key_condition()}', key).fetchone()
+        return None if row is None else tuple(row)
+
+    def load_many(self, keys, chunk_size = 150):
+        found = {}
+        columns = ', '.join(self.table.key_columns + self.table.value_columns)
+        key = ', '.join(self.table.key_columns)
+        row_placeholder = '(' + ', '.join('?' * self.table.key_size) + ')'
+        connection = self.__connection()
+        keys = list(keys)
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            placeholders = ', '.join([row_placeholder] * len(chunk))
+            rows = connection.execute(
+                f'SELECT {columns} FROM {self.table.name} WHERE ({key}) IN (VALUES {placeholders})',
+                [field for chunk_key in chunk for field in chunk_key]).fetchall()
+            for row in rows:
+                found[tuple(row[:self.table.key_size])] = tuple(row[self.table.key_size:])
+        return found
+
+    def save_many(self, rows):
+        if not rows:
+            return
+        placeholders = ', '.join('?' * len(self.table.columns))
+        conflict = 'REPLACE' if self.table.keep_last else 'IGNORE'
+        with self.__connection() as connection: #commits the whole batch as one transaction
+            connection.executemany(f'INSERT OR {conflict} INTO {self.table.name} VALUES ({placeholders})',
+                                   [tuple(key) + tuple(values) for key, values in rows])
+
+    def query(self, circuit_operation = None, min_bitwidth = None, max_bitwidth = None):
+        conditions = []
+        parameters = []
+        if circuit_operation is not None:
+            conditions.append('circuit_operation = ?')
+            parameters.append(circuit_operation)
+        if min_bitwidth is not None:
+            conditions.append('bitwidth >= ?')
+            parameters.append(min_bitwidth)
+        if max_bitwidth is not None:
+            conditions.append('bitwidth <= ?')
+            parameters.append(max_bitwidth)
+        where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+        rows = self.__connection().execute(f'SELECT * FROM {self.table.name}{where}', parameters).fetchall()
+        return [(tuple(row[:self.table.key_size]), tuple(row[self.table.key_size:])) for row in rows]
+
+    def import_csv(self, csv_path, batch_size = 10000):
+        ''' Copies the rows of a csv file written by CsvStorage into the database,
+        returns the number of rows read '''
+        count = 0
+        batch = []
+        with open(csv_path, newline='') as csvfile:
+            for row in csv.reader(csvfile, delimiter=','):
+                if len(row) < self.table.required_size:
+                    continue
+                batch.append(self.table.parse_row(row))
+                count += 1
+                if len(batch) >= batch_size:
+                    self.save_many(batch)
+                    batch = []
+        self.save_many(batch)
+        return count
+
+    def close(self):
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections = []
+        self.__local = threading.local()
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from constants import constants
+from objects.error_estimate import error_metrics
+from objects.adder_models import MODELLED_ADDERS, AdderErrorModel, analytical_error_pmf, approximate_sum, exhaustive_error_estimate
+from objects.circuit_simulation import CircuitSimulationBuilder
+
+
+def reference_sum(approximation_method, approximate_bits, a, b):
+    ''' Bit by bit ripple carry adder with the cell equations of each method '''
+    carry = 0
+    result = 0
+    for bit in range(approximate_bits):
+        x, y = (a >> bit) & 1, (b >> bit) & 1
+        if approximation_method == "LOA":
+            total = x | y
+            carry = x & y if bit == approximate_bits - 1 else 0
+        elif approximation_method == "AMA1":
+            total = carry & (1 - (x ^ y))
+            carry = y | (x & carry)
+        elif approximation_method == "AMA2":
+            carry = (x & y) | (x & carry) | (y & carry)
+            total = 1 - carry
+        elif approximation_method == "AMA3":
+            carry = y | (x & carry)
+            total = 1 - carry
+        elif approximation_method == "AMA4":
+            total = carry & ((1 - x) | y)
+            carry = x
+        elif approximation_method == "AMA5":
+            total, carry = y, x
+        result |= total << bit
+    return (((a >> approximate_bits) + (b >> approximate_bits) + carry) << approximate_bits) | result
+
+@pytest.mark.parametrize('approximation_method', MODELLED_ADDERS)
+@pytest.mark.parametrize('approximate_bits', [0, 1, 3, 5])
+def test_approximate_sum(approximation_method, approximate_bits):
+    operands = np.arange(2 ** 5, dtype = np.int64)
+    a = np.repeat(operands, len(operands))
+    b = np.tile(operands, len(operands))
+    expected = [reference_sum(approximation_method, approximate_bits, x, y) for x, y in zip(a.tolist(), b.tolist())]
+    assert approximate_sum(approximation_method, approximate_bits, a, b).tolist() == expected
+
+def test_exhaustive_error_estimate():
+    estimate = exhaustive_error_estimate("LOA", 4, 0)
+    assert (estimate.samples, estimate.wce, estimate.med) == (256, 0.0, 0.0)
+    #LOA only errs when both operands have the lowest bit set, by one
+    estimate = exhaustive_error_estimate("LOA", 4, 1)
+    assert (estimate.wce, estimate.med) == (1.0, 0.25)
+
+@pytest.mark.parametrize('approximation_method', MODELLED_ADDERS)
+def test_model_metrics_match_signed_pmf(approximation_method):
+    ''' A METRICS PMF of signed errors gives the same metrics as the model '''
+    operands = np.arange(2 ** 5, dtype = np.int64)
+    a = np.repeat(operands, len(operands))
+    b = np.tile(operands, len(operands))
+    errors, counts = np.unique(approximate_sum(approximation_method, 4, a, b) - (a + b), return_counts = True)
+    signed = error_metrics(errors.astype(float), counts / len(a), 62)
+    assert signed == pytest.approx(exhaustive_error_estimate(approximation_method, 5, 4).metrics(62))
+
+def test_exhaustive_error_estimate_chunks():
+    whole = exhaustive_error_estimate("AMA2", 6, 4).metrics(126)
+    assert exhaustive_error_estimate("AMA2", 6, 4, chunk_pairs = 100).metrics(126) == pytest.approx(whole)
+
+@pytest.mark.parametrize('approximation_method', MODELLED_ADDERS)
+@pytest.mark.parametrize('approximate_bits', [0, 1, 2, 5, 6])
+def test_analytical_error_pmf(approximation_method, approximate_bits):
+    errors, probabilities = analytical_error_pmf(approximation_method, approximate_bits)
+    estimate = exhaustive_error_estimate(approximation_method, 6, approximate_bits)
+    assert errors.tolist() == estimate.errors.tolist()
+    assert probabilities == pytest.approx(estimate.counts / estimate.samples)
+
+def test_analytical_error_pmf_wide():
+    errors, probabilities = analytical_error_pmf("LOA", 16)
+    #the worst case of LOA is the weight of its most significant approximate bit
+    assert errors[-1] == 2 ** 15
+    assert probabilities.sum() == pytest.approx(1.0)
+
+def test_has_model():
+    model = AdderErrorModel(max_bitwidth = 8, max_analytical_bits = 4)
+    create = CircuitSimulationBuilder.create_circuit_simulation_low_power
+    assert model.has_model(create('LOA', constants.SYNTHESIS, 256, constants.ADDER, 8, 6))
+    assert model.has_model(create('LOA', constants.SYNTHESIS, 256, constants.ADDER, 32, 4))
+    assert not model.has_model(create('LOA', constants.SYNTHESIS, 256, constants.ADDER, 32, 5))
+    assert not model.has_model(create('LOA', constants.SYNTHESIS, 256, constants.MULTIPLIER, 8, 2))
+    assert not model.has_model(create('CFA', constants.SYNTHESIS, 256, constants.ADDER, 8, 2))
+
+def test_error_pmf():
+    model = AdderErrorModel(max_bitwidth = 8)
+    create = CircuitSimulationBuilder.create_circuit_simulation_low_power
+    errors, probabilities, samples = model.error_pmf(create('AMA5', constants.SYNTHESIS, 256, constants.ADDER, 8, 3))
+    assert samples == 2 ** 16
+    wide_errors, wide_probabilities, samples = model.error_pmf(create('AMA5', constants.SYNTHESIS, 2 ** 20, constants.ADDER, 24, 3))
+    assert samples is None
+    assert wide_errors.tolist() == errors.tolist()
+    assert wide_probabilities == pytest.approx(probabilities)
@@ -0,0 +1,299 @@
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from constants import constants
+from objects.circuit_simulation import CircuitSimulationBuilder
+from objects.database import Database
+from objects.database_writer import DatabaseWriter
+from objects.storage import Table
+from objects.error_estimate import SequentialValidation
+
+
+def create_simulation(approximate_bits = 2, number_of_validations = 256, bitwidth = 8):
+    return CircuitSimulationBuilder.create_circuit_simulation_low_power(
+        'LOA', constants.SYNTHESIS, number_of_validations, constants.ADDER, bitwidth, approximate_bits)
+
+def set_results(simulation):
+    simulation.area = 10.5
+    simulation.delay = 0.5
+    simulation.power = 2.0
+    simulation.pdp = 1.0
+    simulation.wce = 3.0
+    simulation.med = 0.75
+    return simulation
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture(params=[constants.CSV_ENGINE, constants.SQLITE_ENGINE])
+def engine(request):
+    return request.param
+
+def test_load_simulation_missing_file(engine):
+    assert not Database(engine).load_simulation(create_simulation())
+
+def test_save_and_load_simulation(engine):
+    Database(engine).save_simulation(set_results(create_simulation()))
+
+    loaded = create_simulation()
+    assert Database(engine).load_simulation(loaded)
+    assert loaded.area == 10.5
+    assert loaded.delay == 0.5
+    assert loaded.power == 2.0
+    assert loaded.pdp == 1.0
+    assert loaded.wce == 3.0
+    assert loaded.med == 0.75
+
+def test_save_and_load_high_performance_simulation(engine):
+    Database(engine).save_simulation(set_results(CircuitSimulationBuilder.create_circuit_simulation_high_performance(
+        'GeAr', constants.SYNTHESIS, 256, constants.ADDER, 8, 2, 2)))
+
+    database = Database(engine)
+    loaded = CircuitSimulationBuilder.create_circuit_simulation_high_performance(
+        'GeAr', constants.SYNTHESIS, 256, constants.ADDER, 8, 2, 2)
+    assert database.load_simulations([loaded, create_simulation()]) == [loaded]
+    assert loaded.area == 10.5
+    assert not database.load_simulation(CircuitSimulationBuilder.create_circuit_simulation_high_performance(
+        'GeAr', constants.SYNTHESIS, 256, constants.ADDER, 8, 2, 3))
+
+def test_load_rows_without_error_estimate(engine):
+    ''' Rows saved before the error estimate columns existed are still loaded '''
+    with open(constants.LOW_POWER_CSV, 'w') as csvfile:
+        csvfile.write('adder,LOA,8,2,-syn,256,10.5,0.5,2.0,1.0,3.0,0.75\n')
+    if engine == constants.SQLITE_ENGINE:
+        import sqlite3
+        connection = sqlite3.connect(constants.LOW_POWER_DB)
+        connection.execute('CREATE TABLE low_power (circuit_operation TEXT, approximation_method TEXT, bitwidth INTEGER, '
+                           'approximate_bits INTEGER, simulation_type TEXT, number_of_validations INTEGER, area REAL, '
+                           'delay REAL, power REAL, pdp REAL, wce REAL, med REAL)')
+        connection.commit()
+        connection.close()
+        assert Database(engine).import_csv(constants.LOW_POWER_CSV) == 1
+
+    database = Database(engine)
+    loaded = create_simulation()
+    assert database.load_simulation(loaded)
+    assert (loaded.med, loaded.error_confidence, loaded.error_samples) == (0.75, None, None)
+
+    simulation = set_results(create_simulation(approximate_bits = 3))
+    simulation.error_confidence = 0.99
+    simulation.error_samples = 50000
+    database.save_simulation(simulation)
+    loaded = create_simulation(approximate_bits = 3)
+    assert Database(engine).load_simulation(loaded)
+    assert (loaded.error_confidence, loaded.error_samples) == (0.99, 50000)
+
+def test_load_rows_without_error_metric(engine):
+    ''' Rows saved before nmed existed only keep their characteristics when it is required '''
+    with open(constants.LOW_POWER_CSV, 'w') as csvfile:
+        csvfile.write('adder,LOA,8,2,-syn,256,10.5,0.5,2.0,1.0,3.0,0.75\n')
+
+    database = Database(engine)
+    if engine == constants.SQLITE_ENGINE:
+        database.import_csv(constants.LOW_POWER_CSV)
+    database.required_error_metrics = [constants.NMED]
+    simulation = create_simulation()
+    assert not database.load_simulation(simulation)
+    assert (simulation.area, simulation.nmed, simulation.is_synthesized, simulation.is_validated) == (10.5, None, True, False)
+
+    #once simulated again the complete row replaces the old one
+    set_results(simulation).nmed = 0.01
+    database.save_simulation(simulation)
+    database = Database(engine)
+    database.required_error_metrics = [constants.NMED]
+    loaded = create_simulation()
+    assert database.load_simulation(loaded)
+    assert loaded.nmed == 0.01
+
+@pytest.mark.parametrize('sequential_validation, is_loaded', [
+    (None, False),
+    (SequentialValidation(constants.MED, 2.0, 0.95), True),
+    (SequentialValidation(constants.MED, 0.75, 0.95), False),
+])
+def test_load_rows_stopped_early(engine, sequential_validation, is_loaded):
+    ''' Errors of validations stopped early are only reused when they settle the current decision '''
+    simulation = set_results(create_simulation(number_of_validations = 1000000))
+    simulation.rmse = 1.0
+    simulation.error_confidence = 0.99
+    simulation.error_samples = 50000
+    Database(engine).save_simulation(simulation)
+
+    database = Database(engine)
+    database.sequential_validation = sequential_validation
+    loaded = create_simulation(number_of_validations = 1000000)
+    assert database.load_simulation(loaded) == is_loaded
+    assert loaded.is_synthesized != is_loaded
+    other_type = create_simulation(number_of_validations = 1000000)
+    other_type.simulation_type = constants.POST_SYNTHESYS
+    database.load_simulation(other_type)
+    assert other_type.is_validated == is_loaded
+
+def test_load_simulation_key_mismatch(engine):
+    Database(engine).save_simulation(set_results(create_simulation()))
+
+    database = Database(engine)
+    assert not database.load_simulation(create_simulation(approximate_bits = 3))
+    assert not database.load_simulation(create_simulation(number_of_validations = 512))
+
+def test_load_cached_stages(engine):
+    Database(engine).save_simulation(set_results(create_simulation()))
+
+    database = Database(engine)
+    other_validations = create_simulation(number_of_validations = 512)
+    assert not database.load_simulation(other_validations)
+    assert (other_validations.is_synthesized, other_validations.is_validated) == (True, False)
+    assert (other_validations.area, other_validations.med) == (10.5, None)
+
+    other_type = create_simulation()
+    other_type.simulation_type = constants.POST_SYNTHESYS
+    assert not database.load_simulation(other_type)
+    assert (other_type.is_synthesized, other_type.is_validated) == (False, True)
+    assert (other_type.area, other_type.med) == (None, 0.75)
+
+    #the characteristics of -syn and the errors of 512 validations were cached apart
+    simulation = create_simulation(number_of_validations = 512)
+    simulation.simulation_type = constants.POST_SYNTHESYS
+    set_results(simulation).med = 0.5
+    database.save_simulation(simulation)
+    loaded = create_simulation(number_of_validations = 512)
+    assert Database(engine).load_simulation(loaded)
+    assert (loaded.area, loaded.med, loaded.is_synthesized, loaded.is_validated) == (10.5, 0.5, False, False)
+
+def test_save_simulation_updates_index(engine):
+    database = Database(engine)
+    assert not database.load_simulation(create_simulation())
+
+    database.save_simulation(set_results(create_simulation()))
+
+    loaded = create_simulation()
+    assert database.load_simulation(loaded)
+    assert loaded.med == 0.75
+
+def test_concurrent_save_simulations(engine):
+    database = Database(engine)
+    simulations = [set_results(create_simulation(approximate_bits = bits, bitwidth = 64)) for bits in range(64)]
+    with ThreadPoolExecutor(max_workers = 8) as executor:
+        for simulation in simulations:
+            executor.submit(database.save_simulation, simulation)
+
+    reopened = Database(engine)
+    for bits in range(64):
+        assert reopened.load_simulation(create_simulation(approximate_bits = bits, bitwidth = 64))
+
+def test_query_low_power_simulations(engine):
+    database = Database(engine)
+    database.save_simulations([set_results(create_simulation(bitwidth = bitwidth)) for bitwidth in (4, 8, 16, 32)])
+
+    simulations = database.query_low_power_simulations(constants.ADDER, min_bitwidth = 8, max_bitwidth = 16)
+    assert sorted(simulation.bitwidth for simulation in simulations) == [8, 16]
+    assert database.query_low_power_simulations(constants.MULTIPLIER) == []
+
+def test_import_csv():
+    Database(constants.CSV_ENGINE).save_simulations([set_results(create_simulation(approximate_bits = bits)) for bits in range(4)])
+
+    database = Database(constants.SQLITE_ENGINE)
+    assert database.import_csv(constants.LOW_POWER_CSV) == 4
+    loaded = create_simulation(approximate_bits = 3)
+    assert database.load_simulation(loaded)
+    assert loaded.wce == 3.0
+
+def test_import_csv_csv_engine():
+    with pytest.raises(Exception):
+        Database(constants.CSV_ENGINE).import_csv(constants.LOW_POWER_CSV)
+
+def test_writer_flushes_on_stop(engine):
+    database = Database(engine)
+    database.start_writer(batch_size = 1000, flush_interval = 60)
+    database.save_simulations([set_results(create_simulation(approximate_bits = bits)) for bits in range(8)])
+
+    loaded = create_simulation(approximate_bits = 7)
+    assert database.load_simulation(loaded)
+    assert len(database.load_simulations([create_simulation(approximate_bits = bits) for bits in range(8)])) == 8
+
+    database.stop_writer()
+    reopened = Database(engine)
+    assert len(reopened.load_simulations([create_simulation(approximate_bits = bits) for bits in range(8)])) == 8
+
+def test_writer_flushes_full_batches(engine):
+    database = Database(engine)
+    database.start_writer(batch_size = 4, flush_interval = 60)
+    database.save_simulations([set_results(create_simulation(approximate_bits = bits)) for bits in range(4)])
+    for _ in range(100):
+        if Database(engine).load_simulation(create_simulation(approximate_bits = 3)):
+            break
+        time.sleep(0.01)
+    assert Database(engine).load_simulation(create_simulation(approximate_bits = 3))
+    database.stop_writer()
+
+class BlockingStorage:
+    ''' Storage whose saves wait to be released one by one '''
+
+    def __init__(self):
+        self.table = Table('blocking', [('key', str), ('value', str)], 1, keep_last = True)
+        self.saved = []
+        self.started = threading.Semaphore(0)
+        self.released = threading.Semaphore(0)
+
+    def save_many(self, rows):
+        self.started.release()
+        self.released.acquire()
+        self.saved.extend(rows)
+
+def test_writer_keeps_newer_pending_values():
+    storage = BlockingStorage()
+    writer = DatabaseWriter(batch_size = 1, flush_interval = 0.01)
+    writer.put(storage, [(('a',), ('old',))])
+    assert storage.started.acquire(timeout = 5)
+    writer.put(storage, [(('a',), ('new',))])
+    storage.released.release()
+    #the writer is saving the new row, the old one was written
+    assert storage.started.acquire(timeout = 5)
+    assert writer.get_pending(storage, ('a',)) == ('new',)
+    storage.released.release()
+    writer.close()
+    assert storage.saved == [(('a',), ('old',)), (('a',), ('new',))]
+    assert writer.get_pending(storage, ('a',)) is None
+
+def test_writer_saves_after_close():
+    storage = BlockingStorage()
+    writer = DatabaseWriter()
+    writer.close()
+    storage.released.release()
+    writer.put(storage, [(('a',), ('value',))])
+    assert storage.saved == [(('a',), ('value',))]
+
+class FailingStorage:
+    ''' Storage whose first failures saves raise '''
+
+    def __init__(self, failures):
+        self.table = Table('failing', [('key', str), ('value', str)], 1, keep_last = True)
+        self.failures = failures
+        self.saved = []
+
+    def save_many(self, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            raise OSError('disk full')
+        self.saved.extend(rows)
+
+def test_writer_retries_failed_batches():
+    storage = FailingStorage(failures = 1)
+    writer = DatabaseWriter(batch_size = 1, flush_interval = 0.01)
+    writer.put(storage, [(('a',), ('value',))])
+    for _ in range(500):
+        if storage.saved:
+            break
+        time.sleep(0.01)
+    writer.close()
+    assert storage.saved == [(('a',), ('value',))]
+    assert writer.get_pending(storage, ('a',)) is None
+
+def test_writer_raises_unsaved_rows_on_close():
+    storage = FailingStorage(failures = 1000)
+    writer = DatabaseWriter(batch_size = 1, flush_interval = 0.01)
+    writer.put(storage, [(('a',), ('value',))])
+    with pytest.raises(Exception, match = 'disk full'):
+        writer.close()
+    assert writer.get_pending(storage, ('a',)) == ('value',)
@@ -1,6 +1,6 @@
 import pytest
 from constants import constants
-from objects.design_space_params import DesignSpaceParamsBuilder, LowPowerDesignSpaceParams
+from objects.design_space_params import DesignSpaceParamsBuilder, ExplorationOptions, LowPowerDesignSpaceParams
 
 
 # low power specific tests
@@ -12,4 +12,30 @@ def test_low_power_design_space_params():
     assert design_space_params.charactheristic == constants.POWER
     assert design_space_params.threshold == 0.25
     assert design_space_params.min_approx_bits == 0
-    assert design_space_params.max_approx_bits == 4
\ No newline at end of file
+    assert design_space_params.max_approx_bits == 4
+
+
+# high performance specific tests
+def test_high_performance_design_space_params():
+    design_space_params = DesignSpaceParamsBuilder.create_high_performance_space_design_params(
+        True, True, constants.ADDER, 8, constants.AREA, constants.WCE, 4, 1, 6, 0, 4, ExplorationOptions(strategy = constants.NSGA2_STRATEGY, seed = 3))
+    assert design_space_params.circuit_type == constants.HIGH_PERFORMANCE_CIRCUIT
+    assert (design_space_params.min_r, design_space_params.max_r) == (1, 6)
+    assert (design_space_params.min_p, design_space_params.max_p) == (0, 4)
+    assert design_space_params.options.strategy == constants.NSGA2_STRATEGY
+    assert design_space_params.options.seed == 3
+
+@pytest.mark.parametrize('min_r, max_r, min_p, max_p', [(0, 4, 0, 4), (4, 2, 0, 4), (1, 4, 3, 2), (6, 6, 4, 4)])
+def test_high_performance_design_space_params_invalid(min_r, max_r, min_p, max_p):
+    with pytest.raises(Exception):
+        DesignSpaceParamsBuilder.create_high_performance_space_design_params(
+            True, True, constants.ADDER, 8, constants.AREA, constants.WCE, 4, min_r, max_r, min_p, max_p)
+
+@pytest.mark.parametrize('options', [{'database_engine': 'xml'}, {'execution_engine': 'processes'}, {'strategy': 'random'}, {'jobs': 0},
+                                     {'sequential_confidence': 0}, {'sequential_confidence': 1}, {'validation_chunk': 0},
+                                     {'screening_validations': 0}, {'fidelity_margin': -0.1},
+                                     {'population_size': 0}, {'generations': -1},
+                                     {'timeout': 0}, {'retries': -1}, {'retry_budget': -1}, {'parse_workers': 0}])
+def test_exploration_options_invalid(options):
+    with pytest.raises(Exception):
+        ExplorationOptions(**options)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from constants import constants
+from objects.error_estimate import ErrorEstimate, SequentialValidation, error_metrics, maximum_output, sampled_med_agrees
+
+
+def test_add_merges_chunks():
+    estimate = ErrorEstimate()
+    estimate.add(np.array([0.0, 4.0]), np.array([0.5, 0.5]), 100)
+    estimate.add(np.array([0.0]), np.array([1.0]), 300)
+    assert estimate.samples == 400
+    assert estimate.med == 0.5
+    assert estimate.wce == 4.0
+    #error distances 4 on 50 of 400 validations
+    assert estimate.med_standard_error() == pytest.approx(((2.0 - 0.25) / 400) ** 0.5)
+    low, high = estimate.med_interval(0.95)
+    assert low < 0.5 < high
+    assert estimate.metrics(510)[constants.ED90] == 4.0
+
+def test_error_metrics():
+    metrics = error_metrics(np.array([-2.0, 0.0, 1.0, 4.0]), np.array([0.25, 0.5, 0.2, 0.05]), maximum_output(constants.ADDER, 8))
+    assert metrics[constants.MED] == pytest.approx(0.9)
+    assert metrics[constants.WCE] == 4.0
+    assert metrics[constants.NMED] == pytest.approx(0.9 / 510)
+    assert metrics[constants.ERROR_RATE] == pytest.approx(0.5)
+    assert metrics[constants.RMSE] == pytest.approx((1.0 + 0.2 + 0.8) ** 0.5)
+    assert (metrics[constants.ED50], metrics[constants.ED90], metrics[constants.ED99]) == (0.0, 2.0, 4.0)
+    assert set(metrics) == set(constants.ERROR_METRICS)
+
+def test_error_metrics_without_errors():
+    metrics = error_metrics(np.empty(0), np.empty(0), maximum_output(constants.MULTIPLIER, 4))
+    assert all(value == 0.0 for value in metrics.values())
+
+@pytest.mark.parametrize('threshold, settled', [(1.0, True), (0.51, False), (0.0, True)])
+def test_med_decision(threshold, settled):
+    estimate = ErrorEstimate()
+    estimate.add(np.array([0.0, 1.0]), np.array([0.5, 0.5]), 1000)
+    assert SequentialValidation(constants.MED, threshold, 0.95).is_settled(estimate) == settled
+
+def test_wce_decision():
+    validation = SequentialValidation(constants.WCE, 4.0, 0.95)
+    estimate = ErrorEstimate()
+    estimate.add(np.array([0.0, 2.0]), np.array([0.5, 0.5]), 100000)
+    assert not validation.is_settled(estimate)
+    #rule of three, about 3 / WCE_EXCEEDANCE_TOLERANCE validations without errors over the threshold
+    estimate.add(np.array([0.0]), np.array([1.0]), 200000)
+    assert validation.is_settled(estimate)
+
+    estimate = ErrorEstimate()
+    estimate.add(np.array([0.0, 8.0]), np.array([0.99, 0.01]), 100)
+    assert validation.decision_confidence(estimate) == 1.0
+
+@pytest.mark.parametrize('error_metric', [constants.MED, constants.WCE])
+def test_stored_decision_confidence(error_metric):
+    validation = SequentialValidation(error_metric, 0.55, 0.95)
+    estimate = ErrorEstimate()
+    estimate.add(np.array([0.0, 1.0]), np.array([0.5, 0.5]), 1000)
+    metrics = estimate.metrics(maximum_output(constants.ADDER, 8))
+    assert validation.stored_decision_confidence(metrics[constants.MED], metrics[constants.WCE], metrics[constants.RMSE],
+                                                 estimate.samples) == pytest.approx(validation.decision_confidence(estimate))
+
+def test_sampled_med_agrees():
+    errors, probabilities = np.array([0.0, 1.0]), np.array([0.75, 0.25])
+    assert sampled_med_agrees(errors, probabilities, 0.25, 64)
+    assert sampled_med_agrees(errors, probabilities, 0.5, 16)
+    assert not sampled_med_agrees(errors, probabilities, 0.5, 64)
+    assert not sampled_med_agrees(np.array([0.0]), np.array([1.0]), 0.5, 64)
@@ -0,0 +1,47 @@
+import pytest
+from constants import constants
+from objects.circuit_simulation import CircuitSimulationBuilder
+from objects.journal import Journal
+from objects.simulator import SimulationJob
+
+
+def create_simulation(approximate_bits):
+    return CircuitSimulationBuilder.create_circuit_simulation_low_power(
+        'LOA', constants.SYNTHESIS, 256, constants.ADDER, 8, approximate_bits)
+
+def test_open_restores_state(tmp_path):
+    journal = Journal.create(['lp', '-add'], tmp_path)
+    simulations = [create_simulation(approximate_bits) for approximate_bits in range(4)]
+    journal.record_design_space(simulations)
+    journal.record_design_space(simulations[:2])
+    journal.record_running(simulations[0], SimulationJob('/scratch/auger-0', '/scratch/auger-0/output', True), 10)
+    journal.record_running(simulations[1], SimulationJob('/scratch/auger-1', '/scratch/auger-1/output', True), 11)
+    journal.record_running(simulations[2], SimulationJob('/scratch/auger-2', '/scratch/auger-2/output', True), 12)
+    simulations[0].area, simulations[0].wce = 10.0, 1.0
+    journal.record_completed(simulations[0])
+    simulations[1].failure_class, simulations[1].failure_reason = constants.PARSE_ERROR_FAILURE, 'resume file empty'
+    journal.record_failed(simulations[1])
+
+    resumed = Journal.open(journal.run_id, tmp_path)
+    assert resumed.arguments == ['lp', '-add']
+    assert len(resumed.design_space) == 4
+    assert resumed.pending == [Journal.key(simulations[3])]
+    assert resumed.running == {Journal.key(simulations[2]): ('/scratch/auger-2', '/scratch/auger-2/output', True, 12)}
+    assert resumed.failed == {Journal.key(simulations[1]): (constants.PARSE_ERROR_FAILURE, 'resume file empty')}
+    assert not resumed.finished
+
+    simulation = create_simulation(0)
+    assert resumed.load_completed(simulation)
+    assert simulation.area == 10.0 and simulation.wce == 1.0
+    assert not resumed.load_completed(create_simulation(3))
+
+def test_open_ignores_torn_last_line(tmp_path):
+    journal = Journal.create(['lp'], tmp_path)
+    journal.record_finished()
+    with open(journal.filename, 'a') as journal_file:
+        journal_file.write('{"event": "comp')
+    assert Journal.open(journal.run_id, tmp_path).finished
+
+def test_open_missing(tmp_path):
+    with pytest.raises(Exception):
+        Journal.open('missing', tmp_path)
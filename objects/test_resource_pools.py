@@ -0,0 +1,49 @@
+import configparser
+import threading
+import time
+import pytest
+from objects.resource_pools import ResourcePools
+
+
+def test_parse():
+    assert ResourcePools.parse('synthesis=3, simulation=8').limits == {'synthesis': 3, 'simulation': 8}
+
+@pytest.mark.parametrize('text', ['synthesis', 'synthesis=0', 'synthesis=a', 'synthesis=-1'])
+def test_parse_invalid(text):
+    with pytest.raises(Exception):
+        ResourcePools.parse(text)
+
+def test_from_config():
+    config_parser = configparser.RawConfigParser()
+    config_parser.read_string('[Resource pools]\nsynthesis = 3\nsimulation = 8\n')
+    assert ResourcePools.from_config(config_parser, 'Resource pools').limits == {'synthesis': 3, 'simulation': 8}
+    assert ResourcePools.from_config(config_parser, 'Missing').limits == {}
+
+def test_acquire_limits_concurrency():
+    pools = ResourcePools({'synthesis': 2})
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def task():
+        with pools.acquire(['synthesis', 'unlimited']):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target = task) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert running[1] == 2
+
+def test_acquire_releases_on_error():
+    pools = ResourcePools({'synthesis': 1, 'simulation': 1})
+    with pytest.raises(ValueError):
+        with pools.acquire(['synthesis', 'simulation']):
+            raise ValueError()
+    with pools.acquire(['simulation', 'synthesis']):
+        pass
@@ -0,0 +1,389 @@
+import os
+import stat
+import subprocess
+import threading
+import time
+import pytest
+from constants import constants
+from objects.circuit_simulation import CircuitSimulationBuilder
+from objects.simulator import Simulator, parse_resume
+from objects.async_simulator import AsyncSimulator
+from objects.pipeline import SimulationPipeline
+from objects.error_estimate import SequentialValidation
+from objects.adder_models import AdderErrorModel
+from objects.resource_pools import ResourcePools
+
+
+# AUGER replacement, writes a RESUME.csv and a METRICS.csv under the FilesPath
+# of the config.cfg found on its working directory. The area is the number of
+# approximate bits and the error distances 0 and approximate bits are equally
+# likely. High performance adders are written under HP with r + p as their
+# approximate bits.
+FAKE_AUGER = '''#!/usr/bin/env python3
+import configparser, os, sys, time
+arguments = sys.argv[1:]
+method = arguments[1]
+bitwidth = arguments[arguments.index('-bw') + 1]
+config_parser = configparser.RawConfigParser()
+config_parser.read('config.cfg')
+if '-r' in arguments:
+    r = arguments[arguments.index('-r') + 1]
+    p = arguments[arguments.index('-p') + 1]
+    approximate_bits = int(r) + int(p)
+    directory = os.path.join(config_parser.get('AAUG setup', 'FilesPath'), 'HP', 'adder', method,
+                             bitwidth + '-' + r + '-' + p, 'results')
+else:
+    approximate_bits = int(arguments[arguments.index('-l') + 1])
+    directory = os.path.join(config_parser.get('AAUG setup', 'FilesPath'), 'LP', 'adder', method,
+                             bitwidth + '-' + str(approximate_bits), 'results')
+os.makedirs(directory, exist_ok = True)
+time.sleep(0.05)
+with open(os.path.join(directory, 'RESUME.csv'), 'w') as resume:
+    lines = ['header'] * 13
+    lines[2] = 'dynamic 2.5'
+    lines[4] = 'leakage 500.0'
+    lines[8] = 'delay 1.5'
+    lines[12] = 'area %d.0' % approximate_bits
+    resume.write('\\n'.join(lines) + '\\n')
+with open(os.path.join(directory, 'METRICS.csv'), 'w') as metrics:
+    metrics.write('PMF\\nerror,probability\\n0,0.5\\n%d,0.5\\n' % approximate_bits)
+'''
+
+
+@pytest.fixture
+def auger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_path = tmp_path / 'files'
+    (tmp_path / 'config.cfg').write_text(
+        '[AAUG setup]\nFilesPath = ' + str(output_path) + '\nScratchPath = ' + str(tmp_path) + '\n')
+    auger_path = tmp_path / 'AUGER'
+    auger_path.write_text(FAKE_AUGER)
+    auger_path.chmod(auger_path.stat().st_mode | stat.S_IEXEC)
+    return output_path
+
+def create_simulation(approximate_bits):
+    return CircuitSimulationBuilder.create_circuit_simulation_low_power(
+        'LOA', constants.SYNTHESIS, 256, constants.ADDER, 8, approximate_bits)
+
+def test_simulate(auger):
+    simulation = create_simulation(3)
+    assert Simulator().simulate(simulation)
+    assert simulation.area == 3.0
+    assert simulation.delay == 1.5
+    assert simulation.power == pytest.approx(3.0)
+    assert simulation.pdp == pytest.approx(4.5)
+    assert simulation.med == 1.5
+    assert simulation.wce == 3.0
+    assert os.path.isfile(auger / 'LP' / 'adder' / 'LOA' / '8-3' / 'results' / 'RESUME.csv')
+
+def test_simulate_high_performance(auger):
+    simulation = CircuitSimulationBuilder.create_circuit_simulation_high_performance(
+        'GeAr', constants.SYNTHESIS, 256, constants.ADDER, 8, 2, 3)
+    assert Simulator().simulate(simulation)
+    assert simulation.area == 5.0
+    assert simulation.wce == 5.0
+    assert (auger / 'HP' / 'adder' / 'GeAr' / '8-2-3').is_dir()
+
+@pytest.mark.parametrize('error_metric, threshold, samples', [(constants.WCE, 2.0, 100), (constants.MED, 4.0, 100), (constants.MED, 1.5, 1000)])
+def test_simulate_sequentially(auger, error_metric, threshold, samples):
+    simulator = Simulator()
+    simulator.sequential_validation = SequentialValidation(error_metric, threshold, 0.95, 100)
+    simulation = create_simulation(3)
+    simulation.number_of_validations = 1000
+    assert simulator.simulate(simulation)
+    assert (simulation.area, simulation.med, simulation.wce) == (3.0, 1.5, 3.0)
+    assert simulation.error_samples == samples
+    assert simulation.error_confidence >= 0.95 or samples == 1000
+
+def test_simulate_removes_scratch_directories(auger, tmp_path):
+    assert Simulator().simulate(create_simulation(3))
+    assert not [entry for entry in os.listdir(tmp_path) if entry.startswith('auger-')]
+
+def test_simulate_concurrent_cold_start(auger):
+    simulator = Simulator()
+    simulations = [create_simulation(approximate_bits) for approximate_bits in range(8)]
+    results = [None] * len(simulations)
+
+    def simulate(index):
+        results[index] = simulator.simulate(simulations[index])
+
+    threads = [threading.Thread(target = simulate, args = (index,)) for index in range(len(simulations))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(results)
+    assert [simulation.area for simulation in simulations] == [float(bits) for bits in range(8)]
+
+def test_simulate_not_isolated(auger, tmp_path):
+    with open(tmp_path / 'config.cfg', 'a') as config_file:
+        config_file.write('IsolateJobs = no\n')
+    simulation = create_simulation(5)
+    assert Simulator().simulate(simulation)
+    assert simulation.area == 5.0
+
+def test_simulate_missing_results(auger, tmp_path):
+    (tmp_path / 'AUGER').write_text('#!/bin/sh\necho "Error: netlist not found" >&2\nexit 1\n')
+    simulation = create_simulation(3)
+    assert not Simulator(retry_backoff = 0).simulate(simulation)
+    assert simulation.failure_class == constants.TOOL_ERROR_FAILURE
+    assert 'netlist not found' in simulation.failure_reason
+    assert simulation.attempts == 1
+
+def test_simulate_empty_results(auger, tmp_path):
+    (tmp_path / 'AUGER').write_text(FAKE_AUGER.replace("resume.write('\\n'.join(lines) + '\\n')", "pass"))
+    simulation = create_simulation(3)
+    assert not Simulator().simulate(simulation)
+    assert simulation.failure_class == constants.PARSE_ERROR_FAILURE
+
+def test_simulate_error_metrics(auger):
+    simulation = create_simulation(4)
+    assert Simulator().simulate(simulation)
+    assert (simulation.med, simulation.wce, simulation.error_rate, simulation.ed50, simulation.ed99) == (2.0, 4.0, 0.5, 0.0, 4.0)
+    assert simulation.rmse == pytest.approx(8 ** 0.5)
+    assert simulation.nmed == pytest.approx(2.0 / 510)
+
+def test_simulate_unparseable_metrics(auger, tmp_path):
+    (tmp_path / 'AUGER').write_text(FAKE_AUGER.replace("0,0.5\\n%d,0.5", "0,0.5\\n%d"))
+    simulation = create_simulation(3)
+    assert not Simulator().simulate(simulation)
+    assert simulation.failure_class == constants.PARSE_ERROR_FAILURE
+    assert 'unable to parse metrics file' in simulation.failure_reason
+
+def write_loa_pmf(tmp_path, pmf):
+    (tmp_path / 'AUGER').write_text(FAKE_AUGER.replace("0,0.5\\n%d,0.5\\n' % approximate_bits", pmf + "'"))
+
+def test_simulate_error_model(auger, tmp_path):
+    #LOA only errs when both lowest bits are set
+    write_loa_pmf(tmp_path, "0,0.75\\n1,0.25\\n")
+    simulator = Simulator()
+    simulator.error_model = AdderErrorModel()
+    simulation = create_simulation(1)
+    assert '64' in simulator._build_command(simulation)
+    assert simulator.simulate(simulation)
+    assert (simulation.area, simulation.wce, simulation.med, simulation.error_samples) == (1.0, 1.0, 0.25, 2 ** 16)
+
+    simulation = CircuitSimulationBuilder.create_circuit_simulation_low_power('LOA', constants.SYNTHESIS, 1000000, constants.ADDER, 32, 1)
+    assert simulator.simulate(simulation)
+    assert (simulation.wce, simulation.med, simulation.error_samples) == (1.0, 0.25, None)
+
+def test_simulate_error_model_med_mismatch(auger, tmp_path):
+    write_loa_pmf(tmp_path, "0,0.5\\n1,0.5\\n")
+    simulator = Simulator(retries = 0)
+    simulator.error_model = AdderErrorModel()
+    simulation = create_simulation(1)
+    assert not simulator.simulate(simulation)
+    #the med check is statistical, the design point is not skipped on later explorations
+    assert simulation.failure_class == constants.TRANSIENT_FAILURE
+    assert 'error model of LOA disagrees with AUGER on med 0.5' in simulation.failure_reason
+
+def test_simulate_error_model_mismatch(auger, tmp_path):
+    #an error distance larger than any 8 bits LOA can have
+    (tmp_path / 'AUGER').write_text(FAKE_AUGER.replace("%d,0.5\\n' % approximate_bits", "1000,0.5\\n'"))
+    simulator = Simulator()
+    simulator.error_model = AdderErrorModel()
+    simulation = create_simulation(3)
+    assert not simulator.simulate(simulation)
+    assert simulation.failure_class == constants.TOOL_ERROR_FAILURE
+    assert 'error model of LOA disagrees with AUGER on error distance 1000' in simulation.failure_reason
+
+def test_simulate_error_stage(auger):
+    simulator = Simulator()
+    simulation = create_simulation(3)
+    simulation.area = 42.0
+    simulation.is_synthesized = True
+    assert constants.VALIDATION in simulator._build_command(simulation)
+    assert simulator._simulation_resources(simulation) == [constants.SIMULATION_RESOURCE]
+    assert simulator.simulate(simulation)
+    assert (simulation.area, simulation.med) == (42.0, 1.5)
+
+def test_simulate_synthesis_stage(auger):
+    simulator = Simulator()
+    simulation = create_simulation(3)
+    simulation.med = 0.25
+    simulation.is_validated = True
+    command = simulator._build_command(simulation)
+    assert command[command.index('-c') + 1] == str(constants.SYNTHESIS_STAGE_VALIDATIONS)
+    assert simulator.simulate(simulation)
+    assert (simulation.area, simulation.med) == (3.0, 0.25)
+
+def test_find_file(auger, tmp_path, monkeypatch):
+    for folder in ['a', 'b']:
+        (tmp_path / folder / 'results').mkdir(parents = True)
+        (tmp_path / folder / 'results' / 'RESUME.csv').write_text('')
+        (tmp_path / folder / 'results' / 'METRICS.csv').write_text('')
+    (tmp_path / 'c' / 'other').mkdir(parents = True)
+    (tmp_path / 'c' / 'other' / 'RESUME.csv').write_text('')
+    listed = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: listed.append(path) or scandir(path))
+
+    simulator = Simulator()
+    assert simulator._find_file(str(tmp_path / 'a'), 'RESUME.csv') == str(tmp_path / 'a' / 'results' / 'RESUME.csv')
+    assert simulator._find_file(str(tmp_path / 'a'), 'METRICS.csv') == str(tmp_path / 'a' / 'results' / 'METRICS.csv')
+    assert len(listed) == 2
+    #the layout learned is checked directly
+    assert simulator._find_file(str(tmp_path / 'b'), 'RESUME.csv') == str(tmp_path / 'b' / 'results' / 'RESUME.csv')
+    assert simulator._find_file(str(tmp_path / 'b'), 'METRICS.csv') == str(tmp_path / 'b' / 'results' / 'METRICS.csv')
+    assert len(listed) == 2
+
+    assert simulator._find_file(str(tmp_path / 'c'), 'RESUME.csv') == str(tmp_path / 'c' / 'other' / 'RESUME.csv')
+    assert simulator._find_file(str(tmp_path / 'c'), 'METRICS.csv') is None
+    assert simulator._find_file(str(tmp_path / 'missing'), 'RESUME.csv') is None
+
+def test_simulate_retries_transient_failures(auger, tmp_path):
+    # fails with a license error the first two times
+    (tmp_path / 'AUGER').write_text(FAKE_AUGER.replace("time.sleep(0.05)", """
+counter = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'attempts')
+attempts = int(open(counter).read()) if os.path.exists(counter) else 0
+open(counter, 'w').write(str(attempts + 1))
+if attempts < 2:
+    sys.stderr.write('Error: Unable to checkout license\\n')
+    sys.exit(1)
+"""))
+    simulation = create_simulation(3)
+    simulator = Simulator(retries = 2, retry_backoff = 0)
+    assert simulator.simulate(simulation)
+    assert simulation.attempts == 3
+    assert simulator.retry_budget.used == 2
+
+def test_simulate_retry_budget(auger, tmp_path):
+    (tmp_path / 'AUGER').write_text('#!/bin/sh\necho "license checkout failed" >&2\nexit 1\n')
+    simulator = Simulator(retries = 5, retry_budget = 3, retry_backoff = 0)
+    simulations = [create_simulation(3), create_simulation(4)]
+    assert not simulator.simulate(simulations[0])
+    assert not simulator.simulate(simulations[1])
+    assert [simulation.attempts for simulation in simulations] == [4, 1]
+    assert simulations[1].failure_class == constants.TRANSIENT_FAILURE
+
+def hang(tmp_path):
+    (tmp_path / 'AUGER').write_text('#!/bin/sh\nsleep 30 &\nsleep 30\n')
+
+def test_simulate_timeout(auger, tmp_path):
+    hang(tmp_path)
+    start = time.perf_counter()
+    simulation = create_simulation(3)
+    assert not Simulator(timeout = 0.2, retries = 0).simulate(simulation)
+    assert time.perf_counter() - start < 5
+    assert simulation.failure_class == constants.TRANSIENT_FAILURE
+
+def test_async_simulate_many(auger):
+    simulations = [create_simulation(approximate_bits) for approximate_bits in range(8)]
+    finished = []
+
+    finished_threads = set()
+
+    def on_result(simulation, result):
+        finished.append(simulation)
+        finished_threads.add(threading.current_thread())
+        return result
+
+    results = AsyncSimulator(Simulator()).simulate_many(simulations, 4, on_result)
+    assert results == [True] * 8
+    assert len(finished) == 8
+    assert threading.main_thread() not in finished_threads
+    assert [simulation.wce for simulation in simulations] == [float(bits) for bits in range(8)]
+
+def test_async_simulate_sequentially(auger):
+    simulator = Simulator()
+    simulator.sequential_validation = SequentialValidation(constants.MED, 4.0, 0.95, 100)
+    simulator.resource_pools = ResourcePools({name: 1 for names in constants.SIMULATION_RESOURCES.values() for name in names})
+    running = []
+    peak = []
+    pools = []
+
+    def execute_simulation(simulation, job, resource_pools = None):
+        pools.append(resource_pools)
+        running.append(simulation)
+        peak.append(len(running))
+        try:
+            return Simulator._execute_simulation(simulator, simulation, job, resource_pools)
+        finally:
+            running.remove(simulation)
+
+    simulator._execute_simulation = execute_simulation
+    simulations = [create_simulation(approximate_bits) for approximate_bits in range(4)]
+    for simulation in simulations:
+        simulation.number_of_validations = 1000
+    #the sequential simulations hold the asyncio semaphores, the thread pools are left free
+    assert AsyncSimulator(simulator).simulate_many(simulations, 4) == [True] * 4
+    assert max(peak) == 1
+    assert simulator.resource_pools not in pools
+    assert all(simulation.error_samples == 100 for simulation in simulations)
+
+def test_async_simulate_timeout(auger, tmp_path):
+    hang(tmp_path)
+    start = time.perf_counter()
+    results = AsyncSimulator(Simulator(timeout = 0.2, retries = 0)).simulate_many([create_simulation(bits) for bits in range(4)], 4)
+    assert results == [False] * 4
+    assert time.perf_counter() - start < 5
+
+def test_pipeline_run(auger):
+    simulations = [create_simulation(approximate_bits) for approximate_bits in range(8)]
+    persisted = []
+
+    def on_result(simulation, result):
+        #every simulation is persisted before it is aggregated
+        assert simulation in persisted
+        return result
+
+    pipeline = SimulationPipeline(Simulator(), 4, 2, queue_size = 2)
+    results = pipeline.run(simulations, lambda simulation, result: persisted.append(simulation), on_result)
+    assert results == [True] * 8
+    assert len(persisted) == 8
+    assert [simulation.area for simulation in simulations] == [float(bits) for bits in range(8)]
+    assert 0 < pipeline.busy_time <= pipeline.capacity_time
+
+def test_pipeline_retries(auger, tmp_path):
+    hang(tmp_path)
+    simulator = Simulator(timeout = 0.2, retries = 1, retry_backoff = 0.01)
+    simulations = [create_simulation(bits) for bits in range(2)]
+    assert SimulationPipeline(simulator, 2, 1).run(simulations) == [False] * 2
+    assert [simulation.attempts for simulation in simulations] == [2, 2]
+    assert simulator.parse_executor is None
+
+def test_parse_resume(tmp_path):
+    lines = ['header'] * 13
+    lines[2], lines[4], lines[8], lines[12] = 'dynamic 2.5', 'leakage 500.0', 'delay 1.5', 'area 7.0'
+    (tmp_path / 'RESUME.csv').write_text('\n'.join(lines) + '\n')
+    assert parse_resume(str(tmp_path / 'RESUME.csv')) == ((7.0, 1.5, 3.0, 4.5), None)
+    (tmp_path / 'RESUME.csv').write_text('\n'.join(lines[:5]) + '\n')
+    assert parse_resume(str(tmp_path / 'RESUME.csv')) == (None, "resume file empty")
+
+def test_recover_job(auger, tmp_path):
+    # the exploration stopped while AUGER was running, it keeps running and
+    # its results are collected on the next exploration
+    simulator = Simulator()
+    simulation = create_simulation(6)
+    job = simulator._prepare_job(simulation)
+    pid = int(subprocess.check_output(['sh', '-c', '"$@" > /dev/null & echo $!', 'sh'] + simulator._build_command(simulation),
+                                      cwd = job.directory, start_new_session = True))
+
+    recovered = create_simulation(6)
+    assert simulator.recover_job(recovered, job.directory, job.output_path, job.isolated, pid, poll_interval = 0.01)
+    assert recovered.area == 6.0
+    assert os.path.isfile(auger / 'LP' / 'adder' / 'LOA' / '8-6' / 'results' / 'RESUME.csv')
+    assert not os.path.exists(job.directory)
+
+def test_recover_job_reused_pid(auger, tmp_path):
+    # after a reboot the journaled pid belongs to another process, which is
+    # neither waited for nor killed
+    simulator = Simulator(timeout = 0.2)
+    simulation = create_simulation(6)
+    job = simulator._prepare_job(simulation)
+    process = subprocess.Popen(['sleep', '30'], cwd = job.directory, start_new_session = True)
+    try:
+        start = time.perf_counter()
+        assert not simulator.recover_job(simulation, job.directory, job.output_path, job.isolated, process.pid, poll_interval = 0.01)
+        assert time.perf_counter() - start < 5
+        assert simulation.failure_class == constants.TOOL_ERROR_FAILURE
+        assert process.poll() is None
+    finally:
+        process.kill()
+        process.wait()
+
+def test_recover_job_missing_directory(auger, tmp_path):
+    simulation = create_simulation(6)
+    assert not Simulator().recover_job(simulation, str(tmp_path / 'auger-gone'), str(tmp_path / 'auger-gone' / 'output'), True, None)
+    assert simulation.failure_class == constants.TOOL_ERROR_FAILURE
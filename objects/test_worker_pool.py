@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+from objects.worker_pool import WorkerPool
+
+
+def test_map_keeps_order():
+    assert WorkerPool(4).map(lambda value: value * 2, range(20)) == [value * 2 for value in range(20)]
+
+def test_map_empty():
+    assert WorkerPool(4).map(lambda value: value, []) == []
+
+def test_map_limits_running_tasks():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def task(value):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    pool = WorkerPool(3)
+    pool.map(task, range(12))
+    assert running[1] == 3
+    assert pool.peak_workers == 3
+    assert 0 < pool.utilization <= 1
+
+def test_map_propagates_errors():
+    def task(value):
+        raise ValueError(value)
+
+    with pytest.raises(ValueError):
+        WorkerPool(2).map(task, range(4))
+
+def test_adaptive_pool_grows_on_idle_machine(monkeypatch):
+    monkeypatch.setattr(WorkerPool, 'cpu_count', staticmethod(lambda: 8))
+    monkeypatch.setattr(WorkerPool, 'load_average', staticmethod(lambda: 7.0))
+    pool = WorkerPool.create_adaptive(interval = 0.01)
+    assert pool.number_of_workers == 1
+
+    monkeypatch.setattr(WorkerPool, 'load_average', staticmethod(lambda: 0.0))
+    pool.map(lambda value: time.sleep(0.02), range(40))
+    assert pool.peak_workers > 1
+
+def test_adaptive_pool_shrinks_on_overloaded_machine(monkeypatch):
+    monkeypatch.setattr(WorkerPool, 'cpu_count', staticmethod(lambda: 4))
+    monkeypatch.setattr(WorkerPool, 'load_average', staticmethod(lambda: 0.0))
+    pool = WorkerPool.create_adaptive(interval = 0.01)
+    assert pool.number_of_workers == 4
+
+    monkeypatch.setattr(WorkerPool, 'load_average', staticmethod(lambda: 16.0))
+    pool.map(lambda value: time.sleep(0.02), range(20))
+    assert pool.number_of_workers == 1
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class WorkerPool:
+    """
+    Thread pool used to run simulations. The number of tasks running at the
+    same time is limited by number_of_workers, which in adaptive mode is sized
+    from the cpu count and the load average and adjusted every interval
+    seconds while the pool is running.
+
+    Attributes
+    ----------
+    number_of_workers : int
+        current maximum of tasks running at the same time
+    min_workers : int
+        minimum number of workers in adaptive mode
+    max_workers : int
+        maximum number of workers
+    adaptive : bool
+        if set the number of workers follows the load of the machine
+    interval : float
+        seconds between adjustments of the number of workers
+    busy_time : float
+        seconds spent by the workers running tasks
+    capacity_time : float
+        seconds of available worker time, number_of_workers integrated over time
+    peak_workers : int
+        maximum number_of_workers reached
+    """
+
+    def __init__(self, max_workers, adaptive = False, min_workers = 1, interval = 5.0):
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.adaptive = adaptive
+        self.interval = interval
+        self.number_of_workers = self.__initial_workers() if adaptive else self.max_workers
+        self.peak_workers = self.number_of_workers
+        self.busy_time = 0.0
+        self.capacity_time = 0.0
+        self.__running = 0
+        self.__waiting = 0
+        self.__last_update = None
+        self.__condition = threading.Condition()
+
+    @staticmethod
+    def cpu_count():
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def load_average():
+        ''' One minute load average, 0 where it is not available '''
+        try:
+            return os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return 0.0
+
+    @classmethod
+    def create_adaptive(cls, interval = 5.0):
+        ''' Returns an adaptive pool that can grow up to the number of cpus '''
+        return cls(cls.cpu_count(), adaptive = True, interval = interval)
+
+    def __initial_workers(self):
+        idle_cpus = int(self.cpu_count() - self.load_average())
+        return max(self.min_workers, min(self.max_workers, idle_cpus))
+
+    def __account(self):
+        ''' Integrates the capacity since the last update, must hold the condition '''
+        now = time.perf_counter()
+        if self.__last_update is not None:
+            self.capacity_time += (now - self.__last_update) * self.number_of_workers
+        self.__last_update = now
+
+    def __resize(self, number_of_workers):
+        with self.__condition:
+            number_of_workers = max(self.min_workers, min(self.max_workers, number_of_workers))
+            if number_of_workers != self.number_of_workers:
+                self.__account()
+                self.number_of_workers = number_of_workers
+                self.peak_workers = max(self.peak_workers, number_of_workers)
+                self.__condition.notify_all()
+
+    def __adjust(self):
+        ''' Adds a worker while there are idle cpus and queued tasks, removes
+        one when the machine is overloaded '''
+        load = self.load_average()
+        cpus = self.cpu_count()
+        with self.__condition:
+            waiting = self.__waiting
+            workers = self.number_of_workers
+        if load > cpus:
+            self.__resize(workers - 1)
+        elif waiting and load + 1 <= cpus:
+            self.__resize(workers + 1)
+
+    def __control(self, finished):
+        while not finished.wait(self.interval):
+            self.__adjust()
+
+    def __run(self, function, item):
+        with self.__condition:
+            self.__waiting += 1
+            while self.__running >= self.number_of_workers:
+                self.__condition.wait()
+            self.__waiting -= 1
+            self.__running += 1
+
+        start = time.perf_counter()
+        try:
+            return function(item)
+        finally:
+            with self.__condition:
+                self.busy_time += time.perf_counter() - start
+                self.__running -= 1
+                self.__condition.notify()
+
+    def map(self, function, items):
+        ''' Applies function to every item and returns the results in order.
+        If interrupted the tasks that did not start are cancelled. '''
+        items = list(items)
+        if not items:
+            return []
+
+        with self.__condition:
+            self.__account()
+
+        finished = threading.Event()
+        controller = None
+        if self.adaptive:
+            controller = threading.Thread(target = self.__control, args = (finished,), daemon = True)
+            controller.start()
+
+        with ThreadPoolExecutor(max_workers = min(self.max_workers, len(items))) as executor:
+            futures = [executor.submit(self.__run, function, item) for item in items]
+            try:
+                results = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                finished.set()
+                if controller is not None:
+                    controller.join()
+                with self.__condition:
+                    self.__account()
+                    self.__last_update = None
+
+        return results
+
+    @property
+    def utilization(self):
+        ''' Fraction of the available worker time spent running tasks '''
+        if self.capacity_time == 0:
+            return 0.0
+        return min(1.0, self.busy_time / self.capacity_time)
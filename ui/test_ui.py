@@ -172,4 +172,36 @@ def test_create_design_space_params_low_power():
     assert design_space_params.charactheristic == constants.POWER
     assert design_space_params.threshold == 0.25
     assert design_space_params.min_approx_bits == 0
-    assert design_space_params.max_approx_bits == 4        
\ No newline at end of file
+    assert design_space_params.max_approx_bits == 4        
+@pytest.mark.parametrize('option, value', [('--sequential-confidence', '0'), ('--sequential-confidence', '1'), ('--sequential-confidence', 'high'),
+                                           ('--validation-chunk', '0'), ('--validation-chunk', '-5'),
+                                           ('--screening-validations', '0'), ('--fidelity-margin', '-0.1'), ('--fidelity-margin', 'nan'),
+                                           ('--population-size', '0'), ('--generations', '-1'),
+                                           ('--timeout', '0'), ('--retries', '-1'), ('--retry-budget', '-1'), ('--parse-workers', '0')])
+def test_parse_input_invalid_option(option, value):
+    ui = UI()
+    with pytest.raises(SystemExit):
+        ui._UI__parse_input([option, value, 'lp','-add','-bw','8','-power','-wce','-t','0.25','-mina', '0', '-maxa', '4'])
+
+def test_parse_input_options():
+    ui = UI()
+    args = ui._UI__parse_input(['--sequential-confidence', '0.95', '--validation-chunk', '1000', 'lp','-add','-bw','8','-power','-wce','-t','0.25','-mina', '0', '-maxa', '4'])
+    assert args.sequential_confidence == 0.95
+    assert args.validation_chunk == 1000
+
+def test_parse_input_multi_fidelity_options():
+    ui = UI()
+    args = ui._UI__parse_input(['--screening-validations', '1', '--fidelity-margin', '0', 'lp','-add','-bw','8','-power','-wce','-t','0.25','-mina', '0', '-maxa', '4'])
+    assert args.screening_validations == 1
+    assert args.fidelity_margin == 0
+
+def test_parse_input_nsga2_options():
+    ui = UI()
+    args = ui._UI__parse_input(['--population-size', '1', '--generations', '0', 'hp','-add','-bw','8','-area','-wce','-t','4','-minr', '1', '-maxr', '6','-minp', '0', '-maxp', '4'])
+    assert args.population_size == 1
+    assert args.generations == 0
+
+def test_parse_input_execution_options():
+    ui = UI()
+    args = ui._UI__parse_input(['--timeout', '0.5', '--retries', '0', '--retry-budget', '0', '--parse-workers', '1', 'lp','-add','-bw','8','-power','-wce','-t','0.25','-mina', '0', '-maxa', '4'])
+    assert (args.timeout, args.retries, args.retry_budget, args.parse_workers) == (0.5, 0, 0, 1)
@@ -1,7 +1,8 @@
 import argparse #parse console input
 from logic.logic import Logic
 from constants import constants
-from objects.design_space_params import DesignSpaceParamsBuilder
+from objects.design_space_params import DesignSpaceParamsBuilder, ExplorationOptions
+from objects.journal import Journal
 
 class UI:
     """Class used to abstract the UI layer, it deals with the parsing and validating 
@@ -34,8 +35,26 @@ class UI:
         """
 
         parsed_args = self.__parse_input(args)
+
+        if parsed_args.resume:
+            journal = Journal.open(parsed_args.resume)
+            parsed_args = self.__parse_input(journal.arguments)
+            print(f'Resuming run {journal.run_id}')
+        else:
+            journal = None
+
+        if parsed_args.import_csv:
+            imported = self.logic.import_database(parsed_args.import_csv)
+            print(f'Imported {imported} simulations from {parsed_args.import_csv} into {constants.LOW_POWER_DB}')
+            if parsed_args.circuit_type is None:
+                return
+
         design_space_params = self.__create_design_space_params(parsed_args)
+        if journal is None:
+            journal = Journal.create(args)
+            print(f'Run id: {journal.run_id}')
         self.logic.set_design_space_params(design_space_params)
+        self.logic.set_journal(journal)
         self.logic.init()
 
     def __parse_input(self, args):
@@ -60,6 +79,27 @@ class UI:
 
         parser.add_argument('-ndb', action = 'store_true')
         parser.add_argument('-nt', action = 'store_true')
+        parser.add_argument('-j', '--jobs', type = self.__parse_jobs, default = constants.DEFAULT_JOBS, help = f'number of simulations executed at the same time or "{constants.ADAPTIVE_JOBS}" to follow the cpu count and load, default {constants.DEFAULT_JOBS}')
+        parser.add_argument('-e', '--execution-engine', choices = [constants.THREADS_EXECUTION, constants.ASYNCIO_EXECUTION, constants.PIPELINE_EXECUTION], default = constants.THREADS_EXECUTION, help = 'executes the simulations on a thread pool, on a single asyncio event loop or on a pipeline that parses the results apart from the executions, default threads')
+        parser.add_argument('--timeout', type = self.__parse_positive_float, help = 'seconds after which a simulation is killed and marked as failed')
+        parser.add_argument('--retries', type = self.__parse_non_negative_int, default = constants.DEFAULT_RETRIES, help = f'times a simulation with a transient failure is retried, default {constants.DEFAULT_RETRIES}')
+        parser.add_argument('--retry-budget', type = self.__parse_non_negative_int, help = 'maximum number of retries of the whole exploration')
+        parser.add_argument('--retry-failed', action = 'store_true', help = 'simulates again the design points known to fail deterministically')
+        parser.add_argument('-obj', '--objectives', type = self.__parse_objectives, help = f'comma separated metrics among {",".join(constants.OBJECTIVES)} ranked together on a multi-objective Pareto front')
+        parser.add_argument('-s', '--strategy', choices = [constants.BRUTE_FORCE_STRATEGY, constants.BINARY_SEARCH_STRATEGY, constants.BRANCH_AND_BOUND_STRATEGY, constants.SURROGATE_STRATEGY, constants.NSGA2_STRATEGY, constants.MULTI_FIDELITY_STRATEGY], help = 'how the design space is explored, default brute-force for lp, or branch-and-bound if a time budget is set, and nsga2 for hp')
+        parser.add_argument('--time-budget', type = float, metavar = 'SECONDS', help = 'stops the branch and bound exploration after SECONDS, reporting the best solution found and its optimality gap')
+        parser.add_argument('--seed', type = int, default = constants.DEFAULT_SEED, help = f'seed of the nsga2 strategy, the same seed explores the same design points, default {constants.DEFAULT_SEED}')
+        parser.add_argument('--population-size', type = self.__parse_positive_int, default = constants.DEFAULT_POPULATION_SIZE, help = f'design points of each generation of the nsga2 strategy, default {constants.DEFAULT_POPULATION_SIZE}')
+        parser.add_argument('--generations', type = self.__parse_non_negative_int, default = constants.DEFAULT_GENERATIONS, help = f'generations simulated by the nsga2 strategy after the initial population, default {constants.DEFAULT_GENERATIONS}')
+        parser.add_argument('--screening-validations', type = self.__parse_positive_int, default = constants.DEFAULT_SCREENING_VALIDATIONS, help = f'validations of the screening simulations of the multi-fidelity strategy, default {constants.DEFAULT_SCREENING_VALIDATIONS}')
+        parser.add_argument('--fidelity-margin', type = self.__parse_non_negative_float, default = constants.DEFAULT_FIDELITY_MARGIN, help = f'relative distance to the threshold or the Pareto front within which a screened design point is simulated at full fidelity, default {constants.DEFAULT_FIDELITY_MARGIN}')
+        parser.add_argument('--sequential-confidence', type = self.__parse_confidence, metavar = 'CONFIDENCE', help = f'from {constants.EXHAUSTIVE_VALIDATION_BITS} bits on runs the random validations in chunks and stops once the threshold decision is settled with CONFIDENCE, ex 0.95')
+        parser.add_argument('--validation-chunk', type = self.__parse_positive_int, default = constants.DEFAULT_VALIDATION_CHUNK, help = f'validations of each chunk of the sequential validations, default {constants.DEFAULT_VALIDATION_CHUNK}')
+        parser.add_argument('--software-errors', action = 'store_true', help = f'computes the error metrics of the modelled low power adders in software, on every input pair up to {constants.MAX_MODEL_BITWIDTH} bits and analytically for wider ones with up to {constants.MAX_ANALYTICAL_APPROXIMATE_BITS} approximate bits, AUGER is only used for area, delay and power')
+        parser.add_argument('--parse-workers', type = self.__parse_positive_int, help = 'threads and processes reading and parsing the results on the pipeline execution engine, default the cpu count')
+        parser.add_argument('-dbe', '--database-engine', choices = [constants.CSV_ENGINE, constants.SQLITE_ENGINE], default = constants.CSV_ENGINE, help = 'database storage engine, default csv')
+        parser.add_argument('--import-csv', metavar = 'CSV', help = 'imports a low power csv file into the sqlite database')
+        parser.add_argument('--resume', metavar = 'RUN_ID', help = 'resumes the interrupted exploration with the given run id, with its original options')
 
         subparsers = parser.add_subparsers(dest='circuit_type') #, required=True) conflicts with python 3.7
 
@@ -87,6 +127,12 @@ class UI:
         error_metrics_group =  parser_low_power.add_mutually_exclusive_group(required=True)
         error_metrics_group.add_argument('-wce', action = 'store_true')
         error_metrics_group.add_argument('-med', action = 'store_true')
+        error_metrics_group.add_argument('-nmed', action = 'store_true', help = 'med normalized by the largest exact result')
+        error_metrics_group.add_argument('-er', dest = 'error_rate', action = 'store_true', help = 'error rate, probability of a wrong result')
+        error_metrics_group.add_argument('-rmse', action = 'store_true')
+        error_metrics_group.add_argument('-ed50', action = 'store_true', help = 'median error distance')
+        error_metrics_group.add_argument('-ed90', action = 'store_true', help = '90th percentile of the error distance')
+        error_metrics_group.add_argument('-ed99', action = 'store_true', help = '99th percentile of the error distance')
 
         parser_low_power.add_argument('-t', '--threshold', type = float, required = True, help = 'minimum threshold of the selected characteristic')
 
@@ -119,18 +165,145 @@ class UI:
         error_metrics_group =  parser_high_performance.add_mutually_exclusive_group(required=True)
         error_metrics_group.add_argument('-wce', action = 'store_true')
         error_metrics_group.add_argument('-med', action = 'store_true')
+        error_metrics_group.add_argument('-nmed', action = 'store_true', help = 'med normalized by the largest exact result')
+        error_metrics_group.add_argument('-er', dest = 'error_rate', action = 'store_true', help = 'error rate, probability of a wrong result')
+        error_metrics_group.add_argument('-rmse', action = 'store_true')
+        error_metrics_group.add_argument('-ed50', action = 'store_true', help = 'median error distance')
+        error_metrics_group.add_argument('-ed90', action = 'store_true', help = '90th percentile of the error distance')
+        error_metrics_group.add_argument('-ed99', action = 'store_true', help = '99th percentile of the error distance')
 
         #threshold
         parser_high_performance.add_argument('-t', '--threshold', type = float, required = True, help = 'minimum threshold of the selected characteristic')
 
         #simulation limits
-        parser_high_performance.add_argument('-minr', type = int, required = True, help = 'minimum aproximated bits, default 0')
-        parser_high_performance.add_argument('-maxr', type = int, required = True, help = 'maximum aproximated bits, default bitwidth')
-        parser_high_performance.add_argument('-minp', type = int, required = True, help = 'minimum aproximated bits, default 0')
-        parser_high_performance.add_argument('-maxp', type = int, required = True, help = 'maximum aproximated bits, default bitwidth')
+        parser_high_performance.add_argument('-minr', type = int, required = True, help = 'minimum resultant bits of each sub-adder')
+        parser_high_performance.add_argument('-maxr', type = int, required = True, help = 'maximum resultant bits of each sub-adder')
+        parser_high_performance.add_argument('-minp', type = int, required = True, help = 'minimum previous bits used to predict each carry')
+        parser_high_performance.add_argument('-maxp', type = int, required = True, help = 'maximum previous bits used to predict each carry')
 
         return parser.parse_args(args)    
 
+    @staticmethod
+    def __parse_jobs(value):
+        """Converts the jobs option into a positive int or ADAPTIVE_JOBS
+
+        Raises
+        ------
+        ArgumentTypeError
+            If value is not a positive number or ADAPTIVE_JOBS
+        """
+        if value == constants.ADAPTIVE_JOBS:
+            return value
+        try:
+            jobs = int(value)
+        except ValueError:
+            jobs = 0
+        if jobs < 1:
+            raise argparse.ArgumentTypeError(f'jobs must be a positive number or "{constants.ADAPTIVE_JOBS}"')
+        return jobs
+
+    @staticmethod
+    def __parse_positive_int(value):
+        """Converts an option into an int of at least 1
+
+        Raises
+        ------
+        ArgumentTypeError
+            If value is not a positive integer
+        """
+        try:
+            number = int(value)
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+        return number
+
+    @staticmethod
+    def __parse_non_negative_int(value):
+        """Converts an option into an int of at least 0
+
+        Raises
+        ------
+        ArgumentTypeError
+            If value is not an integer or is negative
+        """
+        try:
+            number = int(value)
+        except ValueError:
+            number = -1
+        if number < 0:
+            raise argparse.ArgumentTypeError(f'{value} is not a non-negative integer')
+        return number
+
+    @staticmethod
+    def __parse_positive_float(value):
+        """Converts an option into a float greater than 0
+
+        Raises
+        ------
+        ArgumentTypeError
+            If value is not a positive number
+        """
+        try:
+            number = float(value)
+        except ValueError:
+            number = 0.0
+        if not number > 0:
+            raise argparse.ArgumentTypeError(f'{value} is not a positive number')
+        return number
+
+    @staticmethod
+    def __parse_non_negative_float(value):
+        """Converts an option into a float of at least 0
+
+        Raises
+        ------
+        ArgumentTypeError
+            If value is not a number or is negative
+        """
+        try:
+            number = float(value)
+        except ValueError:
+            number = -1.0
+        if not number >= 0:
+            raise argparse.ArgumentTypeError(f'{value} is not a non-negative number')
+        return number
+
+    @staticmethod
+    def __parse_confidence(value):
+        """Converts the sequential confidence option into a float between 0 and 1
+
+        Raises
+        ------
+        ArgumentTypeError
+            If value is not a number greater than 0 and smaller than 1
+        """
+        try:
+            confidence = float(value)
+        except ValueError:
+            confidence = 0.0
+        if not 0 < confidence < 1:
+            raise argparse.ArgumentTypeError('confidence must be greater than 0 and smaller than 1, ex 0.95')
+        return confidence
+
+    @staticmethod
+    def __parse_objectives(value):
+        """Converts the objectives option into a list of metrics
+
+        Raises
+        ------
+        ArgumentTypeError
+            If there are less than two metrics or one is unknown or repeated
+        """
+        objectives = [objective.strip() for objective in value.split(',') if objective.strip()]
+        unknown = [objective for objective in objectives if objective not in constants.OBJECTIVES]
+        if unknown:
+            raise argparse.ArgumentTypeError(f'unknown objectives {", ".join(unknown)}, valid ones are {", ".join(constants.OBJECTIVES)}')
+        if len(objectives) < 2 or len(set(objectives)) != len(objectives):
+            raise argparse.ArgumentTypeError('objectives must be at least two different metrics')
+        return objectives
+
     def __create_design_space_params(self, parsed_args):
         """Given an args object returns a DesignSpaceParams object.
 
@@ -144,6 +317,27 @@ class UI:
         Exception
             If invalid circuit type
         """
+        options = ExplorationOptions(
+            database_engine = parsed_args.database_engine,
+            jobs = parsed_args.jobs,
+            execution_engine = parsed_args.execution_engine,
+            timeout = parsed_args.timeout,
+            retries = parsed_args.retries,
+            retry_budget = parsed_args.retry_budget,
+            retry_failed = parsed_args.retry_failed,
+            objectives = parsed_args.objectives,
+            strategy = self.__parsed_args_to_strategy(parsed_args),
+            time_budget = parsed_args.time_budget,
+            seed = parsed_args.seed,
+            population_size = parsed_args.population_size,
+            generations = parsed_args.generations,
+            screening_validations = parsed_args.screening_validations,
+            fidelity_margin = parsed_args.fidelity_margin,
+            sequential_confidence = parsed_args.sequential_confidence,
+            validation_chunk = parsed_args.validation_chunk,
+            software_errors = parsed_args.software_errors,
+            parse_workers = parsed_args.parse_workers)
+
         if parsed_args.circuit_type == 'lp':
             return DesignSpaceParamsBuilder.create_low_power_space_design_params(
                 database = not parsed_args.ndb,
@@ -154,7 +348,8 @@ class UI:
                 error_metric = self.__parsed_args_to_const_error_metric(parsed_args),
                 threshold = parsed_args.threshold,
                 min_approx_bits = parsed_args.mina,
-                max_approx_bits = parsed_args.maxa)
+                max_approx_bits = parsed_args.maxa,
+                options = options)
 
         if parsed_args.circuit_type == 'hp':
             return DesignSpaceParamsBuilder.create_high_performance_space_design_params(
@@ -165,14 +360,47 @@ class UI:
                 charactheristic = self.__parsed_args_to_const_characteristic(parsed_args),
                 error_metric = self.__parsed_args_to_const_error_metric(parsed_args),
                 threshold = parsed_args.threshold,
-                min_r = parsed_args.minp,
-                max_r = parsed_args.maxp,
-                min_p = parsed_args.minr,
-                max_p = parsed_args.maxr
-            )
+                min_r = parsed_args.minr,
+                max_r = parsed_args.maxr,
+                min_p = parsed_args.minp,
+                max_p = parsed_args.maxp,
+                options = options)
         else:
             raise Exception("Invalid circuit type: " + parsed_args.circuit_type)
 
+    def __parsed_args_to_strategy(self, parsed_args):
+        """Returns the exploration strategy, by default nsga2 for high
+        performance circuits and brute force for low power ones unless a time
+        budget is set, which only the branch and bound strategy honors
+
+        Parameters
+        ----------
+        parsed_args : ParsedArgs
+            Parsed args from input
+
+        Raises
+        ------
+        Exception
+            If a time budget is set with another strategy or the strategy
+            does not explore the circuit type.
+        """
+
+        if parsed_args.circuit_type == 'hp':
+            if parsed_args.strategy not in (None, constants.NSGA2_STRATEGY, constants.BRUTE_FORCE_STRATEGY):
+                raise Exception("Invalid strategy: high performance circuits are explored by the nsga2 or brute-force strategies")
+            if parsed_args.time_budget is not None:
+                raise Exception("Invalid time budget: only the branch-and-bound strategy has a time budget")
+            return parsed_args.strategy or constants.NSGA2_STRATEGY
+        if parsed_args.strategy == constants.NSGA2_STRATEGY:
+            raise Exception("Invalid strategy: the nsga2 strategy explores high performance circuits")
+        if parsed_args.strategy is None:
+            if parsed_args.time_budget is not None:
+                return constants.BRANCH_AND_BOUND_STRATEGY
+            return constants.BRUTE_FORCE_STRATEGY
+        if parsed_args.time_budget is not None and parsed_args.strategy != constants.BRANCH_AND_BOUND_STRATEGY:
+            raise Exception("Invalid time budget: only the branch-and-bound strategy has a time budget")
+        return parsed_args.strategy
+
     def __parsed_args_to_const_circuit_operation(self, parsed_args):
         """Returns contant circuit operation string corresponding to the given parsed args
 
@@ -242,5 +470,17 @@ class UI:
             return constants.WCE
         elif parsed_args.med:
             return constants.MED
+        elif parsed_args.nmed:
+            return constants.NMED
+        elif parsed_args.error_rate:
+            return constants.ERROR_RATE
+        elif parsed_args.rmse:
+            return constants.RMSE
+        elif parsed_args.ed50:
+            return constants.ED50
+        elif parsed_args.ed90:
+            return constants.ED90
+        elif parsed_args.ed99:
+            return constants.ED99
         else:
             raise Exception("Invalid error metric: No error metric was specified")
\ No newline at end of file